@@ -4,7 +4,7 @@ import json
 import pickle
 import time
 
-from poliquery import get_all_bills_info, get_representative_members_name, get_prime_minister_cabinet_index
+from poliquery import get_all_bills_info, get_name_resolver, get_prime_minister_cabinet_index
 
 from .bill_scraper import scrape_bill_list
 from .bill_event_scraper import scrape_bill_events
@@ -82,16 +82,8 @@ def scrape_and_update_bills_data(
         with open('politigraph_bill_list.pkl', 'wb') as file:
             pickle.dump(politigraph_bill_list, file)
         
-        # Load politician name index from politigraph & save to json
-        politicians = get_representative_members_name(parliament_term=term)
-        name_index = {}
-        for person in politicians:
-            name_index[person['name']] = person['id']
-            if person['other_names']:
-                for other_name in person['other_names']:
-                    name_index[other_name['name']] = person['id']
-        with open('name_index.pkl', 'wb') as file:
-            pickle.dump(name_index, file)
+        # Load politician name resolver from politigraph & save to file
+        get_name_resolver(parliament_term=term).save('name_index.pkl')
             
         # Load prime minister index from politigraph & save to json
         prime_minister_index = asyncio.run(get_prime_minister_cabinet_index(None))
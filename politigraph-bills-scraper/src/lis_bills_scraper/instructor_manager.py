@@ -6,11 +6,10 @@ from thai_name_normalizer import remove_thai_name_prefix
 from .create_param_generators import CERATE_PARAM_DISPATCH
 from .update_param_generators import UPDATE_PARAM_DISPATCH
 
-from poliquery import get_all_house_of_representatives
+from poliquery import get_all_house_of_representatives, NameResolver
 
 def get_co_proposer_param(co_proposer: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-    with open('name_index.pkl', 'rb') as file:
-        name_index = pickle.load(file)
+    name_resolver = NameResolver.load('name_index.pkl')
     
     result = []
     for proposer in co_proposer:
@@ -18,9 +17,7 @@ def get_co_proposer_param(co_proposer: List[Dict[str, str]]) -> List[Dict[str, A
             "where": {
               "node": {
                 "id": {
-                    "eq": name_index.get(
-                        remove_thai_name_prefix(proposer.get('name', ''))
-                    )
+                    "eq": name_resolver.resolve_id(proposer.get('name', ''), fuzzy=False)
                 }
               }
             }
@@ -111,8 +108,7 @@ def add_new_bill_instruction(
     proposer = info_event.get('proposer')
     # Check if creator is person
     if proposer != "คณะรัฐมนตรี":
-        with open('name_index.pkl', 'rb') as file:
-            name_index = pickle.load(file)
+        name_resolver = NameResolver.load('name_index.pkl')
         create_param['creators'] = {
             "Person": {
                 "connect": [
@@ -120,9 +116,7 @@ def add_new_bill_instruction(
                         "where": {
                             "node": {
                                 "id": {
-                                    "eq": name_index.get(
-                                        remove_thai_name_prefix(proposer)
-                                    )
+                                    "eq": name_resolver.resolve_id(proposer, fuzzy=False)
                                 }
                             }
                         }
@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from functools import lru_cache
 import re
 
 from .thai_name_prefixes import NAME_PREFIXES
@@ -17,6 +18,15 @@ def normalize_thai_name(name: str) -> str:
     normalized_name = re.sub(r"\s+", " ", normalized_name)
     return normalized_name
 
+@lru_cache(maxsize=64)
+def get_prefix_pattern(prefixes: Tuple[str, ...]) -> re.Pattern:
+    """
+    One precompiled pattern matching the longest of the prefixes, longest
+    alternatives first. Prefixes are literal ('.' of 'นพ.' is a dot).
+    """
+    sorted_prefixes = sorted(set(prefixes), key=len, reverse=True)
+    return re.compile(r"^(?:" + "|".join(re.escape(prefix) for prefix in sorted_prefixes) + r")")
+
 def remove_thai_name_prefix(name: str|None, prefixes:List[str]=[]) -> str:
     # Check if name is None return empty string
     if not name:
@@ -24,10 +34,8 @@ def remove_thai_name_prefix(name: str|None, prefixes:List[str]=[]) -> str:
     # Load & combine two set of prefixes
     master_prefixes_list = NAME_PREFIXES + prefixes
     # Remove prefix from name
-    result_name = min(
-        [re.sub(r"^" + prefix, "", name).strip() for prefix in master_prefixes_list],
-        key=len
-    )
+    prefix_pattern = get_prefix_pattern(tuple(master_prefixes_list))
+    result_name = prefix_pattern.sub("", name, count=1).strip()
     # Normalize name
     result_name = normalize_thai_name(result_name)
     return result_name
\ No newline at end of file
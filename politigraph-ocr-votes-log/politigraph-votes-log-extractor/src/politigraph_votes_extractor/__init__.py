@@ -1,4 +1,7 @@
+from .vote_log_document import VoteLogDocument
 from .votes_extractor import extract_votelog
 from .extra_votes_extractor import extract_extra_votes
-from .validate_data_extractor import extract_doc_data
-from .df_cleaner import clean_votelog_df, clean_extra_votes_df
\ No newline at end of file
+from .validate_data_extractor import extract_doc_data, get_doc_data_from_text_layer
+from .df_cleaner import clean_votelog_df, clean_extra_votes_df
+from .ocr_pool import OCRProcessPool, get_reader_kwargs
+from .ocr_cache import OCRCache
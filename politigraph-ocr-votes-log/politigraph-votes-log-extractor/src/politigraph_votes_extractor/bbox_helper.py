@@ -1,8 +1,11 @@
 import cv2
+import numpy as np
 from typing import List, Tuple
 from PIL import Image
 
-from .image_processing import process_to_gray_scale, noise_removal
+from .image_processing import scale_kernel, scale_size
+from .page_analysis import PageAnalysis, as_page_analysis
+from .grid_detector import keep_widest_gaps
 
 def convert_rect_to_bbox(rect):
     x, y, w, h = rect
@@ -22,31 +25,32 @@ def filter_border_bboxes(
     ]
 
 def detect_text_bbox(
-    image: Image,
+    image: Image.Image|PageAnalysis,
     small_dilate_kernel: tuple = (5, 5), 
-    large_dilate_kernel: tuple = (25, 5)
+    large_dilate_kernel: tuple = (25, 5),
+    scale: float = 1.0
     ) -> list:
-    
-    gray_im = process_to_gray_scale(image)
-    gray_im = noise_removal(gray_im)
-    
+    """
+    Text boxes of the image. `image` can be rendered at `scale` of the full
+    resolution (detection image), boxes are in full resolution pixels.
+    """
     # detect text bbox
-    blured = cv2.GaussianBlur(gray_im, (9, 9), 0)
-    th, threshed = cv2.threshold(
-        blured, 200, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, small_dilate_kernel)
-    threshed = cv2.dilate(threshed, kernel)
-
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, large_dilate_kernel)
-    dilated = cv2.dilate(threshed, kernel)
+    analysis = as_page_analysis(image, scale=scale, denoise=True)
+    scale = analysis.scale
+    dilated = analysis.dilate(
+        scale_kernel(small_dilate_kernel, scale),
+        scale_kernel(large_dilate_kernel, scale)
+    )
     contours, hier = cv2.findContours(
             dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
 
     rects = [cv2.boundingRect(c) for c in contours]
     # Filter out small text rects
-    rects = [r for r in rects if r[3] > 20]
+    rects = [r for r in rects if r[3] > scale_size(20, scale)]
     
     bboxs = [convert_rect_to_bbox(r) for r in rects]
+    if scale != 1.0:
+        bboxs = [tuple(round(v / scale) for v in bb) for bb in bboxs]
 
     return bboxs
 
@@ -67,22 +71,22 @@ def group_bboxs_into_rows(
     sorted_y_bboxes = sorted(bboxes, key=lambda bb: bb[1])
     
     rows = []
+    rows_y_range = [] # (min y, max y) of each row
     
     max_y = 0
     for bbox in sorted_y_bboxes:
         if bbox[1] > max_y:
             rows.append([bbox]) # Create new row
+            rows_y_range.append((bbox[1], bbox[3]))
             max_y = bbox[3]
             continue
+        # Rows are created in y order & a bbox never starts above the row
+        # it joins, so rows stay sorted by their min y
         for i in range(-1, (len(rows)+1)*-1, -1):
-            y_min = min([bb[1] for bb in rows[i]])
-            y_max = max([bb[3] for bb in rows[i]])
+            y_min, y_max = rows_y_range[i]
             if is_y_overlapped((bbox[1], bbox[3]), (y_min, y_max)):
                 rows[i].append(bbox)
-                rows = sorted(
-                    rows,
-                    key=lambda row: min([bb[1] for bb in row])
-                )
+                rows_y_range[i] = (y_min, max(y_max, bbox[3]))
                 break
                 
     return rows
@@ -127,6 +131,9 @@ def normalize_table_bbox(
             x_intervals.append((bbox[0], bbox[2]-5)) # Crop to prevent x2 spiling
             
     columns_range = merge_overlapping_intervals(x_intervals)
+    # Split columns at the widest gaps only, a gap between two words of a
+    # cell doesn't make an extra column
+    columns_range = [(int(_x[0]), int(_x[1])) for _x in keep_widest_gaps(np.array(columns_range), 5)]
             
     assert len(columns_range) == 5, f"Expected range to be 5 got: {len(columns_range)}"
     
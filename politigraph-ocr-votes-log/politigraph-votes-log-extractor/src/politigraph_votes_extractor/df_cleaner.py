@@ -1,25 +1,38 @@
+from typing import List, Dict, Any
 import re
 import pandas as pd
 import numpy as np
 
-from .typo_cleaner import correct_typo
+from .typo_cleaner import correct_typos
 from thai_name_normalizer import remove_thai_name_prefix
-from poliquery import get_politician_prefixes, get_political_parties_name, get_people_in_party
+from poliquery import get_politician_prefixes, get_political_parties_name, get_people_in_party, NameResolver
+
+VOTE_OPTIONS = ["เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
+ABSENT_VOTE_OPTION = "ลา / ขาดลงมติ"
+
+NUMBER_PATTERN = re.compile(r"(\d+)")
+NON_THAI_PATTERN = re.compile(r"[^\u0E00-\u0E7F\s]")
+PARTY_PREFIX_PATTERN = re.compile(r".*?พรรค")
+PREFIX_TYPO_PATTERNS = [
+    (re.compile(r"^วาที่"), "ว่าที่"), # handle specific case of ว่าที่..
+    (re.compile(r"^ผูชวยศาสตราจารย"), "ผู้ช่วยศาสตราจารย์"),
+]
+VOTE_OPTION_TYPO_PATTERNS = [
+    (re.compile(r"ท"), "ห"),
+    (re.compile(r"ด้าย"), "ด้วย"),
+    (re.compile(r"(?<=น)ด(้)?าย"), "ด้วย"),
+]
 
 def merged_double_rows_name(
     df_original: pd.DataFrame,
     specific_col: str="ชื่อ - สกุล"
 ) -> pd.DataFrame:
-    
-    df = df_original.copy()
-    
-    # Remove missing vote options
-    df['ผลการลงคะแนน'] = df['ผลการลงคะแนน'].apply(
-        lambda x: "" if len(x)<5 else x
-    )
-    
-    # Replace empty string with NaN
-    df.replace("", np.nan, inplace=True)
+
+    # Remove missing vote options & replace empty string with NaN
+    vote_options = df_original['ผลการลงคะแนน']
+    df = df_original.assign(**{
+        'ผลการลงคะแนน': vote_options.mask(vote_options.str.len() < 5, "")
+    }).replace("", np.nan)
 
     other_cols = [col for col in df.columns if col != specific_col]
 
@@ -31,32 +44,21 @@ def merged_double_rows_name(
     # (True becomes 1, False becomes 0. cumsum() increments on True)
     group_key = (~is_merge_candidate_row).cumsum()
 
-    # Define an aggregation function for each group
-    def aggregate_rows(group):
-        # The first row of the group contains the base values for other_cols
-        first_row_data = group.iloc[0].copy()
+    # Other columns come from the first row of the group (merged rows have them all NaN)
+    df_merged = df[other_cols].groupby(group_key, sort=False).first()
 
-        # Concatenate all non-NaN values from the specific_col within this group
-        # Ensure values are strings before concatenation.
-        # Using dropna() before astype(str) avoids "nan" string if specific_col had NaN.
-        concatenated_specific_value = " ".join(group[specific_col].dropna().astype(str))
+    # Concatenate all non-NaN values from the specific_col within each group
+    specific_values = df[specific_col].dropna().astype(str)
+    df_merged[specific_col] = specific_values.groupby(
+        group_key[specific_values.index], sort=False
+    ).agg(" ".join)
 
-        first_row_data[specific_col] = concatenated_specific_value
-        return first_row_data
+    # Restore column order, drop the group key index & fill NaN back to empty string
+    return df_merged[df.columns].reset_index(drop=True).fillna("")
 
-    # Group by the key and apply the aggregation
-    df_groupby_result = df.groupby(group_key, sort=False).apply(aggregate_rows)
 
-    # The group_key might become the index, so reset it.
-    df_groupby_result = df_groupby_result.reset_index(drop=True)
-    
-    # Fill NaN back to empty string
-    df_groupby_result = df_groupby_result.fillna("")
-    return df_groupby_result
-
-    
 def clean_number_text(number_str: str) -> str:
-    matched_num = [num.strip() for num in re.findall(r"\d{1,}", number_str)]
+    matched_num = [num.strip() for num in NUMBER_PATTERN.findall(number_str)]
     if len(matched_num) > 0:
         return str(max(
             matched_num,
@@ -64,174 +66,233 @@ def clean_number_text(number_str: str) -> str:
         ))
     return ""
 
+def clean_number_column(column: pd.Series) -> pd.Series:
+    """
+    `clean_number_text` of a whole column: the longest number in each text.
+    """
+    numbers = column.fillna("").astype(str).str.extractall(NUMBER_PATTERN)[0]
+    if numbers.empty:
+        return pd.Series("", index=column.index)
+
+    # First of the longest numbers of each row
+    longest_numbers = numbers.loc[numbers.str.len().groupby(level=0).idxmax()]
+    longest_numbers.index = longest_numbers.index.get_level_values(0)
+    return longest_numbers.reindex(column.index, fill_value="")
+
+def _clean_df_number(df: pd.DataFrame, columns: List[str]) -> None:
+    for col in columns:
+        df[col] = clean_number_column(df[col])
+
 def clean_df_number(
     df_original: pd.DataFrame,
     columns=['ลําดับที่', 'เลขที่บัตร']
 ) -> pd.DataFrame:
-    df = df_original.copy()
-    df.fillna("", inplace=True)
-    for col in columns:
-        df[col] = df[col].apply(lambda x: clean_number_text(x))
-        
+    df = df_original.fillna("")
+    _clean_df_number(df, columns)
     return df
 
+def _clean_df_vote_options(df: pd.DataFrame, vote_options_texts: List[str]) -> None:
+
+    # Clean special characters out of options
+    options = df['ผลการลงคะแนน'].fillna("").astype(str)\
+        .str.replace(NON_THAI_PATTERN, "", regex=True)\
+        .str.strip()
+
+    # change empty option to '-'
+    options = options.mask(options.str.len() < 5, "-")
+
+    # Clean typo, once per distinct option
+    typo_options = [option for option in options.unique() if option != "-"]
+    corrections = dict(zip(
+        typo_options,
+        correct_typos(typo_options, vote_options_texts, similarity_threshold=80)
+    ))
+    # if not corrected, try to replace some common typos characters
+    uncorrected_options = [
+        option for option, correction in corrections.items() if correction not in vote_options_texts
+    ]
+    replaced_options = []
+    for option in uncorrected_options:
+        for pattern, correct in VOTE_OPTION_TYPO_PATTERNS:
+            option = pattern.sub(correct, option)
+        replaced_options.append(option)
+    corrections.update(zip(
+        uncorrected_options,
+        correct_typos(replaced_options, vote_options_texts, similarity_threshold=80)
+    ))
+    corrections["-"] = ABSENT_VOTE_OPTION
+
+    options = options.map(corrections)
+    df['ผลการลงคะแนน'] = pd.Categorical(
+        options,
+        categories=list(dict.fromkeys(
+            list(vote_options_texts) + [ABSENT_VOTE_OPTION] + options.unique().tolist()
+        ))
+    )
+
 def clean_df_vote_options(
     df_original: pd.DataFrame,
-    vote_options_texts=["เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
+    vote_options_texts=VOTE_OPTIONS
 ):
     df = df_original.copy()
-    
-    # Clean special characters out of name
-    df['ผลการลงคะแนน'] = df['ผลการลงคะแนน'].apply(
-        lambda name: re.sub(r"[^\u0E00-\u0E7F\s]", "", name).strip()
-    )
-    
-    # change empty option to '-'
-    df['ผลการลงคะแนน'] = df['ผลการลงคะแนน'].apply(
-        lambda x: "-" if len(x) < 5 else x
-    )
-    # Clean typo
-    def clean_vote_option_typo(text: str) -> str:
-        if text == "-":
-            return "-"
-        correct_text = correct_typo(text, vote_options_texts, similarity_threshold=80)
-        if correct_text in vote_options_texts:
-            return correct_text
-        # if not corrected, try to replace some common typos characters
-        replacements = {
-            r"ท": "ห",
-            r"ด้าย": "ด้วย",
-            r"(?<=น)ด(้)?าย": "ด้วย",
-        }
-        for typo, correct in replacements.items():
-            text = re.sub(typo, correct, text)
-        return correct_typo(text, vote_options_texts, similarity_threshold=80)
-        
-    df['ผลการลงคะแนน'] = df['ผลการลงคะแนน'].apply(clean_vote_option_typo)
-    df['ผลการลงคะแนน'] = df['ผลการลงคะแนน'].apply(
-        lambda x: "ลา / ขาดลงมติ" if x == "-" else x
-    )
-    
+    _clean_df_vote_options(df, vote_options_texts)
     return df
 
+def _clean_df_politician_name(
+    df: pd.DataFrame,
+    prefixes: List[str]|None=None,
+    people_in_party: Dict[str, List[Dict[str, Any]]]|None=None
+) -> None:
+
+    # Clean special characters out of name
+    names = df['ชื่อ - สกุล'].fillna("").astype(str)\
+        .str.replace(NON_THAI_PATTERN, "", regex=True)\
+        .str.strip()
+
+    # Clean typo in prefix
+    for pattern, correct_prefix in PREFIX_TYPO_PATTERNS:
+        names = names.str.replace(pattern, correct_prefix, regex=True)
+
+    # Load prefixes from politigraph
+    if prefixes is None:
+        prefixes = get_politician_prefixes()
+    # Remove name prefix, once per distinct name
+    unique_names = names.unique()
+    names = names.map(dict(zip(
+        unique_names,
+        [remove_thai_name_prefix(name=name, prefixes=prefixes) for name in unique_names]
+    )))
+    df['ชื่อ - สกุล'] = names
+
+    # Load politicians name of each party (once per party)
+    party_resolvers = {}
+    for party_name in df['ชื่อสังกัด'].unique():
+        if people_in_party is None:
+            persons = get_people_in_party(party_name)
+        else:
+            persons = people_in_party.get(party_name, [])
+        party_resolvers[party_name] = NameResolver(
+            persons=persons,
+            prefixes=prefixes
+        )
+
+    # Resolver of every party, for rows whose party has no known member
+    name_resolver = NameResolver(prefixes=prefixes)
+    for party_resolver in party_resolvers.values():
+        for person in party_resolver.persons:
+            name_resolver.add_person(person)
+
+    if len(name_resolver) == 0: # No politician names got returned back
+        return
+
+    # Correct names against members of the same party, a whole party at once,
+    # then names not found in their party against every party
+    matched_names = pd.Series(None, index=df.index, dtype=object)
+    for party_name, rows in df.groupby('ชื่อสังกัด', sort=False).groups.items():
+        party_resolver = party_resolvers.get(party_name) or name_resolver
+        matched_names.loc[rows] = party_resolver.match_names(names.loc[rows].to_list())
+
+    unmatched_rows = matched_names.isna()
+    if unmatched_rows.any():
+        matched_names.loc[unmatched_rows] = name_resolver.match_names(
+            names.loc[unmatched_rows].to_list()
+        )
+    df['ชื่อ - สกุล'] = matched_names.fillna(names).str.strip()
+
 def clean_df_politician_name(
     df_original: pd.DataFrame,
-    prefixes: list = []
+    prefixes: List[str]|None=None,
+    people_in_party: Dict[str, List[Dict[str, Any]]]|None=None
 ):
+    """
+    Clean & correct politician names against the politicians of their party
+
+    Args:
+        df_original: pd.DataFrame
+            Votes data
+        prefixes: List[str], optional
+            Name prefixes, loaded from Politigraph if None
+        people_in_party: Dict[str, List[Dict[str, Any]]], optional
+            Politicians of each party, loaded from Politigraph if None
+    """
     df = df_original.copy()
-    
-    # Clean special characters out of name
-    df['ชื่อ - สกุล'] = df['ชื่อ - สกุล'].apply(
-        lambda name: re.sub(r"[^\u0E00-\u0E7F\s]", "", name).strip()
-    )
-    
-    # Clean typo in prefix
-    perfix_pattern = {
-        "ว่าที่": r"^วาที่", # handle specific case of ว่าที่..
-        "ผู้ช่วยศาสตราจารย์": r"^ผูชวยศาสตราจารย"
-    }
-    def clean_prefixes_typo(name):
-        new_name = name
-        for correct_prefix, pattern in perfix_pattern.items():
-            new_name = re.sub(pattern, correct_prefix, new_name)
-        return new_name
-    
-    # Load prefixes from politigraph
-    prefixes = get_politician_prefixes()
-    # Remove name prefix
-    df['ชื่อ - สกุล'] = df['ชื่อ - สกุล'].apply(clean_prefixes_typo) # clean prefix typo
-    df['ชื่อ - สกุล'] = df['ชื่อ - สกุล'].apply(lambda name: remove_thai_name_prefix(
-        name=name,
-        prefixes=prefixes
-    ))
-    
-    # Load politicians name & clean them
-    parties_name = df['ชื่อสังกัด'].to_list()
-    
-    politicians_name = []
-    for party_name in parties_name:
-        people_in_party = get_people_in_party(party_name)
-        for person in people_in_party:
-            politicians_name.append(person['name'])
-            if not person['other_names']:
-                continue
-            politicians_name.extend([d['name'] for d in person['other_names']])
-            
-    if len(politicians_name) == 0: # No politician names got returned back
-        return df
-    df['ชื่อ - สกุล'] = df['ชื่อ - สกุล'].apply(
-        lambda name: correct_typo(name, politicians_name).strip()
-    )
-    
+    _clean_df_politician_name(df, prefixes=prefixes, people_in_party=people_in_party)
     return df
 
+def _clean_df_political_party(df: pd.DataFrame, parties_name: List[str]|None=None) -> None:
+
+    # Remove anything before and the word 'พรรค'
+    df['ชื่อสังกัด'] = df['ชื่อสังกัด'].fillna("").astype(str)\
+        .str.replace(PARTY_PREFIX_PATTERN, "", regex=True)
+
+    if parties_name is None:
+        parties_name = get_political_parties_name()
+    if len(parties_name) == 0: # No parties names got returned back
+        return
+    df['ชื่อสังกัด'] = correct_typos(df['ชื่อสังกัด'].to_list(), parties_name)
+
 def clean_df_political_party(
-    df_original: pd.DataFrame
+    df_original: pd.DataFrame,
+    parties_name: List[str]|None=None
 ):
     df = df_original.copy()
-    
-    # Remove anything before and the word 'พรรค'
-    df['ชื่อสังกัด'] = df['ชื่อสังกัด'].apply(
-        lambda name: re.sub(r".*?พรรค", "", name)
-    )
-    
-    parties_name = get_political_parties_name()
-    if len(parties_name) == 0: # No parties names got returned back
-        return df
-    df['ชื่อสังกัด'] = df['ชื่อสังกัด'].apply(
-        lambda name: correct_typo(name, parties_name)
-    )
-    
+    _clean_df_political_party(df, parties_name=parties_name)
     return df
 
 def remove_rows_with_many_empty_values(
     df_original: pd.DataFrame,
     threshold: int = 3
 ) -> pd.DataFrame:
-    df = df_original.copy()
-    
-    is_empty_or_nan = (df.isna()) | (df == '')
+
+    is_empty_or_nan = (df_original.isna()) | (df_original == '')
 
     # Count the number of True values (empty/NaN) per row
     empty_counts_per_row = is_empty_or_nan.sum(axis=1)
-    
+
     rows_to_keep_mask = empty_counts_per_row <= threshold
-    return df[rows_to_keep_mask]
+    return df_original[rows_to_keep_mask]
 
 def clean_votelog_df(
-    df_original: pd.DataFrame, 
+    df_original: pd.DataFrame,
+    prefixes: List[str]|None=None,
+    parties_name: List[str]|None=None,
+    people_in_party: Dict[str, List[Dict[str, Any]]]|None=None
 ) -> pd.DataFrame:
-    df = df_original.copy()
-    
+    """
+    Clean OCR votes log. Reference data (prefixes, parties & their politicians)
+    is loaded from Politigraph unless given.
+    """
+
     # Clean numbers
-    df = clean_df_number(df)
-    
+    df = df_original.fillna("")
+    _clean_df_number(df, ['ลําดับที่', 'เลขที่บัตร'])
+
     # Clean double rows name
     df = merged_double_rows_name(df)
-    
+
     # Clean vote options
-    df = clean_df_vote_options(df)
-    
+    _clean_df_vote_options(df, VOTE_OPTIONS)
+
     # Clean Political Party Name
-    df = clean_df_political_party(df)
-    
+    _clean_df_political_party(df, parties_name=parties_name)
+
     # Clean Politician Name
-    df = clean_df_politician_name(df)
-    
+    _clean_df_politician_name(df, prefixes=prefixes, people_in_party=people_in_party)
+
     # Clean rows with 3 or more empty values
-    df = remove_rows_with_many_empty_values(df)
-    
-    return df
+    return remove_rows_with_many_empty_values(df)
 
 def clean_extra_votes_df(
-    df_original: pd.DataFrame, 
+    df_original: pd.DataFrame,
+    prefixes: List[str]|None=None,
+    people_in_party: Dict[str, List[Dict[str, Any]]]|None=None
 ) -> pd.DataFrame:
     df = df_original.copy()
-    
+
     # Clean vote options
-    df = clean_df_vote_options(df)
-    
+    _clean_df_vote_options(df, VOTE_OPTIONS)
+
     # Clean Politician Name
-    df = clean_df_politician_name(df)
-    
+    _clean_df_politician_name(df, prefixes=prefixes, people_in_party=people_in_party)
+
     return df
@@ -1,30 +1,29 @@
+from typing import Dict, Tuple
 import cv2
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 
 from PIL import Image
-from pdf2image import convert_from_path, pdfinfo_from_path
 
-from .pdf_converter import load_pdf_to_image
-from .image_processing import process_to_gray_scale
+from .vote_log_document import VoteLogDocument, open_vote_log_document
+from .page_analysis import PageAnalysis, as_page_analysis
 from .bbox_helper import convert_rect_to_bbox
+from .recognition import recognize_texts
+from .text_layer import get_left_line_top
 
+# Bottom (fraction of the page height) of the last page part the extra votes
+# table is looked for in, below is the page footer
+FOOTER_BOTTOM = 0.9
+# Pixels above the footnote, cropped out as the margin of the band
+BAND_MARGIN = 25
 
-def dilate_text(image:Image, ksize=(20, 5), erode_k=(5, 5)):
-    gray_im = process_to_gray_scale(image)
-    gray_im = np.array(gray_im)
-    
-    blured = cv2.GaussianBlur(gray_im, (9, 9), 0)
-    th, threshed = cv2.threshold(
-        blured, 200, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
-    
-    erode = cv2.erode(threshed, np.ones(erode_k, np.uint8), iterations=1)
-    
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, ksize=ksize)
 
-    threshed = cv2.dilate(erode, kernel)
-    dilated = cv2.dilate(threshed, kernel)
+def dilate_text(image:Image.Image|PageAnalysis, ksize=(20, 5), erode_k=(5, 5)):
+    analysis = as_page_analysis(image)
+    
+    # Erode then dilate twice, in a single pass
+    dilated = analysis.dilate(ksize, ksize, erode_k=erode_k)
     
     return dilated
 
@@ -39,27 +38,37 @@ def detect_bbox(dilated:npt.ArrayLike):
     bboxs = [convert_rect_to_bbox(r) for r in rects]
     return bboxs
 
-def detect_bbox_in_row(image:Image, row_border:tuple) -> list:
+def detect_bbox_in_row(image:Image.Image|PageAnalysis, row_border:tuple) -> list:
     x1, y1, _, _ = row_border
-    row_image = image.crop(row_border)
+    row_analysis = as_page_analysis(image).crop(row_border)
     
-    dilated = dilate_text(row_image, ksize=(20, row_image.size[1]), erode_k=(2, 2))
+    dilated = dilate_text(row_analysis, ksize=(20, row_analysis.size[1]), erode_k=(2, 2))
     bboxes = detect_bbox(dilated)
     
     return [
         (bb[0]+x1, bb[1]+y1, bb[2]+x1, bb[3]+y1) for bb in bboxes
     ]
     
-def crop_bottom_out(image:Image, crop_margin:int=25):
+def get_bottom_crop_bbox(image:Image.Image|PageAnalysis, crop_margin:int=25, bottom:int|None=None) -> tuple:
     width, height = image.size
-    return image.crop((crop_margin, crop_margin, width-crop_margin, height*0.9))
+    if bottom is None:
+        bottom = round(height*FOOTER_BOTTOM)
+    return (crop_margin, crop_margin, width-crop_margin, bottom)
 
-def detect_table_in_btm_page(image:Image) -> list:
+def crop_bottom_out(image:Image.Image|PageAnalysis, crop_margin:int=25, bottom:int|None=None):
+    return image.crop(get_bottom_crop_bbox(image, crop_margin=crop_margin, bottom=bottom))
+
+def get_btm_table_bbox(image:Image.Image|PageAnalysis, bottom:int|None=None) -> tuple:
+    """
+    Bbox of the extra votes table (below the footnote) in the page.
+    """
+    analysis = as_page_analysis(image)
+    crop_x1, crop_y1, crop_x2, crop_y2 = get_bottom_crop_bbox(analysis, bottom=bottom)
+    cropped_btm_analysis = analysis.crop((crop_x1, crop_y1, crop_x2, crop_y2))
     
-    cropped_btm_image = crop_bottom_out(image)
     dilated = dilate_text(
-        cropped_btm_image,
-        ksize=(cropped_btm_image.size[0], 10),
+        cropped_btm_analysis,
+        ksize=(cropped_btm_analysis.size[0], 10),
         erode_k=(10, 10)
     )
 
@@ -70,13 +79,13 @@ def detect_table_in_btm_page(image:Image) -> list:
     rows_bbox = []
     for row_border in rows_borders:
         rows_bbox.append(
-            sorted(detect_bbox_in_row(cropped_btm_image, row_border),
+            sorted(detect_bbox_in_row(cropped_btm_analysis, row_border),
                 key=lambda bb: bb[0] # sort with x1
             )
         )
         
     # Get only further bbox
-    w, h = cropped_btm_image.size
+    w, h = cropped_btm_analysis.size
     _bboxes = []
     for row in rows_bbox:
         if len(row) > 1:
@@ -84,27 +93,44 @@ def detect_table_in_btm_page(image:Image) -> list:
         if row[0][2] < w//4: # end of bbox is less than 20% of page
             _bboxes.append(row[0])
     if not _bboxes:
-        return cropped_btm_image # detected no table
+        return (crop_x1, crop_y1, crop_x2, crop_y2) # detected no table
     footnote_bbox = sorted(_bboxes, key=lambda bb: bb[1])[0]
     
-    return cropped_btm_image.crop((0, footnote_bbox[3], w, h))
+    return (crop_x1, crop_y1 + footnote_bbox[3], crop_x2, crop_y2)
+
+def detect_table_in_btm_page(image:Image.Image, bottom:int|None=None) -> Image.Image:
+    return image.crop(get_btm_table_bbox(image, bottom=bottom))
 
-def extract_btm_table_data(image:Image, reader=None, padding:int=15):
+def read_btm_table(image:Image.Image, reader=None, padding:int=15, analysis:PageAnalysis|None=None) -> Tuple[list, list]:
+    """
+    Args:
+        image: Image
+            Extra votes table image
+        reader: easyocr.Reader
+            OCR reader
+        padding: int, optional
+            Vertical padding of the text boxes
+        analysis: PageAnalysis, optional
+            Analysis of `image` (e.g. a crop of the page analysis)
+
+    Returns:
+        Text boxes of each row (3 columns, right to left) & their text
+    """
+    analysis = as_page_analysis(analysis if analysis is not None else image)
     dilated = dilate_text(
-        image,
-        ksize=(image.size[0], 10),
+        analysis,
+        ksize=(analysis.size[0], 10),
         erode_k=(10, 10)
     )
 
     rows_borders = detect_bbox(dilated)
     rows_borders.sort(key=lambda bb: bb[1])
     
-    # Read data in each row
-    data = []
+    # Get text boxes in each row
+    rows_bboxes = []
     img = np.array(image)
     for row_border in rows_borders:
-        row_data = []
-        row_bboxes = sorted(detect_bbox_in_row(image, row_border),
+        row_bboxes = sorted(detect_bbox_in_row(analysis, row_border),
             key=lambda bb: bb[2], # sort with x2
             reverse=True
         )
@@ -115,33 +141,69 @@ def extract_btm_table_data(image:Image, reader=None, padding:int=15):
             (bb[0], 
              bb[1] - padding if bb[1] - padding >= 0 else 0, 
              bb[2], 
-             bb[3] + padding) for bb in row_bboxes
+             bb[3] + padding) for bb in row_bboxes[:3]
         ]
-        for bbox in row_bboxes:
-            _x1, _y1, _x2, _y2 = bbox
-            row_data.append(
-                reader.recognize(
-                    img[_y1:_y2, _x1:_x2]
-                )[0][1] # ocr text from textbox
-            )
-        data.append(row_data[:3])
-        
+        rows_bboxes.append(row_bboxes)
+    
+    # Read data of every row at once
+    texts = iter(recognize_texts(
+        reader,
+        img,
+        [bbox for row_bboxes in rows_bboxes for bbox in row_bboxes]
+    ))
+    data = [[next(texts) for _ in row_bboxes] for row_bboxes in rows_bboxes]
     
+    return rows_bboxes, data
+
+def extract_btm_table_data(image:Image.Image, reader=None, padding:int=15, analysis:PageAnalysis|None=None):
+    _, data = read_btm_table(image, reader=reader, padding=padding, analysis=analysis)
     return data
 
-def extract_extra_votes(pdf_file_path: str, reader=None) -> pd.DataFrame:
+def read_extra_votes(vote_log_document: VoteLogDocument, reader=None) -> Dict[str, list]:
+    """
+    OCR the extra votes table at the bottom of the last page.
+
+    Returns:
+        Raw OCR output, 'cells': text boxes of each row (page pixels at the
+        document dpi) & 'texts': their text
+    """
+    # Render only the bottom of the last page, from above the footnote the
+    # table follows (text layer) to the page footer
+    footnote_top = get_left_line_top(vote_log_document.get_page(-1)) or 0.0
+    _, page_height = vote_log_document.get_page_size(-1)
+    band_top = max(0.0, footnote_top - BAND_MARGIN / page_height)
+    image = vote_log_document.get_page_band(-1, band_top, FOOTER_BOTTOM)
+    
+    # Text mask of the band computed once, for the footnote & the table rows
+    page_analysis = PageAnalysis(image)
+    btm_table_bbox = get_btm_table_bbox(page_analysis, bottom=image.size[1])
+    rows_bboxes, btm_table_data = read_btm_table(
+        image.crop(btm_table_bbox),
+        reader=reader,
+        analysis=page_analysis.crop(btm_table_bbox)
+    )
+    
+    # Band & table offsets back to the page
+    x1 = btm_table_bbox[0]
+    y1 = btm_table_bbox[1] + round(page_height * band_top)
+    return {
+        'cells': [
+            [(bb[0]+x1, bb[1]+y1, bb[2]+x1, bb[3]+y1) for bb in row_bboxes]
+                for row_bboxes in rows_bboxes
+        ],
+        'texts': btm_table_data
+    }
+
+def extract_extra_votes(document: str|VoteLogDocument, reader=None) -> pd.DataFrame:
     
     # assert reader, "OCR Reader Not Found!!"
     
-    # Get pdf info
-    _pdf_info = pdfinfo_from_path(pdf_file_path)
-    last_page = _pdf_info['Pages']
+    vote_log_document = open_vote_log_document(document)
     
-    # Convert to images
-    pdf_images = load_pdf_to_image(pdf_file_path, dpi=300, first_page=last_page)
-    image = pdf_images[0]
+    extra_votes_ocr = vote_log_document.load_ocr('extra_votes', -1)
+    if extra_votes_ocr is None:
+        extra_votes_ocr = read_extra_votes(vote_log_document, reader=reader)
+        vote_log_document.save_ocr('extra_votes', -1, extra_votes_ocr)
     
-    btm_table_image = detect_table_in_btm_page(image)
-    btm_table_data = extract_btm_table_data(btm_table_image, reader=reader)
-    extra_votes_df = pd.DataFrame(btm_table_data, columns=['ผลการลงคะแนน', 'ชื่อสังกัด', 'ชื่อ - สกุล'])
+    extra_votes_df = pd.DataFrame(extra_votes_ocr['texts'], columns=['ผลการลงคะแนน', 'ชื่อสังกัด', 'ชื่อ - สกุล'])
     return extra_votes_df[['ชื่อ - สกุล', 'ชื่อสังกัด', 'ผลการลงคะแนน']]
\ No newline at end of file
@@ -0,0 +1,205 @@
+from typing import List, Tuple
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+from .image_processing import scale_size
+from .page_analysis import PageAnalysis
+
+# (start, end) pixel runs, end excluded, one per row
+Runs = npt.NDArray[np.int_]
+
+def find_runs(profile: npt.NDArray[np.bool_]) -> Runs:
+    """(start, end) of every run of True in a 1D profile."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], profile.astype(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+def merge_close_runs(runs: Runs, min_gap: int) -> Runs:
+    """Merge runs separated by less than `min_gap` pixels."""
+    if len(runs) < 2:
+        return runs
+    is_split = runs[1:, 0] - runs[:-1, 1] >= min_gap
+    return np.stack([
+        runs[np.concatenate(([True], is_split)), 0],
+        runs[np.concatenate((is_split, [True])), 1]
+    ], axis=1)
+
+def keep_widest_gaps(runs: Runs, n_runs: int) -> Runs:
+    """Merge runs across the narrowest gaps until `n_runs` are left."""
+    if len(runs) <= n_runs:
+        return runs
+    gaps = runs[1:, 0] - runs[:-1, 1]
+    is_split = np.zeros(len(gaps), dtype=bool)
+    is_split[np.argsort(gaps, kind='stable')[len(gaps)-(n_runs-1):]] = True
+    return np.stack([
+        runs[np.concatenate(([True], is_split)), 0],
+        runs[np.concatenate((is_split, [True])), 1]
+    ], axis=1)
+
+def get_ink_integral(mask: npt.NDArray[np.uint8]) -> npt.NDArray[np.int32]:
+    """Integral image of the ink pixels (count of ink above & left of each pixel)."""
+    _, ink = cv2.threshold(mask, 0, 1, cv2.THRESH_BINARY)
+    return cv2.integral(ink, sdepth=cv2.CV_32S)
+
+def remove_ruling_lines(mask: npt.NDArray[np.uint8], min_line_ratio: float=0.9) -> Tuple[npt.NDArray[np.int32], Runs]:
+    """
+    Ink integral of the text without the ruling lines, rows (columns) of ink
+    across most of the table are lines.
+
+    Returns:
+        Ink integral & vertical lines (x runs)
+    """
+    integral = get_ink_integral(mask)
+    h, w = mask.shape
+    is_h_line = np.diff(integral[:, w]) >= w * min_line_ratio
+    is_v_line = np.diff(integral[h, :]) >= h * min_line_ratio
+    if is_h_line.any() or is_v_line.any():
+        mask = mask.copy()
+        mask[is_h_line, :] = 0
+        mask[:, is_v_line] = 0
+        integral = get_ink_integral(mask)
+    return integral, find_runs(is_v_line)
+
+def get_columns_from_lines(v_lines: Runs, width: int, n_columns: int) -> Runs|None:
+    """Columns between the vertical ruling lines (& the table sides)."""
+    borders = np.concatenate(([0], v_lines.ravel(), [width]))
+    columns = borders.reshape(-1, 2)
+    columns = columns[columns[:, 1] > columns[:, 0]]
+    return columns if len(columns) == n_columns else None
+
+def get_columns_from_projection(
+    integral: npt.NDArray[np.int32],
+    rows: Runs,
+    min_gap: int,
+    min_rows_ratio: float=0.2
+) -> Runs:
+    """
+    Columns where at least `min_rows_ratio` of the rows have ink, a line
+    that doesn't follow the columns (the table header, a name running over
+    the next column) doesn't make a column.
+    """
+    rows_ink = np.diff(integral[rows[:, 1]] - integral[rows[:, 0]], axis=1) > 0
+    rows_count = rows_ink.sum(axis=0)
+    return merge_close_runs(
+        find_runs(rows_count >= max(1, len(rows) * min_rows_ratio)),
+        min_gap
+    )
+
+def widen_columns(integral: npt.NDArray[np.int32], rows: Runs, columns: Runs) -> Runs:
+    """
+    Widen the columns to every ink of the rows between the separators (half
+    way between two columns), so longer cells don't get cut.
+    """
+    rows_ink = (np.diff(integral[rows[:, 1]] - integral[rows[:, 0]], axis=1) > 0).any(axis=0)
+    ink_x = np.flatnonzero(rows_ink)
+    borders = np.concatenate((
+        [0],
+        (columns[1:, 0] + columns[:-1, 1]) // 2,
+        [len(rows_ink)]
+    ))
+    starts = np.searchsorted(ink_x, borders[:-1])
+    ends = np.searchsorted(ink_x, borders[1:]) - 1
+    has_ink = ends >= starts
+    widened = columns.copy()
+    widened[has_ink, 0] = ink_x[starts[has_ink]]
+    widened[has_ink, 1] = ink_x[ends[has_ink]] + 1
+    return widened
+
+def count_cells_ink(integral: npt.NDArray[np.int32], rows: Runs, columns: Runs) -> npt.NDArray[np.int_]:
+    """Ink pixels of every cell (rows x columns)."""
+    y1, y2 = rows[:, 0, None], rows[:, 1, None]
+    x1, x2 = columns[None, :, 0], columns[None, :, 1]
+    return integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+
+def detect_table_grid(
+    analysis: PageAnalysis,
+    n_columns: int=5,
+    min_row_gap: int=10,
+    min_column_gap: int=30,
+    min_rows_ratio: float=0.2,
+    min_row_height: int=20,
+    max_row_height: int=200,
+    x_padding: int=10,
+    y_padding: int=8,
+    last_row_threshold: float=0.3
+) -> List[List[Tuple[int, int, int, int]]]|None:
+    """
+    Cells of the votes table from the ink projections of the text mask:
+    rows are split at the blank lines of the horizontal projection, columns
+    at the widest blank gaps of the vertical projection (or at the vertical
+    ruling lines if the table has them).
+
+    Sizes are in full resolution pixels, cells too. None if no table grid
+    is found (see `bbox_helper` for the text boxes fallback).
+    """
+    scale = analysis.scale
+    h, w = analysis.mask.shape[:2]
+    if not h or not w:
+        return None
+    # Every projection below comes from this integral, one pass on the mask
+    integral, v_lines = remove_ruling_lines(analysis.mask)
+
+    # Rows: runs of lines with ink, tone marks & vowels above/below merged in
+    rows = merge_close_runs(
+        find_runs(np.diff(integral[:, w]) > 0),
+        scale_size(min_row_gap, scale)
+    )
+    rows_height = rows[:, 1] - rows[:, 0]
+    rows = rows[
+        (rows_height > scale_size(min_row_height, scale))
+        & (rows_height < scale_size(max_row_height, scale))
+    ]
+    if len(rows) < 2:
+        return None
+
+    # Columns: runs of ink over most rows, words of a cell merged in
+    columns = get_columns_from_lines(v_lines, w, n_columns)
+    is_ruled = columns is not None
+    if not is_ruled:
+        columns = get_columns_from_projection(
+            integral,
+            rows,
+            scale_size(min_column_gap, scale),
+            min_rows_ratio
+        )
+        columns = keep_widest_gaps(columns, n_columns)
+    if len(columns) != n_columns:
+        return None
+
+    # Trim rows that aren't table rows (part of the page header, signature)
+    filled_cells = (count_cells_ink(integral, rows, columns) > 0).sum(axis=1)
+    first = 0
+    while len(rows) - first >= 2 and filled_cells[first] < n_columns:
+        first += 1
+    last = len(rows)
+    while last - first >= 3 and (filled_cells[last-3:last] < n_columns-1).any(): # n_columns-1 for case of '-' at last row
+        last -= 1
+    rows = rows[first:last]
+    if len(rows) < 2:
+        return None
+
+    if not is_ruled:
+        columns = widen_columns(integral, rows, columns)
+
+    # If the last row is significantly larger than previous row
+    # then it is row with signature signed
+    rows_height = rows[:, 1] - rows[:, 0]
+    if rows_height[-1] - rows_height[-2] > rows_height[-2] * last_row_threshold:
+        rows[-1, 1] = rows[-1, 0] + rows_height[-2]
+
+    # To full resolution, padded (cells of a ruled table already go from line to line)
+    if is_ruled:
+        x_padding = 0
+    cells_x = np.stack([
+        np.round(columns[:, 0] / scale) - x_padding,
+        np.round(columns[:, 1] / scale) + x_padding
+    ], axis=1).clip(0, round(w / scale)).astype(int)
+    cells_y = np.stack([
+        np.round(rows[:, 0] / scale) - y_padding,
+        np.round(rows[:, 1] / scale) + y_padding
+    ], axis=1).clip(0, round(h / scale)).astype(int)
+
+    return [
+        [(int(x1), int(y1), int(x2), int(y2)) for x1, x2 in cells_x]
+            for y1, y2 in cells_y
+    ]
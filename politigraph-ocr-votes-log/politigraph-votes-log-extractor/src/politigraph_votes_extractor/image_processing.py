@@ -3,11 +3,33 @@ import numpy as np
 import numpy.typing as npt
 from PIL import Image
 
-def process_to_gray_scale(image: Image) -> npt.ArrayLike:
+def scale_size(size: int, scale: float=1.0) -> int:
+    """Pixel size tuned for full resolution, on an image `scale` times as big."""
+    return max(1, round(size * scale))
+
+def scale_kernel(ksize: tuple, scale: float=1.0) -> tuple:
+    """
+    Kernel size for an image `scale` times as big. Odd kernels are scaled by
+    their half width so they stay odd & centered (even ones are anchored off
+    center & would shift the boxes).
+    """
+    return tuple(
+        round((k - 1) / 2 * scale) * 2 + 1 if k % 2 else scale_size(k, scale)
+            for k in ksize
+    )
+
+def scale_threshold(threshold: int, scale: float=1.0) -> int:
+    """
+    Binarization threshold for an image `scale` times as big, a stroke
+    covers `scale` of a pixel so it comes out lighter.
+    """
+    return round(255 - (255 - threshold) * scale)
+
+def process_to_gray_scale(image: Image, scale: float=1.0) -> npt.ArrayLike:
     # Convert to gray scale
     image = image.convert('L')
     # Threshold
-    threshold = 125
+    threshold = scale_threshold(125, min(scale, 1.0))
     image = image.point( lambda p: 255 if p > threshold else 0 )
     # To mono
     image = image.convert('1')
@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, Dict
+
+from .ocr_pool import RECOG_NETWORK
+
+# Bump when a change of the layout detection or the recognition changes the
+# OCR output, older entries won't be read anymore
+EXTRACTOR_VERSION = "2"
+
+def get_file_hash(file_path: str, chunk_size: int=1 << 20) -> str:
+    """sha256 of the file content."""
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+class OCRCache:
+    """
+    On-disk cache of the raw OCR output of vote log pages (cell boxes &
+    text), before any cleaning.
+
+    Entries are content-addressed: the key is the hash of the PDF content,
+    the page, the part of the page (votes table, header, extra votes), the
+    extractor version, the recognition model & the render settings. So a
+    re-run on the same PDF (re-validation, cleaning with updated name lists,
+    retried upload) reads the pages back instead of OCR'ing them again.
+
+    Entries are JSON files written atomically, worker processes can share
+    the cache directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str=RECOG_NETWORK,
+        extractor_version: str=EXTRACTOR_VERSION
+    ) -> None:
+        """
+        Args:
+            cache_dir: str
+                Directory of the cache entries, created on first write
+            model_name: str, optional
+                Recognition model the text is read with
+            extractor_version: str, optional
+                Version of the extractor the OCR output comes from
+        """
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        self.extractor_version = extractor_version
+
+    def get_key(
+        self,
+        pdf_hash: str,
+        part: str,
+        page_index: int,
+        dpi: int,
+        detection_dpi: int,
+        grayscale: bool
+    ) -> str:
+        key_data = [
+            pdf_hash, part, page_index,
+            self.extractor_version, self.model_name,
+            dpi, detection_dpi, grayscale
+        ]
+        return hashlib.sha256(json.dumps(key_data).encode("utf-8")).hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(
+        self,
+        pdf_hash: str,
+        part: str,
+        page_index: int,
+        dpi: int,
+        detection_dpi: int,
+        grayscale: bool
+    ) -> Dict[str, Any]|None:
+        """Cached OCR output, None if it isn't cached (or unreadable)."""
+        entry_path = self._get_entry_path(
+            self.get_key(pdf_hash, part, page_index, dpi, detection_dpi, grayscale)
+        )
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                return json.load(f)["data"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(
+        self,
+        pdf_hash: str,
+        part: str,
+        page_index: int,
+        dpi: int,
+        detection_dpi: int,
+        grayscale: bool,
+        data: Dict[str, Any]
+    ) -> None:
+        key = self.get_key(pdf_hash, part, page_index, dpi, detection_dpi, grayscale)
+        entry_path = self._get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        entry = {
+            "pdf_hash": pdf_hash,
+            "part": part,
+            "page_index": page_index,
+            "extractor_version": self.extractor_version,
+            "model_name": self.model_name,
+            "dpi": dpi,
+            "detection_dpi": detection_dpi,
+            "grayscale": grayscale,
+            "data": data
+        }
+        # Write aside then rename, readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=int)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,178 @@
+import os
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+# Recognition model of the OCR reader
+RECOG_NETWORK = 'thai-vl'
+
+# Set in each worker process by `init_worker`
+_worker_reader = None
+_worker_document = None
+
+def get_reader_kwargs(model_dir: str="/tmp/models", gpu: bool=False) -> Dict[str, Any]:
+    """easyocr.Reader arguments for the Thai recognition model (thai-vl)."""
+    return dict(
+        lang_list=['th'],
+        recog_network=RECOG_NETWORK,
+        user_network_directory=model_dir,
+        model_storage_directory=model_dir,
+        detector=False,
+        gpu=gpu,
+        verbose=False
+    )
+
+def init_worker(reader_kwargs: Dict[str, Any], torch_threads: int=1) -> None:
+    """Load the OCR model once per worker process."""
+    global _worker_reader
+    import torch
+    import easyocr
+
+    # One process per core, so keep torch from spreading each worker over every core
+    torch.set_num_threads(torch_threads)
+    _worker_reader = easyocr.Reader(**reader_kwargs)
+
+def get_worker_reader():
+    assert _worker_reader is not None, "OCR Reader Not Found!! (not in an OCR worker process)"
+    return _worker_reader
+
+def _get_worker_document(
+    pdf_file_path: str,
+    dpi: int=300,
+    grayscale: bool=True,
+    detection_dpi: int|None=150,
+    ocr_cache=None
+):
+    # Keep the last document open, workers get pages of the same document in a row
+    global _worker_document
+    from .vote_log_document import VoteLogDocument
+
+    document = _worker_document
+    if document is None or document.pdf_file_path != pdf_file_path\
+        or document.dpi != dpi or document.grayscale != grayscale\
+        or document.detection_dpi != min(detection_dpi or dpi, dpi):
+        if document is not None:
+            document.close()
+        document = VoteLogDocument(
+            pdf_file_path,
+            dpi=dpi,
+            grayscale=grayscale,
+            detection_dpi=detection_dpi
+        )
+        _worker_document = document
+    document.ocr_cache = ocr_cache
+    return document
+
+def _extract_page_table_data(
+    pdf_file_path: str,
+    page_index: int,
+    dpi: int,
+    grayscale: bool,
+    detection_dpi: int|None,
+    ocr_cache=None
+) -> List[List[str]]:
+    from .votes_extractor import extract_page_table_data
+
+    document = _get_worker_document(pdf_file_path, dpi, grayscale, detection_dpi, ocr_cache)
+    table_data = extract_page_table_data(document, page_index, reader=get_worker_reader())
+    # Pages are rendered once per worker, no need to keep them
+    document.release_page_image(page_index)
+    return table_data
+
+def _call_with_reader(func: Callable[..., T], *args) -> T:
+    return func(*args, reader=get_worker_reader())
+
+def _call_with_document(func: Callable[..., T], pdf_file_path: str, ocr_cache=None) -> T:
+    document = _get_worker_document(pdf_file_path, ocr_cache=ocr_cache)
+    return func(document, reader=get_worker_reader())
+
+class OCRProcessPool:
+    """
+    Pool of OCR worker processes, each with its own easyocr Reader loaded
+    once at start.
+
+    Pages of a document (`map_pages`) or whole documents (`map_documents`)
+    are spread over the workers, results come back in submission order.
+    """
+
+    def __init__(
+        self,
+        max_workers: int|None=None,
+        reader_kwargs: Dict[str, Any]|None=None,
+        torch_threads: int=1
+    ) -> None:
+        """
+        Args:
+            max_workers: int, optional
+                Number of worker processes, number of CPU cores if None
+            reader_kwargs: Dict[str, Any], optional
+                easyocr.Reader arguments, see `get_reader_kwargs`
+            torch_threads: int, optional
+                Torch threads per worker
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Fork after torch got loaded can deadlock
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(reader_kwargs or get_reader_kwargs(), torch_threads)
+        )
+
+    def __enter__(self) -> 'OCRProcessPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def submit(self, func: Callable[..., T], *args) -> 'Future[T]':
+        """
+        Run `func(*args, reader=<worker reader>)` in a worker.
+        `func` must be importable (module level) to reach the worker.
+        """
+        return self._executor.submit(_call_with_reader, func, *args)
+
+    def submit_document(self, func: Callable[..., T], pdf_file_path: str, ocr_cache=None) -> 'Future[T]':
+        """
+        Run `func(<document>, reader=<worker reader>)` in a worker, the
+        document is opened in the worker (with `ocr_cache`, see `OCRCache`).
+        """
+        return self._executor.submit(_call_with_document, func, pdf_file_path, ocr_cache)
+
+    def map_pages(
+        self,
+        pdf_file_path: str,
+        page_indexes: Iterable[int],
+        dpi: int=300,
+        grayscale: bool=True,
+        detection_dpi: int|None=150,
+        ocr_cache=None
+    ) -> List[List[List[str]]]:
+        """
+        Votes table data of each page, in page order. Workers read & write
+        the OCR output of the pages in `ocr_cache` (see `OCRCache`).
+        """
+        page_indexes = list(page_indexes)
+        return list(self._executor.map(
+            _extract_page_table_data,
+            repeat(pdf_file_path, len(page_indexes)),
+            page_indexes,
+            repeat(dpi, len(page_indexes)),
+            repeat(grayscale, len(page_indexes)),
+            repeat(detection_dpi, len(page_indexes)),
+            repeat(ocr_cache, len(page_indexes))
+        ))
+
+    def map_documents(self, func: Callable[..., T], pdf_file_paths: Iterable[str]) -> Iterator[T]:
+        """
+        `func(pdf_file_path, reader=<worker reader>)` of each document, in order.
+        """
+        futures = [self.submit(func, pdf_file_path) for pdf_file_path in pdf_file_paths]
+        for future in futures:
+            yield future.result()
+
+    def shutdown(self, cancel_futures: bool=False) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=cancel_futures)
@@ -0,0 +1,122 @@
+from typing import Sequence, Tuple
+import cv2
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+from .image_processing import process_to_gray_scale, noise_removal, scale_kernel
+
+# Above this kernel size a box filter (constant time per pixel) beats cv2.dilate
+BOX_FILTER_MIN_KSIZE = 512
+
+def dilate_mask(mask: npt.NDArray[np.uint8], *ksizes: Tuple[int, int]) -> npt.NDArray[np.uint8]:
+    """
+    Same as `cv2.dilate` of the mask with a rect kernel of each `ksizes` in a
+    row, in a single pass: rect dilations in a row are one dilation with the
+    summed kernel & anchor.
+
+    Page-wide kernels (whole rows / columns) go through a box filter, a pixel
+    is set if any pixel of its window is set, whatever the kernel size.
+    """
+    kw = sum(k[0] - 1 for k in ksizes) + 1
+    kh = sum(k[1] - 1 for k in ksizes) + 1
+    anchor = (sum(k[0] // 2 for k in ksizes), sum(k[1] // 2 for k in ksizes))
+    if kw == 1 and kh == 1:
+        return mask.copy()
+
+    if max(kw, kh) < BOX_FILTER_MIN_KSIZE:
+        return cv2.dilate(
+            mask,
+            cv2.getStructuringElement(cv2.MORPH_RECT, (kw, kh)),
+            anchor=anchor
+        )
+
+    summed = cv2.boxFilter(
+        (mask > 0).astype(np.float32),
+        -1,
+        (kw, kh),
+        anchor=anchor,
+        normalize=False,
+        borderType=cv2.BORDER_CONSTANT
+    )
+    return np.where(summed > 0.5, 255, 0).astype(np.uint8)
+
+class PageAnalysis:
+    """
+    Text mask of a page image computed once: gray scale & mono, Gaussian
+    blur, then Otsu threshold (text is 255).
+
+    `crop` hands out sub-views (numpy slices, no copy) so the table, its rows
+    & the boxes of a row are detected on the same mask instead of running the
+    whole pipeline again on every crop.
+    """
+
+    def __init__(
+        self,
+        image: Image.Image|npt.NDArray,
+        scale: float=1.0,
+        denoise: bool=False
+    ) -> None:
+        """
+        Args:
+            image: Image|npt.NDArray
+                Page image
+            scale: float, optional
+                Resolution of the image relative to the full resolution the
+                kernel sizes are tuned for (detection image)
+            denoise: bool, optional
+                Median blur the mono image before thresholding
+        """
+        self.scale = scale
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        gray_im = process_to_gray_scale(image, scale=scale)
+        if denoise:
+            gray_im = noise_removal(gray_im)
+
+        blured = cv2.GaussianBlur(gray_im, scale_kernel((9, 9), scale), 0)
+        _, self.mask = cv2.threshold(
+            blured, 200, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+
+    @classmethod
+    def from_mask(cls, mask: npt.NDArray[np.uint8], scale: float=1.0) -> 'PageAnalysis':
+        analysis = cls.__new__(cls)
+        analysis.scale = scale
+        analysis.mask = mask
+        return analysis
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) like PIL."""
+        h, w = self.mask.shape[:2]
+        return w, h
+
+    def crop(self, bbox: Sequence[int]) -> 'PageAnalysis':
+        """Sub-view of a region (x1, y1, x2, y2), clipped to the page."""
+        w, h = self.size
+        x1, y1, x2, y2 = bbox
+        x1, y1 = min(max(0, int(x1)), w), min(max(0, int(y1)), h)
+        x2, y2 = min(max(x1, int(x2)), w), min(max(y1, int(y2)), h)
+        return PageAnalysis.from_mask(self.mask[y1:y2, x1:x2], scale=self.scale)
+
+    def dilate(
+        self,
+        *ksizes: Tuple[int, int],
+        erode_k: Tuple[int, int]|None=None
+    ) -> npt.NDArray[np.uint8]:
+        """
+        Text mask, eroded by `erode_k` (if any) then dilated by every kernel
+        of `ksizes` in a row, see `dilate_mask`.
+        """
+        mask = self.mask
+        if erode_k:
+            mask = cv2.erode(mask, np.ones(erode_k, np.uint8), iterations=1)
+        return dilate_mask(mask, *ksizes)
+
+def as_page_analysis(image: 'Image.Image|npt.NDArray|PageAnalysis', **kwargs) -> PageAnalysis:
+    """
+    Use an already computed analysis as is, or analyse an image.
+    """
+    if isinstance(image, PageAnalysis):
+        return image
+    return PageAnalysis(image, **kwargs)
@@ -1,19 +1,18 @@
 from typing import List
+import numpy as np
+import numpy.typing as npt
+from PIL import Image as PILImage
 from PIL.Image import Image
 import fitz
-from pdf2image import convert_from_bytes
 
-def load_pdf_to_image(
+def open_pdf_without_watermark(
     pdf_file_path: str,
-    dpi: int=300,
-    first_page: int|None=None,
-    last_page: int|None=None,
     watermark_layer_name: str='Watermark'
-) -> List[Image]:
-    
+) -> fitz.Document:
+
     # Load doc
     doc = fitz.open(pdf_file_path)
-    
+
     # Get all Optional Content Groups (layers)
     ocgs = doc.get_ocgs()
 
@@ -27,19 +26,78 @@ def load_pdf_to_image(
     if watermark_xref:
         # Disable the watermark layer in the default configuration
         doc.set_layer(-1, off=[watermark_xref])
+        # and in the layer state used to render pages of the opened doc
+        for layer_config in doc.layer_ui_configs():
+            if layer_config.get("text") == watermark_layer_name:
+                doc.set_layer_ui_config(layer_config["number"], action=2) # 2: off
 
-    # Save the modified PDF to a memory buffer
-    pdf_bytes = doc.write()
+    return doc
+
+def render_page_pixmap(
+    page: fitz.Page,
+    dpi: int=300,
+    grayscale: bool=False,
+    clip: fitz.Rect|None=None
+) -> fitz.Pixmap:
+    return page.get_pixmap(
+        dpi=dpi,
+        colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+        alpha=False,
+        clip=clip
+    )
+
+def pixmap_to_array(pixmap: fitz.Pixmap) -> npt.NDArray[np.uint8]:
+    """
+    (h, w) array for grayscale pixmaps, (h, w, 3) for RGB.
+    """
+    array = np.frombuffer(pixmap.samples_mv, dtype=np.uint8)\
+        .reshape(pixmap.height, pixmap.stride)[:, :pixmap.width * pixmap.n]
+    if pixmap.n == 1:
+        return array.reshape(pixmap.height, pixmap.width)
+    return array.reshape(pixmap.height, pixmap.width, pixmap.n)
+
+def pixmap_to_image(pixmap: fitz.Pixmap) -> Image:
+    mode = "L" if pixmap.n == 1 else "RGB"
+    return PILImage.frombytes(mode, (pixmap.width, pixmap.height), pixmap.samples)
+
+def render_page(
+    page: fitz.Page,
+    dpi: int=300,
+    grayscale: bool=False,
+    clip: fitz.Rect|None=None
+) -> Image:
+    """
+    Render a PDF page straight from MuPDF, without writing the PDF out or
+    going through poppler.
+    """
+    return pixmap_to_image(render_page_pixmap(page, dpi=dpi, grayscale=grayscale, clip=clip))
+
+def render_page_array(
+    page: fitz.Page,
+    dpi: int=300,
+    grayscale: bool=False,
+    clip: fitz.Rect|None=None
+) -> npt.NDArray[np.uint8]:
+    return pixmap_to_array(render_page_pixmap(page, dpi=dpi, grayscale=grayscale, clip=clip)).copy()
+
+def load_pdf_to_image(
+    pdf_file_path: str,
+    dpi: int=300,
+    first_page: int|None=None,
+    last_page: int|None=None,
+    watermark_layer_name: str='Watermark',
+    grayscale: bool=False
+) -> List[Image]:
+
+    doc = open_pdf_without_watermark(pdf_file_path, watermark_layer_name)
+
+    # Render pages (1-based, inclusive like pdf2image)
+    first_index = (first_page or 1) - 1
+    last_index = min(last_page or doc.page_count, doc.page_count) - 1
+    images = [
+        render_page(doc[page_index], dpi=dpi, grayscale=grayscale)
+            for page_index in range(first_index, last_index+1)
+    ]
     doc.close()
-    
-    # Convert the PDF bytes to a list of PIL Image objects
-    if first_page and last_page:
-        images = convert_from_bytes(pdf_bytes, dpi=dpi, first_page=first_page, last_page=last_page)
-    elif first_page:
-        images = convert_from_bytes(pdf_bytes, dpi=dpi, first_page=first_page)
-    elif last_page:
-        images = convert_from_bytes(pdf_bytes, dpi=dpi, last_page=last_page)
-    else:
-        images = convert_from_bytes(pdf_bytes, dpi=dpi)
-    
-    return images
\ No newline at end of file
+
+    return images
@@ -0,0 +1,212 @@
+import math
+from typing import Dict, List, Sequence, Tuple
+from weakref import WeakKeyDictionary
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+Bbox = Tuple[int, int, int, int]
+
+def clip_bbox(bbox: Sequence[int], h: int, w: int) -> Bbox:
+    x1, y1, x2, y2 = bbox
+    return (max(0, int(x1)), max(0, int(y1)), min(w, int(x2)), min(h, int(y2)))
+
+def recognize_texts(
+    reader,
+    image: npt.NDArray,
+    bboxes: Sequence[Sequence[int]],
+    batch_size: int=32
+) -> List[str]:
+    """
+    Recognize the text in many boxes (x1, y1, x2, y2) of one image, the
+    recognizer model running on batches of crops.
+
+    `Reader.recognize` runs the model on one box at a time on CPU, so the
+    crops are cut & resized the way it does (`easyocr.utils.get_image_list`)
+    and go to `easyocr.recognition.get_text` directly. Crops are bucketed by
+    the width they get padded to (aspect ratio rounded up, as easyocr does),
+    so a crop goes through the model as the same input as if it was read
+    alone, only in a batch.
+
+    Args:
+        reader: easyocr.Reader
+            OCR reader
+        image: npt.NDArray
+            Image (grayscale or RGB) the boxes are in
+        bboxes: Sequence[Sequence[int]]
+            Boxes to read, clipped to the image
+        batch_size: int, optional
+            Number of crops per model run
+
+    Returns:
+        Text of each box, in the order of `bboxes` ('' for empty boxes)
+    """
+    from easyocr.easyocr import imgH
+    from easyocr.recognition import get_text
+    from easyocr.utils import calculate_ratio, get_image_list, reformat_input
+
+    h, w = image.shape[:2]
+    clipped_bboxes = [clip_bbox(bbox, h, w) for bbox in bboxes]
+
+    # Bucket distinct boxes by padded width, skip empty boxes
+    buckets: Dict[int, List[Bbox]] = {}
+    for x1, y1, x2, y2 in dict.fromkeys(clipped_bboxes):
+        if x2 <= x1 or y2 <= y1:
+            continue
+        buckets.setdefault(math.ceil(calculate_ratio(x2 - x1, y2 - y1)), []).append((x1, y1, x2, y2))
+
+    _, image_grey = reformat_input(image)
+    # Characters out of the reader languages are ignored, as in `Reader.recognize`
+    ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+    text_by_bbox: Dict[Bbox, str] = {}
+    for bucket_bboxes in buckets.values():
+        image_list, max_width = get_image_list(
+            [[x1, x2, y1, y2] for x1, y1, x2, y2 in bucket_bboxes],
+            [],
+            image_grey,
+            model_height=imgH,
+            sort_output=False
+        )
+        results = get_text(
+            reader.character,
+            imgH,
+            int(max_width),
+            reader.recognizer,
+            reader.converter,
+            image_list,
+            ignore_char,
+            batch_size=batch_size,
+            workers=0,
+            device=reader.device
+        )
+        # Crops keep the order of the boxes (none dropped, none sorted)
+        for bbox, (_, text, _) in zip(bucket_bboxes, results):
+            text_by_bbox[bbox] = text
+
+    return [text_by_bbox.get(bbox, "") for bbox in clipped_bboxes]
+
+def get_crop_hash(crop: npt.NDArray, hash_height: int=16) -> bytes|None:
+    """
+    Perceptual hash of the text in a crop: the ink (Otsu) trimmed to its
+    bounding box, shrunk to `hash_height` rows keeping its aspect ratio &
+    thresholded to bits. Crops of the same text hash the same whatever
+    their padding or a sub-pixel shift of the render. Hashes are compared
+    exactly: a single differing bit is another text.
+
+    Returns:
+        Hash, None for a crop without ink
+    """
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY)
+    if not crop.size:
+        return None
+    _, ink = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None:
+        return None
+    x, y, w, h = cv2.boundingRect(points)
+
+    hash_width = max(1, round(hash_height * w / h))
+    small = cv2.resize(
+        ink[y:y+h, x:x+w],
+        (hash_width, hash_height),
+        interpolation=cv2.INTER_AREA
+    )
+    return hash_width.to_bytes(4, "big") + np.packbits(small > 127).tobytes()
+
+class RecognitionMemo:
+    """
+    Text recognized for cell crops, by exact perceptual hash of the crop
+    (see `get_crop_hash`), so columns with a few distinct values (party, vote
+    option) go through the recognizer once per value.
+
+    `hits` counts the boxes given a reused text, `misses` the crops that
+    went through the recognizer.
+    """
+
+    def __init__(self, max_size: int=100_000) -> None:
+        """
+        Args:
+            max_size: int, optional
+                Number of kept texts, oldest are dropped first
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._texts: Dict[bytes, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def get(self, crop_hash: bytes) -> str|None:
+        return self._texts.get(crop_hash)
+
+    def set(self, crop_hash: bytes, text: str) -> None:
+        if len(self._texts) >= self.max_size:
+            del self._texts[next(iter(self._texts))]
+        self._texts[crop_hash] = text
+
+# Memo of each reader, text depends on the recognition model
+_reader_memos: 'WeakKeyDictionary[object, RecognitionMemo]' = WeakKeyDictionary()
+
+def get_recognition_memo(reader) -> RecognitionMemo:
+    """
+    Memo of the texts recognized by `reader`, kept as long as the reader so
+    it's shared by every page & document it reads.
+    """
+    if reader not in _reader_memos:
+        _reader_memos[reader] = RecognitionMemo()
+    return _reader_memos[reader]
+
+def recognize_texts_with_memo(
+    reader,
+    image: npt.NDArray,
+    bboxes: Sequence[Sequence[int]],
+    memo: RecognitionMemo|None=None,
+    **kwargs
+) -> List[str]:
+    """
+    `recognize_texts` of the boxes, crops of exactly the same hash are
+    recognized once & their text is reused, from the boxes of this call or
+    from `memo` (memo of the reader if None).
+
+    Returns:
+        Text of each box, in the order of `bboxes`
+    """
+    if memo is None:
+        memo = get_recognition_memo(reader)
+
+    h, w = image.shape[:2]
+    crop_hashes = []
+    for bbox in bboxes:
+        x1, y1, x2, y2 = clip_bbox(bbox, h, w)
+        crop_hashes.append(get_crop_hash(image[y1:y2, x1:x2]) if x2 > x1 and y2 > y1 else None)
+
+    texts: List[str|None] = [None] * len(bboxes)
+    read_indexes = [] # one box per new hash & every box without hash
+    new_hashes = set()
+    for index, crop_hash in enumerate(crop_hashes):
+        if crop_hash is None:
+            read_indexes.append(index)
+            continue
+        texts[index] = memo.get(crop_hash)
+        if texts[index] is None and crop_hash not in new_hashes:
+            new_hashes.add(crop_hash)
+            read_indexes.append(index)
+
+    read_texts = recognize_texts(reader, image, [bboxes[i] for i in read_indexes], **kwargs)
+    read_text_by_hash: Dict[bytes, str] = {}
+    for index, text in zip(read_indexes, read_texts):
+        texts[index] = text
+        if crop_hashes[index] is not None:
+            read_text_by_hash[crop_hashes[index]] = text
+            memo.set(crop_hashes[index], text)
+
+    memo.misses += len(read_text_by_hash)
+    memo.hits += len(bboxes) - len(read_indexes)
+
+    # Boxes of a hash first read in this call
+    return [
+        text if text is not None else read_text_by_hash[crop_hash] # type: ignore
+            for text, crop_hash in zip(texts, crop_hashes)
+    ]
@@ -2,30 +2,24 @@ import cv2
 from PIL import Image
 import numpy as np
 
-from .image_processing import process_to_gray_scale
+from .image_processing import scale_kernel, scale_size
 from .bbox_helper import convert_rect_to_bbox
+from .page_analysis import PageAnalysis, as_page_analysis
 
-def dilate_image(image: Image, iterations=16):
+def dilate_image(image: Image.Image|PageAnalysis, iterations=16, scale: float=1.0):
     
-    gray_im = process_to_gray_scale(image)
-    gray_im = np.array(gray_im)
+    analysis = as_page_analysis(image, scale=scale)
     
-    blured = cv2.GaussianBlur(gray_im, (9, 9), 0)
-    th, threshed = cv2.threshold(
-        blured, 200, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    large_dilate_kernel: tuple = scale_kernel((25, 5), analysis.scale)
     
-    large_dilate_kernel: tuple = (25, 5)
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, large_dilate_kernel)
-    
-    threshed = cv2.dilate(threshed, kernel)
-
-    dilated = cv2.dilate(threshed, kernel, iterations = iterations)
+    # Dilate once then `iterations` times, in a single pass
+    dilated = analysis.dilate(*[large_dilate_kernel] * (iterations + 1))
     return dilated
 
-def detect_blocks(image: Image) -> list:
+def detect_blocks(image: Image.Image|PageAnalysis, scale: float=1.0) -> list:
     """Detects blocks in the image using contour detection."""
     
-    dialated = dilate_image(image)
+    dialated = dilate_image(image, scale=scale)
     contours, hier = cv2.findContours(
         dialated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
     rects = [cv2.boundingRect(c) for c in contours]
@@ -40,17 +34,26 @@ def pad_table(table_bbox, h, w):
         min(h, y2+15)
     ]
 
-def get_table_bbox(image: Image, index:int=1) -> list:
-    """Get tables in the image using contour detection."""
+def get_table_bbox(image: Image.Image|PageAnalysis, index:int=1, scale: float=1.0) -> list:
+    """
+    Get tables in the image using contour detection.
     
-    blocks = detect_blocks(image)
+    `image` can be the page rendered at `scale` of the full resolution
+    (detection image), the bbox is in full resolution pixels either way.
+    """
+    
+    analysis = as_page_analysis(image, scale=scale)
+    scale = analysis.scale
+    blocks = detect_blocks(analysis)
     
     # Remove any block that less than 75% of page width
-    h, w, _ = np.array(image).shape
+    w, h = analysis.size
     filtered_blocks = [bb for bb in blocks if bb[2]-bb[0] > (w*0.75)]
-    filtered_blocks = [bb for bb in filtered_blocks if bb[3]-bb[1] > 120] # Filter out small blocks
+    filtered_blocks = [bb for bb in filtered_blocks if bb[3]-bb[1] > scale_size(120, scale)] # Filter out small blocks
+    
+    # Full resolution page size
+    h, w = round(h / scale), round(w / scale)
     if len(filtered_blocks) == 0: # Detect no big table return the whole page
-        h, w, _ = np.array(image).shape
         return (20, 20, w-20, h-20)
     
     # If it is first page pick the last table to ignore validate table
@@ -58,6 +61,6 @@ def get_table_bbox(image: Image, index:int=1) -> list:
     if index == 0:
         _reversed = True
     blocks = sorted(filtered_blocks, key=lambda bb: bb[1], reverse=_reversed) # sort bt y1
-    biggest_block = blocks[0]
+    biggest_block = [round(v / scale) for v in blocks[0]]
     
     return pad_table(biggest_block, h, w)
\ No newline at end of file
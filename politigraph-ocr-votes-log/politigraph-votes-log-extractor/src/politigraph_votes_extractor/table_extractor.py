@@ -1,10 +1,17 @@
 import time
+from typing import List, Tuple
 import numpy as np
 import numpy.typing as npt
 import cv2
 from PIL import Image
 
 from .bbox_helper import detect_text_bbox, filter_border_bboxes, group_bboxs_into_rows, normalize_table_bbox
+from .grid_detector import detect_table_grid
+from .recognition import recognize_texts, recognize_texts_with_memo
+from .page_analysis import PageAnalysis
+
+# Party & vote option columns, a few distinct values over the whole log
+MEMO_COLUMNS = (3, 4)
 
 def get_column_index(bbox, bbox_row: list, thres: int=5):
     x1, _, _, _ = bbox
@@ -13,18 +20,21 @@ def get_column_index(bbox, bbox_row: list, thres: int=5):
             return index
     return -1
 
-def extract_data_from_table(table_img: npt.ArrayLike, reader=None):
-    
-    table_image = Image.fromarray(table_img)
-    
-    # Start timer to check time take to execute
-    _start = time.time()
-    
+def detect_table_cells(
+    table_img: npt.ArrayLike,
+    detection: PageAnalysis|None=None
+) -> List[List[Tuple]]|None:
+    """
+    Cells of the table from its text boxes (contours), fallback of
+    `detect_table_grid`. None if the boxes don't make a 5 columns table.
+    """
     # Detect text rects
-    text_bboxs = detect_text_bbox(table_image)
+    text_bboxs = detect_text_bbox(
+        detection if detection is not None else Image.fromarray(table_img)
+    )
 
     # Filter out bboxes that close to page border
-    h, w, _ = table_img.shape
+    h, w = table_img.shape[:2]
     text_bboxs = filter_border_bboxes(text_bboxs, h, w)
     # Filter out small bbox
     # text_bboxs = [bb for bb in text_bboxs if bb[3]-bb[1]>20]
@@ -47,34 +57,96 @@ def extract_data_from_table(table_img: npt.ArrayLike, reader=None):
         text_rows = text_rows[:-1]
 
     if len(text_rows) < 2: # No data to ocr
-        return [["", "", "", "", ""]]
+        return None
         
     try:
-        text_rows = normalize_table_bbox(text_rows)
+        return normalize_table_bbox(text_rows)
     except Exception as e:
-        return[["", "", "", "", ""]]
-    finally:
-        _end = time.time()
-        print(f"Detect bbox completes, took: {_end - _start:.2f} sec")
+        print(f"Detect table cells failed: {e}")
+        return None
+
+def read_table(
+    table_img: npt.ArrayLike,
+    reader=None,
+    detection: PageAnalysis|None=None
+) -> Tuple[List[List[Tuple]], List[List[str]]]:
+    """
+    Args:
+        table_img: npt.ArrayLike
+            Table image the text is recognized on
+        reader: easyocr.Reader
+            OCR reader
+        detection: PageAnalysis, optional
+            Analysis of the same table (can be at a lower resolution, see
+            `PageAnalysis.scale`) text boxes get detected on, analysis of
+            `table_img` if None
+
+    Returns:
+        Boxes of the table cells (in `table_img`) & their text, no rows if
+        no table is found
+    """
     
+    # Start timer to check time take to execute
     _start = time.time()
-    # Read text from each row
-    table_texts_data = []
+    
+    if detection is None:
+        detection = PageAnalysis(Image.fromarray(table_img), denoise=True)
+    
+    # Grid from the ink projections, text boxes if it finds no grid
+    text_rows = detect_table_grid(detection)
+    if text_rows is None:
+        text_rows = detect_table_cells(table_img, detection)
+    _end = time.time()
+    print(f"Detect bbox completes, took: {_end - _start:.2f} sec")
+    
+    if not text_rows: # No data to ocr
+        print("No table found")
+        return [], []
+    
+    _start = time.time()
+    # Collect cells of every row
+    table_rows = []
     for index, row in enumerate(text_rows):
         if len(row) < 5:
             # if first or last row, skip
             if index == 0 or index == (len(text_rows) - 1):
                 continue
-            
-        row_texts = []
-        for bbox in row:
-            _x1, _y1, _x2, _y2 = bbox
-            text = reader.recognize(
-                table_img[_y1:_y2, _x1:_x2]
-            )[0][1] # ocr text from textbox
-            row_texts.append(text)
-        table_texts_data.append(row_texts)
+        table_rows.append(row)
+    
+    # Read text from all cells of the table at once, cells of the columns
+    # with few distinct values reuse the text of near-identical crops
+    cells = [bbox for row in table_rows for bbox in row]
+    is_memo_cell = [
+        len(row) == 5 and column_idx in MEMO_COLUMNS
+            for row in table_rows for column_idx in range(len(row))
+    ]
+    other_texts = iter(recognize_texts(
+        reader,
+        table_img,
+        [bbox for bbox, is_memo in zip(cells, is_memo_cell) if not is_memo]
+    ))
+    memo_texts = iter(recognize_texts_with_memo(
+        reader,
+        table_img,
+        [bbox for bbox, is_memo in zip(cells, is_memo_cell) if is_memo]
+    ))
+    cells_text = iter([
+        next(memo_texts) if is_memo else next(other_texts)
+            for is_memo in is_memo_cell
+    ])
+    table_texts_data = [[next(cells_text) for _ in row] for row in table_rows]
     _end = time.time()
     print(f"OCR texts completed, took: {_end - _start:.2f} sec")    
     
-    return table_texts_data
\ No newline at end of file
+    return table_rows, table_texts_data
+
+def extract_data_from_table(
+    table_img: npt.ArrayLike,
+    reader=None,
+    detection: PageAnalysis|None=None
+) -> List[List[str]]:
+    """
+    Text of the table cells, see `read_table`.
+    """
+    _, table_texts_data = read_table(table_img, reader=reader, detection=detection)
+    return table_texts_data
@@ -0,0 +1,205 @@
+import re
+import string
+from bisect import bisect_right
+from typing import List, Sequence, Tuple
+import fitz
+
+# (x1, y1, x2, y2, text)
+Word = Tuple[float, float, float, float, str]
+
+THAI_CHARACTER_PATTERN = re.compile(r"[\u0E00-\u0E7F]")
+ORDER_NUMBER_PATTERN = re.compile(r"^\d+\.?$")
+BADGE_NUMBER_PATTERN = re.compile(r"^\d*$")
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", "", text.replace("ํา", "ำ"))
+
+def is_thai_text(text: str, min_thai_ratio: float=0.8) -> bool:
+    """
+    Letters are mostly Thai, a garbled text layer (broken font encoding)
+    comes out as latin, symbols or private use characters.
+    """
+    letters = [
+        c for c in text
+            if not (c.isspace() or c.isdigit() or c in string.punctuation)
+    ]
+    if not letters:
+        return False
+    thai_letters = THAI_CHARACTER_PATTERN.findall(text)
+    return len(thai_letters) / len(letters) >= min_thai_ratio
+
+def get_page_words(page: fitz.Page) -> List[Word]:
+    return [
+        (x1, y1, x2, y2, text)
+            for x1, y1, x2, y2, text, *_ in page.get_text("words", sort=True)
+                if text.strip()
+    ]
+
+def group_words_into_lines(words: Sequence[Word]) -> List[List[Word]]:
+    """
+    Group words with about the same vertical center into lines (top to
+    bottom), words of a line are sorted from left to right.
+    """
+    if not words:
+        return []
+
+    heights = sorted(w[3] - w[1] for w in words)
+    y_tolerance = heights[len(heights)//2] / 2
+
+    lines: List[List[Word]] = []
+    line_center = None
+    for word in sorted(words, key=lambda w: (w[1] + w[3]) / 2):
+        center = (word[1] + word[3]) / 2
+        if line_center is None or center - line_center > y_tolerance:
+            lines.append([])
+        lines[-1].append(word)
+        line_center = sum((w[1] + w[3]) / 2 for w in lines[-1]) / len(lines[-1])
+
+    return [sorted(line, key=lambda w: w[0]) for line in lines]
+
+def get_line_text(line: Sequence[Word], tab_gap: float=10) -> str:
+    """
+    Words of a line separated by a space, or a tab for a wide gap.
+    """
+    text = ""
+    for i, word in enumerate(line):
+        if i:
+            text += "\t" if word[0] - line[i-1][2] > tab_gap else " "
+        text += word[4]
+    return text
+
+def get_column_borders(line: Sequence[Word], column_header: Sequence[str]) -> List[float]|None:
+    """
+    x borders between the columns if the line is the table header, the
+    border is half way between two column names.
+    """
+    # Position of every character of the line (without spaces) -> word
+    line_text = ""
+    char_words: List[int] = []
+    for i, word in enumerate(line):
+        word_text = normalize_text(word[4])
+        line_text += word_text
+        char_words += [i] * len(word_text)
+
+    columns_span = []
+    start = 0
+    for column_name in column_header:
+        column_name = normalize_text(column_name)
+        position = line_text.find(column_name, start)
+        if position < 0:
+            return None
+        start = position + len(column_name)
+        columns_span.append((
+            line[char_words[position]][0],
+            line[char_words[start-1]][2]
+        ))
+
+    return [
+        (columns_span[i][1] + columns_span[i+1][0]) / 2
+            for i in range(len(columns_span) - 1)
+    ]
+
+def split_line_into_columns(line: Sequence[Word], column_borders: Sequence[float]) -> List[str]:
+    columns: List[List[str]] = [[] for _ in range(len(column_borders) + 1)]
+    for word in line:
+        columns[bisect_right(column_borders, (word[0] + word[2]) / 2)].append(word[4])
+    return [" ".join(column) for column in columns]
+
+def is_table_row(row: Sequence[str]) -> bool:
+    order, badge_number, name, party, vote_option = row
+    return bool(
+        ORDER_NUMBER_PATTERN.match(order)
+        and BADGE_NUMBER_PATTERN.match(badge_number)
+        and name
+    )
+
+def is_continued_row(row: Sequence[str]) -> bool:
+    # Second line of a long name, merged by the cleaner
+    order, badge_number, name, party, vote_option = row
+    return bool(name) and not (order or badge_number or party or vote_option)
+
+def extract_page_table_data_from_text_layer(
+    page: fitz.Page,
+    column_header: Sequence[str],
+    column_borders: List[float]|None=None
+) -> Tuple[List[List[str]]|None, List[float]|None]:
+    """
+    Votes table rows of one page read from the PDF text layer.
+
+    The table header gives the column borders, pages without header use the
+    borders of a previous page (`column_borders`).
+
+    Returns:
+        Table rows without header (None if the page has no usable text
+        layer) & the column borders for the next pages
+    """
+    lines = group_words_into_lines(get_page_words(page))
+    if not lines:
+        return None, column_borders
+
+    # Start after the table header if the page has one
+    for line_idx, line in enumerate(lines):
+        header_borders = get_column_borders(line, column_header)
+        if header_borders:
+            column_borders = header_borders
+            lines = lines[line_idx+1:]
+            break
+    if not column_borders:
+        return None, column_borders
+
+    table_data: List[List[str]] = []
+    for line in lines:
+        row = split_line_into_columns(line, column_borders)
+        if is_table_row(row) or (table_data and is_continued_row(row)):
+            table_data.append(row)
+        elif table_data:
+            break # End of the table
+
+    if not table_data:
+        return None, column_borders
+
+    # Names, parties & vote options have to be Thai
+    table_text = " ".join(" ".join(row[2:]) for row in table_data)
+    if not is_thai_text(table_text):
+        return None, column_borders
+
+    # Order numbers have to follow each other
+    orders = [int(row[0].rstrip(".")) for row in table_data if row[0]]
+    if orders != list(range(orders[0], orders[0] + len(orders))):
+        return None, column_borders
+
+    return table_data, column_borders
+
+def get_text_above_table(page: fitz.Page, column_header: Sequence[str]) -> str|None:
+    """
+    Text lines of the page header (above the votes table header), None if
+    the table header isn't in the text layer.
+    """
+    lines = group_words_into_lines(get_page_words(page))
+    for line_idx, line in enumerate(lines):
+        if get_column_borders(line, column_header):
+            return "\n".join(get_line_text(_line) for _line in lines[:line_idx])
+    return None
+
+def get_left_line_top(page: fitz.Page, max_right: float=0.25) -> float|None:
+    """
+    Top (fraction of the page height) of the gap above the first line that
+    only takes the left part of the page (ends before `max_right` of the
+    page width), like the footnote the extra votes table follows.
+    None if there's no such line in the text layer.
+    """
+    lines = group_words_into_lines(get_page_words(page))
+    page_width, page_height = page.rect.width, page.rect.height
+    for line_idx, line in enumerate(lines):
+        if max(word[2] for word in line) < page_width * max_right:
+            prev_line_bottom = max(word[3] for word in lines[line_idx-1]) if line_idx else 0
+            line_top = min(word[1] for word in line)
+            return (prev_line_bottom + line_top) / 2 / page_height
+    return None
+
+def count_voted_rows(
+    table_data: Sequence[Sequence[str]],
+    vote_options: Sequence[str]
+) -> int:
+    normalized_vote_options = {normalize_text(option) for option in vote_options}
+    return sum(normalize_text(row[4]) in normalized_vote_options for row in table_data)
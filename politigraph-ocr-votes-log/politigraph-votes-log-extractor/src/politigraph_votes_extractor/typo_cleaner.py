@@ -1,5 +1,14 @@
-from typing import List
-from rapidfuzz import fuzz, distance
+from typing import List, Sequence
+from rapidfuzz import fuzz, distance, process
+
+def get_char_distance_threshold(text: str, similarity_threshold: int = 90) -> int:
+    """
+    Max Levenshtein distance for a text to be considered a typo of another one.
+    """
+    return max(
+        round(len(text.replace(" ", "").strip()) * (100 - similarity_threshold) / 100),
+        2 # Ensure at least 2 character difference
+    )
 
 def correct_typo(
     typo_text: str,
@@ -13,27 +22,55 @@ def correct_typo(
     if not correct_texts_list:
         return typo_text
     
-    best_match = typo_text
-    least_distance = float('inf')
-    for correct_text in correct_texts_list:
-        # Calculate Levenshtein distance
-        dist = distance.Levenshtein.distance(typo_text, correct_text)
-        # If the distance is less than the threshold, consider it a match
-        if dist < least_distance:
-            least_distance = dist
-            best_match = correct_text
-            if dist <= 1:
-                break
-    # Calculate character distance threshold
-    char_distance_threshold = max(
-        round(len(typo_text.replace(" ", "").strip()) * (100 - similarity_threshold) / 100),
-        2 # Ensure at least 2 character difference
+    # Closest correct text within the similarity threshold
+    best_match = process.extractOne(
+        typo_text,
+        correct_texts_list,
+        scorer=distance.Levenshtein.distance,
+        score_cutoff=get_char_distance_threshold(typo_text, similarity_threshold)
     )
-    # If the best match is within the similarity threshold, return it
-    if least_distance <= char_distance_threshold:
-        return best_match
-    else:
+    if best_match is None:
         return typo_text
+    return best_match[0]
+
+def correct_typos(
+    typo_texts: Sequence[str],
+    correct_texts_list: Sequence[str],
+    similarity_threshold: int = 90
+) -> List[str]:
+    """
+    Corrects a whole column of Thai typos at once, same rule as `correct_typo`.
+    
+    Texts & correct texts are deduplicated, then every distinct text gets
+    scored against every correct text in one `rapidfuzz.process.cdist` call.
+    """
+    
+    correct_texts = list(dict.fromkeys(correct_texts_list))
+    if not correct_texts or not typo_texts:
+        return list(typo_texts)
+    
+    unique_texts = list(dict.fromkeys(typo_texts))
+    max_distances = [
+        get_char_distance_threshold(text, similarity_threshold) for text in unique_texts
+    ]
+    distances = process.cdist(
+        unique_texts,
+        correct_texts,
+        scorer=distance.Levenshtein.distance,
+        score_cutoff=max(max_distances),
+        workers=-1
+    )
+    best_match_indexes = distances.argmin(axis=1)
+    
+    corrections = {}
+    for text, max_distance, best_match_index, text_distances in zip(
+        unique_texts, max_distances, best_match_indexes, distances
+    ):
+        if text_distances[best_match_index] <= max_distance:
+            corrections[text] = correct_texts[best_match_index]
+        else:
+            corrections[text] = text
+    return [corrections[text] for text in typo_texts]
     
 def is_header_valid(
     row: list, 
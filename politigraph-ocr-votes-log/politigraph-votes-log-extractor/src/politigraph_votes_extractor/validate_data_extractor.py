@@ -3,13 +3,20 @@ import cv2
 from PIL import Image
 import numpy as np
 import numpy.typing as npt
-from pdf2image import convert_from_path
 
-from .pdf_converter import load_pdf_to_image
+from .vote_log_document import VoteLogDocument, open_vote_log_document
 from .bbox_helper import convert_rect_to_bbox, detect_text_bbox, group_bboxs_into_rows, filter_border_bboxes
 from .image_processing import dilate_image_vertical, process_to_gray_scale
+from .page_analysis import PageAnalysis, as_page_analysis
 from .table_detector import detect_blocks
 from .typo_cleaner import correct_typo
+from .recognition import recognize_texts
+from .text_layer import get_text_above_table, is_thai_text
+from .votes_extractor import COLUMN_HEADER
+
+# Top & bottom (fraction of the page height) of the first page part the
+# header is looked for in, the header is within the top half of the page
+HEADER_BAND = (0.0, 0.6)
 
 def get_page_header_fallback(image: Image):
     
@@ -27,20 +34,11 @@ def get_page_header_fallback(image: Image):
 
 ############################ NEW DETECTOR ############################
 
-def dilate_text(image:Image, ksize=(20, 5), erode_k=(5,5)):
-    gray_im = process_to_gray_scale(image)
-    gray_im = np.array(gray_im)
-    
-    blured = cv2.GaussianBlur(gray_im, (9, 9), 0)
-    th, threshed = cv2.threshold(
-        blured, 200, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+def dilate_text(image:Image.Image|PageAnalysis, ksize=(20, 5), erode_k=(5,5)):
+    analysis = as_page_analysis(image)
     
-    erode = cv2.erode(threshed, np.ones(erode_k, np.uint8), iterations=1)
-    
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, ksize=ksize)
-
-    threshed = cv2.dilate(erode, kernel)
-    dilated = cv2.dilate(threshed, kernel)
+    # Erode then dilate twice, in a single pass
+    dilated = analysis.dilate(ksize, ksize, erode_k=erode_k)
     
     return dilated
 
@@ -55,31 +53,41 @@ def detect_bbox(dilated:npt.ArrayLike):
     bboxs = [convert_rect_to_bbox(r) for r in rects]
     return bboxs
 
-def detect_rows_border(image:Image, padding:int=15) -> list:
-    w, _ = image.size
+def detect_rows_border(image:Image.Image|PageAnalysis, padding:int=15) -> list:
+    w, h = image.size
     dilated = dilate_text(image, ksize=(w, 5))
     
     rows_borders = detect_bbox(dilated)
     # Sort from top to bottom (y1)
     rows_borders.sort(key=lambda bb: bb[1])
-    rows_borders = [(bb[0], bb[1]-padding, bb[2], bb[3]+padding) for bb in rows_borders]
+    rows_borders = [(bb[0], max(0, bb[1]-padding), bb[2], min(h, bb[3]+padding)) for bb in rows_borders]
     return rows_borders
 
-def crop_half_page(image:Image, crop_margin:int=25):
+def crop_half_page(image:Image.Image|PageAnalysis, crop_margin:int=25):
     w, h = image.size
     return image.crop((w//2, crop_margin, w-crop_margin, h-crop_margin))
 
-def extract_page_header(image:Image) -> Image:
-    half_page = crop_half_page(image)
+def get_page_header_bbox(image:Image.Image|PageAnalysis, page_height:int|None=None) -> tuple:
+    """
+    Args:
+        image: Image|PageAnalysis
+            First page, or its top band (`HEADER_BAND`)
+        page_height: int, optional
+            Height of the whole page if `image` is a band of it
+    """
+    analysis = as_page_analysis(image)
+    half_page = crop_half_page(analysis)
     _, h = half_page.size
+    if page_height:
+        h = page_height - (analysis.size[1] - h)
     
     rows_borders = detect_rows_border(half_page)
     
     # Go through rows until find one start before half of te width
     crop_y2_position = h//2
     for row_border in rows_borders:
-        row_image = half_page.crop(row_border)
-        _row_bboxes = detect_bbox(dilate_text(row_image, ksize=(25, row_image.size[1])))
+        row_analysis = half_page.crop(row_border)
+        _row_bboxes = detect_bbox(dilate_text(row_analysis, ksize=(25, row_analysis.size[1])))
         _row_bboxes.sort(key=lambda bb: bb[0]) # sort with x1
 
         _x1_fisrt_row = _row_bboxes[0][0] # x1 of bbox 1
@@ -87,24 +95,47 @@ def extract_page_header(image:Image) -> Image:
         if _x1_fisrt_row > row_border[2]//2:
             crop_y2_position = row_border[1]
             break
-        
-    return image.crop((0, 0, image.size[0], crop_y2_position + 25))
+    
+    w, h = analysis.size
+    return (0, 0, w, min(crop_y2_position + 25, h))
 
-def read_text_in_image(image:Image, reader=None) -> list:
-    rows_border = detect_rows_border(image)
+def extract_page_header(image:Image, page_height:int|None=None) -> Image:
+    return image.crop(get_page_header_bbox(image, page_height=page_height))
+
+def read_text_in_image(image:Image, reader=None, analysis:PageAnalysis|None=None) -> list:
+    """
+    Args:
+        image: Image
+            Image the text is read from
+        reader: easyocr.Reader
+            OCR reader
+        analysis: PageAnalysis, optional
+            Analysis of `image` (e.g. a crop of the page analysis)
+    """
+    analysis = as_page_analysis(analysis if analysis is not None else image)
+    rows_border = detect_rows_border(analysis)
     rows_border.sort(key=lambda bb: bb[1])
     
-    texts = ""
+    # Text boxes of every row, in image coordinates
+    rows_bboxes = []
     for row_bd in rows_border:
-        row_image = image.crop(row_bd)
-        row_img = np.array(row_image)
-        text_bbox = detect_bbox(dilate_text(row_image, ksize=(25, row_image.size[1]), erode_k=(2, 2)))
+        row_analysis = analysis.crop(row_bd)
+        text_bbox = detect_bbox(dilate_text(row_analysis, ksize=(25, row_analysis.size[1]), erode_k=(2, 2)))
         text_bbox.sort(key=lambda bb: bb[0])
-        for bbox in text_bbox:
-            _x1, _y1, _x2, _y2 = bbox
-            texts += reader.recognize(
-                            row_img[_y1:_y2, _x1:_x2]
-                        )[0][1] # ocr text from textbox
+        rows_bboxes.append([
+            (row_bd[0] + bb[0], row_bd[1] + bb[1], row_bd[0] + bb[2], row_bd[1] + bb[3]) for bb in text_bbox
+        ])
+    
+    # ocr text from all textboxes of every row at once
+    bbox_texts = iter(recognize_texts(
+        reader,
+        np.array(image),
+        [bbox for row_bboxes in rows_bboxes for bbox in row_bboxes]
+    ))
+    texts = ""
+    for row_bboxes in rows_bboxes:
+        for _ in row_bboxes:
+            texts += next(bbox_texts)
             texts += "\t"
         texts += "\n"
     
@@ -160,20 +191,29 @@ def extract_validation_data(
     
     return validate_data
     
-def get_doc_data(
+def read_validation_text(
     image: Image, 
     reader=None,
-    correct_validate_key: list=["จำนวนผู้เข้าร่วมประชุม", "เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
-) -> dict:
+    page_height: int|None=None
+) -> str:
+    """
+    OCR the validation table of the page header (raw text, rows separated by
+    new lines & boxes by tabs).
+    """
     
     assert reader, "OCR Reader Not Found!!"
     
+    # Text mask of the page computed once, every step below works on crops of it
+    page_analysis = PageAnalysis(image)
+    
     # Extract page header
-    header_image = extract_page_header(image)
+    header_bbox = get_page_header_bbox(page_analysis, page_height=page_height)
+    header_image = image.crop(header_bbox)
+    header_analysis = page_analysis.crop(header_bbox)
     w, h = header_image.size
     
     # Split into validate side & title info type
-    group_bboxes = detect_bbox(dilate_text(header_image, ksize=(40, h)))
+    group_bboxes = detect_bbox(dilate_text(header_analysis, ksize=(40, h)))
     # Filter small bbox out
     group_bboxes = [bb for bb in group_bboxes if bb[2]-bb[0] > w*0.20]
     group_bboxes.sort(key=lambda bb: bb[0])
@@ -182,12 +222,34 @@ def get_doc_data(
     validate_table_bbox = group_bboxes[0]
     validate_table_image = header_image.crop(validate_table_bbox)
     
-    validation_text = read_text_in_image(validate_table_image, reader=reader)
+    return read_text_in_image(
+        validate_table_image,
+        reader=reader,
+        analysis=header_analysis.crop(validate_table_bbox)
+    )
+
+def get_doc_data(
+    image: Image, 
+    reader=None,
+    correct_validate_key: list=["จำนวนผู้เข้าร่วมประชุม", "เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"],
+    page_height: int|None=None
+) -> dict:
+    
+    validation_text = read_validation_text(image, reader=reader, page_height=page_height)
+    return parse_doc_data(validation_text, correct_validate_key)
+
+def parse_doc_data(
+    validation_text: str,
+    correct_validate_key: list=["จำนวนผู้เข้าร่วมประชุม", "เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
+) -> dict:
     # validation_text = re.sub(r"\s+", " ", validation_text)
     validation_data = extract_validation_data(
         validation_text,
         correct_validate_key
     )
+    return build_doc_data(validation_text, validation_data)
+
+def build_doc_data(validation_text: str, validation_data: dict) -> dict:
     # Check if it need to extract extra votes
     had_extra_vote = False
     if re.search(r"\d+\s+?\+\s+?\d+", validation_text):
@@ -199,15 +261,49 @@ def get_doc_data(
     doc_data['had_extra_votes'] = had_extra_vote
     return doc_data
 
-def extract_doc_data(pdf_file_path: str, reader=None) -> dict:
-    assert reader, "OCR Reader Not Found!!"
+def get_doc_data_from_text_layer(
+    vote_log_document: VoteLogDocument,
+    correct_validate_key: list=["จำนวนผู้เข้าร่วมประชุม", "เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
+) -> dict|None:
+    """
+    Doc data from the text layer of the first page, None if it has no
+    usable text layer or misses any validation data.
+    """
+    validation_text = get_text_above_table(vote_log_document.get_page(0), COLUMN_HEADER)
+    if not validation_text or not is_thai_text(validation_text, min_thai_ratio=0.5):
+        return None
+    
+    validation_data = extract_validation_data(
+        validation_text.replace("ํา", "ำ"),
+        correct_validate_key
+    )
+    if any(validation_data.get(key, -1) < 0 for key in correct_validate_key):
+        return None
+    
+    return build_doc_data(validation_text, validation_data)
+
+def extract_doc_data(document: str|VoteLogDocument, reader=None, use_text_layer: bool=True) -> dict:
     
-    pdf_image = load_pdf_to_image(pdf_file_path, dpi=300, last_page=1)[0]
-    print(f"Extract validate data from {pdf_file_path}...")
+    vote_log_document = open_vote_log_document(document)
+    print(f"Extract validate data from {vote_log_document.pdf_file_path}...")
     
-    doc_data = get_doc_data(pdf_image, reader=reader)
+    doc_data = get_doc_data_from_text_layer(vote_log_document) if use_text_layer else None
+    if doc_data is None:
+        header_ocr = vote_log_document.load_ocr('header', 0)
+        if header_ocr is None:
+            assert reader, "OCR Reader Not Found!!"
+            # Render only the top of the first page
+            header_band_image = vote_log_document.get_page_band(0, *HEADER_BAND)
+            header_ocr = {
+                'text': read_validation_text(
+                    header_band_image,
+                    reader=reader,
+                    page_height=vote_log_document.get_page_size(0)[1]
+                )
+            }
+            vote_log_document.save_ocr('header', 0, header_ocr)
+        doc_data = parse_doc_data(header_ocr['text'])
     
     print(doc_data)
     
     return doc_data
-    
\ No newline at end of file
@@ -0,0 +1,210 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from PIL.Image import Image
+import fitz
+
+from .pdf_converter import open_pdf_without_watermark, render_page, render_page_pixmap, pixmap_to_image
+from .ocr_cache import OCRCache, get_file_hash
+
+class VoteLogDocument:
+    """
+    Vote log PDF opened once for every extractor of an OCR job.
+
+    The watermark layer is hidden on open, pages are rendered on first use
+    & kept, so the validation header (first page), the votes table (every
+    page) and the extra votes (last page) share the same page images.
+
+    Layout detection works on pages rendered at `detection_dpi`, text is
+    recognized on regions (`get_page_region`, `get_page_band`) rendered
+    at `dpi`, so only the parts that get read are rendered at full
+    resolution.
+
+    With an `ocr_cache`, the raw OCR output of the pages is read from &
+    written to it (`load_ocr`, `save_ocr`).
+    """
+
+    def __init__(
+        self,
+        pdf_file_path: str,
+        dpi: int=300,
+        grayscale: bool=True,
+        watermark_layer_name: str='Watermark',
+        detection_dpi: int|None=150,
+        ocr_cache: OCRCache|None=None
+    ) -> None:
+        """
+        Args:
+            pdf_file_path: str
+                Path to the vote log PDF
+            dpi: int, optional
+                Resolution pages are rendered at
+            grayscale: bool, optional
+                Render pages as single-channel ('L') images, every extractor
+                works on grayscale anyway
+            watermark_layer_name: str, optional
+                Name of the layer (OCG) to hide
+            detection_dpi: int, optional
+                Resolution pages are rendered at to detect the tables &
+                text boxes, `dpi` if None
+            ocr_cache: OCRCache, optional
+                Cache of the OCR output of the pages
+        """
+        self.pdf_file_path = pdf_file_path
+        self.dpi = dpi
+        self.grayscale = grayscale
+        self.detection_dpi = min(detection_dpi or dpi, dpi)
+        self.ocr_cache = ocr_cache
+        self._pdf_hash: str|None = None
+
+        self._doc = open_pdf_without_watermark(pdf_file_path, watermark_layer_name)
+        self.page_count: int = self._doc.page_count
+
+        self._page_images: Dict[Tuple[int, int], Image] = {}
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __enter__(self) -> 'VoteLogDocument':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _get_page_index(self, page_index: int) -> int:
+        if page_index < 0:
+            page_index += self.page_count
+        if not 0 <= page_index < self.page_count:
+            raise IndexError(f"Page {page_index} out of range, {self.pdf_file_path} has {self.page_count} pages")
+        return page_index
+
+    def get_page(self, page_index: int) -> fitz.Page:
+        """
+        PDF page, for its text layer (0-based, negative counts from the last page).
+        """
+        return self._doc[self._get_page_index(page_index)]
+
+    @property
+    def detection_scale(self) -> float:
+        """Size of detection images relative to full resolution images."""
+        return self.detection_dpi / self.dpi
+
+    def get_page_size(self, page_index: int, dpi: int|None=None) -> Tuple[int, int]:
+        """(width, height) in pixels of a page rendered at `dpi`."""
+        zoom = (dpi or self.dpi) / 72
+        rect = self.get_page(page_index).rect * fitz.Matrix(zoom, zoom)
+        return rect.irect.width, rect.irect.height
+
+    def get_page_image(self, page_index: int, dpi: int|None=None) -> Image:
+        """
+        Image of a page (0-based, negative counts from the last page),
+        rendered at `dpi` (document dpi if None).
+        """
+        page_index = self._get_page_index(page_index)
+        dpi = dpi or self.dpi
+        if (page_index, dpi) not in self._page_images:
+            self._page_images[(page_index, dpi)] = render_page(
+                self._doc[page_index],
+                dpi=dpi,
+                grayscale=self.grayscale
+            )
+        return self._page_images[(page_index, dpi)]
+
+    def get_detection_image(self, page_index: int) -> Image:
+        """Image of a page to detect the layout on, at `detection_dpi`."""
+        return self.get_page_image(page_index, dpi=self.detection_dpi)
+
+    def get_page_images(self) -> List[Image]:
+        """Images of every page."""
+        return [self.get_page_image(i) for i in range(self.page_count)]
+
+    def get_page_region(self, page_index: int, bbox: Sequence[int]) -> Image:
+        """
+        Region (x1, y1, x2, y2 in full resolution pixels) of a page, same
+        pixels as a crop of the whole page image. Cropped from the page image
+        if it's already rendered, otherwise only the region gets rendered.
+        """
+        page_index = self._get_page_index(page_index)
+        w, h = self.get_page_size(page_index)
+        x1, y1, x2, y2 = bbox
+        x1, y1, x2, y2 = max(0, int(x1)), max(0, int(y1)), min(w, int(x2)), min(h, int(y2))
+
+        if (page_index, self.dpi) in self._page_images:
+            return self._page_images[(page_index, self.dpi)].crop((x1, y1, x2, y2))
+
+        # Render 1px more on every side, then crop to the exact pixel grid
+        zoom = self.dpi / 72
+        pixmap = render_page_pixmap(
+            self._doc[page_index],
+            dpi=self.dpi,
+            grayscale=self.grayscale,
+            clip=fitz.Rect(x1 - 1, y1 - 1, x2 + 1, y2 + 1) / zoom
+        )
+        return pixmap_to_image(pixmap).crop((
+            x1 - pixmap.x,
+            y1 - pixmap.y,
+            x2 - pixmap.x,
+            y2 - pixmap.y
+        ))
+
+    def get_page_band(self, page_index: int, top: float=0.0, bottom: float=1.0) -> Image:
+        """
+        Horizontal band of a page, `top` & `bottom` as a fraction of the page
+        height, e.g. the header of the first page.
+        """
+        w, h = self.get_page_size(page_index)
+        return self.get_page_region(page_index, (0, round(h * top), w, round(h * bottom)))
+
+    @property
+    def pdf_hash(self) -> str:
+        """sha256 of the PDF content, computed on first use."""
+        if self._pdf_hash is None:
+            self._pdf_hash = get_file_hash(self.pdf_file_path)
+        return self._pdf_hash
+
+    def load_ocr(self, part: str, page_index: int) -> Dict[str, Any]|None:
+        """
+        Cached OCR output of a part ('table', 'header', 'extra_votes') of a
+        page, None if it isn't cached (or the document has no cache).
+        """
+        if self.ocr_cache is None:
+            return None
+        return self.ocr_cache.get(
+            self.pdf_hash,
+            part,
+            self._get_page_index(page_index),
+            self.dpi,
+            self.detection_dpi,
+            self.grayscale
+        )
+
+    def save_ocr(self, part: str, page_index: int, data: Dict[str, Any]) -> None:
+        """Cache the OCR output of a part of a page, see `load_ocr`."""
+        if self.ocr_cache is None:
+            return
+        self.ocr_cache.set(
+            self.pdf_hash,
+            part,
+            self._get_page_index(page_index),
+            self.dpi,
+            self.detection_dpi,
+            self.grayscale,
+            data
+        )
+
+    def release_page_image(self, page_index: int) -> None:
+        """Drop the kept images of a page, for pages that won't be used again."""
+        if page_index < 0:
+            page_index += self.page_count
+        for key in [key for key in self._page_images if key[0] == page_index]:
+            del self._page_images[key]
+
+    def close(self) -> None:
+        self._page_images.clear()
+        self._doc.close()
+
+def open_vote_log_document(document: 'str|VoteLogDocument', dpi: int=300) -> VoteLogDocument:
+    """
+    Use an already opened document as is, or open a PDF file path.
+    """
+    if isinstance(document, VoteLogDocument):
+        return document
+    return VoteLogDocument(document, dpi=dpi)
@@ -1,51 +1,183 @@
+from typing import Dict, List
 import numpy as np
 import pandas as pd
-from pdf2image import convert_from_path
 
-from .pdf_converter import load_pdf_to_image
+from .vote_log_document import VoteLogDocument, open_vote_log_document
 from .table_detector import get_table_bbox
-from .table_extractor import extract_data_from_table
+from .page_analysis import PageAnalysis
+from .table_extractor import read_table
 from .typo_cleaner import is_header_valid
+from .text_layer import extract_page_table_data_from_text_layer, count_voted_rows
 from .df_cleaner import clean_votelog_df
 
-def extract_votelog(pdf_file_path: str, reader=None) -> pd.DataFrame:
+COLUMN_HEADER = ["ลําดับที่", "เลขที่บัตร", "ชื่อ - สกุล", "ชื่อสังกัด", "ผลการลงคะแนน"]
+VOTE_OPTIONS = ["เห็นด้วย", "ไม่เห็นด้วย", "งดออกเสียง", "ไม่ลงคะแนนเสียง"]
+
+def read_page_table(vote_log_document: VoteLogDocument, page_idx: int, reader=None) -> Dict[str, list]:
+    """
+    OCR the votes table of one page.
+    
+    The table & its text boxes are detected on the page rendered at the
+    detection dpi, only the table region is rendered at full resolution to
+    be read.
     
+    Returns:
+        Raw OCR output, 'cells': boxes of the table cells (page pixels at the
+        document dpi) & 'texts': their text, by row
+    """
     assert reader, "OCR Reader Not Found!!"
     
-    pdf_images = load_pdf_to_image(pdf_file_path, dpi=300)
-    print(f"Extract votelog from {pdf_file_path}...")
+    print(f"OCR doc page: {page_idx+1}")
     
-    # Initiate base dataframe
-    COLUMN_HEADER = ["ลําดับที่", "เลขที่บัตร", "ชื่อ - สกุล", "ชื่อสังกัด", "ผลการลงคะแนน"]
-    votes_df = pd.DataFrame(
-        columns=COLUMN_HEADER
+    # Text mask computed once for the table & its text boxes
+    scale = vote_log_document.detection_scale
+    page_analysis = PageAnalysis(
+        vote_log_document.get_detection_image(page_idx),
+        scale=scale,
+        denoise=True
     )
     
-    for page_idx, page_image in enumerate(pdf_images):
-        
-        print(f"OCR doc page: {page_idx+1}")
-        
-        table_bbox = get_table_bbox(page_image, page_idx)
-        x1, y1, x2, y2 = table_bbox
-        page_img = np.array(page_image)
-        
-        table_data = extract_data_from_table(
-            page_img[y1:y2, x1:x2],
-            reader=reader
-        )
-        
-        # Make first row a header
-        if is_header_valid(table_data[0], COLUMN_HEADER):
-            table_data.pop(0)
-        
-        _new_votes_df = pd.DataFrame.from_records(
-            table_data,
-            columns=COLUMN_HEADER
+    # Table bbox on the pixel grid of the detection image
+    table_bbox = get_table_bbox(page_analysis, page_idx)
+    dx1, dy1, dx2, dy2 = [round(v * scale) for v in table_bbox]
+    x1, y1, x2, y2 = [round(v / scale) for v in (dx1, dy1, dx2, dy2)]
+    
+    table_cells, table_texts = read_table(
+        np.array(vote_log_document.get_page_region(page_idx, (x1, y1, x2, y2))),
+        reader=reader,
+        detection=page_analysis.crop((dx1, dy1, dx2, dy2))
+    )
+    
+    # Table region is clipped to the page
+    x1, y1 = max(0, x1), max(0, y1)
+    return {
+        'cells': [
+            [(bb[0]+x1, bb[1]+y1, bb[2]+x1, bb[3]+y1) for bb in row]
+                for row in table_cells
+        ],
+        'texts': table_texts
+    }
+
+def get_page_table_data(page_table: Dict[str, list]) -> List[List[str]]:
+    """Votes table rows of a page OCR output (`read_page_table`), without the table header."""
+    table_data = [list(row) for row in page_table['texts']]
+    
+    # Make first row a header
+    if table_data and is_header_valid(table_data[0], COLUMN_HEADER):
+        table_data.pop(0)
+    
+    return table_data
+
+def extract_page_table_data(vote_log_document: VoteLogDocument, page_idx: int, reader=None) -> List[List[str]]:
+    """
+    Votes table rows of one page, without the table header. The page OCR
+    output is read from the document OCR cache if it's there, cached
+    otherwise.
+    """
+    page_table = vote_log_document.load_ocr('table', page_idx)
+    if page_table is None:
+        page_table = read_page_table(vote_log_document, page_idx, reader=reader)
+        vote_log_document.save_ocr('table', page_idx, page_table)
+    
+    return get_page_table_data(page_table)
+
+def extract_text_layer_table_data(
+    vote_log_document: VoteLogDocument,
+    validation_data: Dict[str, int]|None=None
+) -> List[List[List[str]]|None]:
+    """
+    Votes table rows of each page from the PDF text layer, None for pages
+    to OCR.
+
+    The text layer is only used if every page has one and its voted rows
+    add up to the validation data, otherwise (or without validation data)
+    every page is OCR'ed.
+    """
+    if not validation_data:
+        return [None] * vote_log_document.page_count
+    
+    pages_table_data = []
+    column_borders = None
+    for page_idx in range(vote_log_document.page_count):
+        table_data, column_borders = extract_page_table_data_from_text_layer(
+            vote_log_document.get_page(page_idx),
+            COLUMN_HEADER,
+            column_borders
         )
-        votes_df = pd.concat(
-            [votes_df, _new_votes_df],
-            ignore_index=True
+        if table_data is None:
+            return [None] * vote_log_document.page_count
+        pages_table_data.append(table_data)
+    
+    voted_count = sum(count_voted_rows(table_data, VOTE_OPTIONS) for table_data in pages_table_data)
+    if voted_count != sum(validation_data.get(option, 0) for option in VOTE_OPTIONS):
+        print("Text layer doesn't match validation data, OCR every pages")
+        return [None] * vote_log_document.page_count
+    
+    return pages_table_data
+
+def extract_votelog(
+    document: str|VoteLogDocument,
+    reader=None,
+    pool=None,
+    validation_data: Dict[str, int]|None=None,
+    use_text_layer: bool=True
+) -> pd.DataFrame:
+    """
+    Args:
+        document: str|VoteLogDocument
+            Path to the vote log PDF or an opened document
+        reader: easyocr.Reader, optional
+            OCR reader, pages are read one after another
+        pool: OCRProcessPool, optional
+            OCR worker pool, pages are read in parallel (used over `reader`)
+        validation_data: Dict[str, int], optional
+            Votes count of the doc header, to check the text layer against
+        use_text_layer: bool, optional
+            Read the pages from the PDF text layer when every page has one
+            matching `validation_data`, OCR them otherwise
+    """
+    
+    vote_log_document = open_vote_log_document(document)
+    print(f"Extract votelog from {vote_log_document.pdf_file_path}...")
+    
+    pages_table_data = extract_text_layer_table_data(vote_log_document, validation_data)\
+        if use_text_layer else [None] * vote_log_document.page_count
+    # Pages OCR'ed before come from the OCR cache
+    for page_idx, table_data in enumerate(pages_table_data):
+        if table_data is None:
+            page_table = vote_log_document.load_ocr('table', page_idx)
+            if page_table is not None:
+                pages_table_data[page_idx] = get_page_table_data(page_table)
+    ocr_page_indexes = [
+        page_idx for page_idx, table_data in enumerate(pages_table_data)
+            if table_data is None
+    ]
+    
+    if ocr_page_indexes:
+        assert reader or pool, "OCR Reader Not Found!!"
+        print(f"OCR {len(ocr_page_indexes)}/{vote_log_document.page_count} pages")
+    
+    if ocr_page_indexes and pool:
+        # Workers render their own pages, results come back in page order
+        ocr_pages_table_data = pool.map_pages(
+            vote_log_document.pdf_file_path,
+            ocr_page_indexes,
+            dpi=vote_log_document.dpi,
+            grayscale=vote_log_document.grayscale,
+            detection_dpi=vote_log_document.detection_dpi,
+            ocr_cache=vote_log_document.ocr_cache
         )
+    else:
+        ocr_pages_table_data = [
+            extract_page_table_data(vote_log_document, page_idx, reader=reader)
+                for page_idx in ocr_page_indexes
+        ]
+    for page_idx, table_data in zip(ocr_page_indexes, ocr_pages_table_data):
+        pages_table_data[page_idx] = table_data
+    
+    votes_df = pd.DataFrame.from_records(
+        [row for table_data in pages_table_data for row in table_data], # type: ignore
+        columns=COLUMN_HEADER
+    )
         
     return votes_df
-        
\ No newline at end of file
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from politigraph_votes_extractor.grid_detector import detect_table_grid, find_runs, merge_close_runs
+from politigraph_votes_extractor.page_analysis import PageAnalysis
+
+COLUMNS = [(100, 160), (300, 380), (500, 900), (1100, 1400), (1600, 1900)]
+
+def make_table_mask(n_rows=10, columns=COLUMNS, row_top=200, row_height=40, row_gap=30, ruled=False):
+    mask = np.zeros((row_top + n_rows * (row_height + row_gap) + 200, 2000), dtype=np.uint8)
+    # Page header, one line not following the columns
+    mask[80:120, 100:1400] = 255
+    for row_idx in range(n_rows):
+        y1 = row_top + row_idx * (row_height + row_gap)
+        for x1, x2 in columns:
+            mask[y1:y1+row_height, x1:x2] = 255
+    if ruled:
+        for x in [250, 450, 1000, 1500]:
+            mask[:, x:x+3] = 255
+    return mask
+
+def test_rows_and_columns_are_found():
+    cells = detect_table_grid(PageAnalysis.from_mask(make_table_mask()))
+
+    assert len(cells) == 10
+    assert all(len(row) == 5 for row in cells)
+    # Padded cells around the ink
+    assert [(x1, x2) for x1, _, x2, _ in cells[0]] == [(x1 - 10, x2 + 10) for x1, x2 in COLUMNS]
+    assert (cells[0][0][1], cells[0][0][3]) == (200 - 8, 240 + 8)
+
+def test_cells_are_in_full_resolution():
+    mask = make_table_mask()
+    full_cells = detect_table_grid(PageAnalysis.from_mask(mask))
+
+    half_mask = mask[::2, ::2]
+    half_cells = detect_table_grid(PageAnalysis.from_mask(half_mask, scale=0.5))
+
+    assert len(half_cells) == len(full_cells)
+    assert np.abs(np.array(half_cells) - np.array(full_cells)).max() <= 2
+
+def test_ruled_table_columns_follow_the_lines():
+    cells = detect_table_grid(PageAnalysis.from_mask(make_table_mask(ruled=True)))
+
+    assert len(cells) == 10
+    assert [(x1, x2) for x1, _, x2, _ in cells[0]] == [(0, 250), (253, 450), (453, 1000), (1003, 1500), (1503, 2000)]
+
+def test_row_with_missing_cells_is_trimmed():
+    mask = make_table_mask()
+    # Signature under the table, only one column
+    mask[1100:1140, 1600:1900] = 255
+
+    cells = detect_table_grid(PageAnalysis.from_mask(mask))
+    assert len(cells) == 10
+
+@pytest.mark.parametrize('mask', [
+    np.zeros((1000, 2000), dtype=np.uint8),
+    make_table_mask(n_rows=1),
+    make_table_mask(columns=COLUMNS[:3]),
+])
+def test_no_table_grid(mask):
+    assert detect_table_grid(PageAnalysis.from_mask(mask)) is None
+
+def test_find_and_merge_runs():
+    runs = find_runs(np.array([0, 1, 1, 0, 1, 0, 0, 0, 1, 1], dtype=bool))
+    assert runs.tolist() == [[1, 3], [4, 5], [8, 10]]
+    assert merge_close_runs(runs, 2).tolist() == [[1, 5], [8, 10]]
@@ -0,0 +1,127 @@
+import fitz
+import pytest
+
+from politigraph_votes_extractor.text_layer import (
+    count_voted_rows, extract_page_table_data_from_text_layer, get_text_above_table, is_thai_text
+)
+from politigraph_votes_extractor.vote_log_document import VoteLogDocument
+from politigraph_votes_extractor.votes_extractor import (
+    COLUMN_HEADER, VOTE_OPTIONS, extract_text_layer_table_data
+)
+
+COLUMNS_X = [50, 100, 160, 330, 450]
+HEADER_X = [40, 95, 160, 330, 450]
+
+def make_rows(orders):
+    return [
+        [str(order), str(100 + order), f"นายสมชาย{order} ใจดี", "พรรคเพื่อไทย", VOTE_OPTIONS[order % 2]]
+            for order in orders
+    ]
+
+def garble(text):
+    # Broken font encoding, TIS-620 bytes read as latin-1
+    return text.encode('tis-620').decode('latin-1')
+
+def add_page(document, rows, header_lines=(), with_column_header=True):
+    font = fitz.Font('cjk')
+    page = document.new_page()
+
+    def put(x, y, text):
+        writer = fitz.TextWriter(page.rect)
+        writer.append((x, y), text, font=font, fontsize=10)
+        writer.write_text(page)
+
+    y = 60
+    for line in header_lines:
+        put(40, y, line)
+        y += 16
+    if with_column_header:
+        for x, text in zip(HEADER_X, COLUMN_HEADER):
+            put(x, y, text)
+        y += 18
+    for row in rows:
+        for x, text in zip(COLUMNS_X, row):
+            put(x, y, text)
+        y += 16
+    put(280, 820, f"หน้า {document.page_count}")
+    return page
+
+@pytest.fixture
+def document():
+    document = fitz.open()
+    yield document
+    document.close()
+
+def test_page_table_is_read(document):
+    rows = make_rows(range(1, 21))
+    page = add_page(document, rows, header_lines=["วันที่ 1 มกราคม พ.ศ. 2568", "เห็นด้วย 10"])
+
+    table_data, column_borders = extract_page_table_data_from_text_layer(page, COLUMN_HEADER)
+
+    assert table_data == rows
+    assert len(column_borders) == 4
+    assert get_text_above_table(page, COLUMN_HEADER) == "วันที่ 1 มกราคม พ.ศ. 2568\nเห็นด้วย 10"
+
+def test_page_without_header_uses_previous_borders(document):
+    add_page(document, make_rows(range(1, 11)))
+    add_page(document, make_rows(range(11, 21)), with_column_header=False)
+    first_page, next_page = document[0], document[1]
+
+    _, column_borders = extract_page_table_data_from_text_layer(first_page, COLUMN_HEADER)
+    assert extract_page_table_data_from_text_layer(next_page, COLUMN_HEADER) == (None, None)
+    table_data, _ = extract_page_table_data_from_text_layer(next_page, COLUMN_HEADER, column_borders)
+    assert table_data == make_rows(range(11, 21))
+
+def test_garbled_text_layer_is_not_used(document):
+    rows = [[row[0], row[1]] + [garble(text) for text in row[2:]] for row in make_rows(range(1, 21))]
+    page = add_page(document, rows)
+
+    table_data, _ = extract_page_table_data_from_text_layer(page, COLUMN_HEADER)
+    assert table_data is None
+
+@pytest.mark.parametrize('orders', [
+    [1, 2, 3, 5, 6],
+    [1, 2, 4, 3, 5],
+])
+def test_out_of_sequence_orders_are_not_used(document, orders):
+    page = add_page(document, make_rows(orders))
+
+    table_data, _ = extract_page_table_data_from_text_layer(page, COLUMN_HEADER)
+    assert table_data is None
+
+def test_page_without_text_layer(document):
+    page = document.new_page()
+    assert extract_page_table_data_from_text_layer(page, COLUMN_HEADER) == (None, None)
+
+def test_is_thai_text():
+    assert is_thai_text("นายสมชาย ใจดี 12")
+    assert not is_thai_text(garble("นายสมชาย ใจดี"))
+    assert not is_thai_text("12 34")
+
+def test_count_voted_rows():
+    rows = make_rows(range(1, 6)) + [["6", "106", "นายสมชาย6 ใจดี", "พรรคเพื่อไทย", "-"]]
+    assert count_voted_rows(rows, VOTE_OPTIONS) == 5
+
+@pytest.fixture
+def vote_log_pdf(document, tmp_path):
+    add_page(document, make_rows(range(1, 21)))
+    add_page(document, make_rows(range(21, 31)), with_column_header=False)
+    path = tmp_path / "vote_log.pdf"
+    document.save(str(path))
+    return str(path)
+
+def test_document_table_matching_validation_data(vote_log_pdf):
+    pages_table_data = extract_text_layer_table_data(
+        VoteLogDocument(vote_log_pdf),
+        {"เห็นด้วย": 15, "ไม่เห็นด้วย": 15}
+    )
+    assert pages_table_data == [make_rows(range(1, 21)), make_rows(range(21, 31))]
+
+@pytest.mark.parametrize('validation_data', [
+    None,
+    {},
+    {"เห็นด้วย": 16, "ไม่เห็นด้วย": 15},
+])
+def test_document_is_ocred_without_matching_validation_data(vote_log_pdf, validation_data):
+    pages_table_data = extract_text_layer_table_data(VoteLogDocument(vote_log_pdf), validation_data)
+    assert pages_table_data == [None, None]
@@ -1,9 +1,10 @@
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Tuple
 
 import pandas as pd
 import easyocr
 
-from politigraph_votes_extractor import extract_doc_data, extract_votelog, clean_votelog_df, extract_extra_votes, clean_extra_votes_df
+from politigraph_votes_extractor import VoteLogDocument, OCRCache, OCRProcessPool, get_doc_data_from_text_layer, extract_doc_data, extract_votelog, clean_votelog_df, extract_extra_votes, clean_extra_votes_df
 from .validate_votes import validate_votes
 from .data_helper import update_extra_votes
 
@@ -12,10 +13,12 @@ from poliquery import get_votes_from_vote_event, get_validation_data, update_vot
 def update_validation_data(
     pdf_file_path: str,
     vote_event_id: str,
-    reader:easyocr.Reader|None=None
+    reader:easyocr.Reader|None=None,
+    ocr_cache:OCRCache|None=None
 ):
     # Extract doc data
-    doc_data = extract_doc_data(pdf_file_path, reader)
+    with VoteLogDocument(pdf_file_path, ocr_cache=ocr_cache) as document:
+        doc_data = extract_doc_data(document, reader)
     
     validation_data = doc_data.get('validation_data', {})
     
@@ -30,11 +33,13 @@ def update_validation_data(
 def validate_votes_doc(
     pdf_file_path: str,
     vote_event_id: str,
-    reader:easyocr.Reader|None=None
+    reader:easyocr.Reader|None=None,
+    ocr_cache:OCRCache|None=None
 ) -> pd.DataFrame:
-    # Extract doc data
-    doc_data = extract_doc_data(pdf_file_path, reader)
-    votes_df = extract_votelog(pdf_file_path, reader)
+    # Extract doc data, pages OCR'ed before are read from the OCR cache
+    with VoteLogDocument(pdf_file_path, ocr_cache=ocr_cache) as document:
+        doc_data = extract_doc_data(document, reader)
+        votes_df = extract_votelog(document, reader, validation_data=doc_data['validation_data'])
     
     validation_data = doc_data.get('validation_data', {})
     
@@ -108,47 +113,99 @@ def ocr_votes_doc(
         OCR result
     """
     
-    # OCR
-    votes_df = extract_votelog(pdf_file_path, reader)
-    # Clean votes df
-    votes_df = clean_votelog_df(votes_df)
-    doc_data = extract_doc_data(pdf_file_path, reader) # TODO remove
-    
-    if doc_data['had_extra_votes']: # have extrac votes
-        extra_votes_df = extract_extra_votes(pdf_file_path, reader)
-        extra_votes_df = clean_extra_votes_df(extra_votes_df)
-        votes_df = update_extra_votes(votes_df,extra_votes_df)
+    with VoteLogDocument(pdf_file_path) as document:
+        # OCR
+        votes_df = extract_votelog(document, reader)
+        # Clean votes df
+        votes_df = clean_votelog_df(votes_df)
+        doc_data = extract_doc_data(document, reader) # TODO remove
+        
+        if doc_data['had_extra_votes']: # have extrac votes
+            extra_votes_df = extract_extra_votes(document, reader)
+            extra_votes_df = clean_extra_votes_df(extra_votes_df)
+            votes_df = update_extra_votes(votes_df,extra_votes_df)
     
     return votes_df
 
-def ocr_and_add_votes(
+def ocr_vote_log(
     pdf_file_path: str,
-    vote_event_id: str,
-    reader:easyocr.Reader
-) -> None:
+    reader:easyocr.Reader|None=None,
+    pool:OCRProcessPool|None=None,
+    ocr_cache:OCRCache|None=None
+) -> Tuple[Dict[str, Any], pd.DataFrame, pd.DataFrame|None]:
     """
-    OCR pdf document and add new votes to the voteEvent
+    OCR pdf document without cleaning, so it can run in an OCR worker
 
     Args:
         pdf_file_path: str
             path to pdf file
-        vote_event_id: str
-            ID of the voteEvent
-        reader: easyocr.Reader
+        reader: easyocr.Reader, optional
             easyOCR reader for text recognition
+        pool: OCRProcessPool, optional
+            OCR worker pool, pages are read in parallel (used over `reader`)
+        ocr_cache: OCRCache, optional
+            Cache of the raw OCR output, pages OCR'ed before are read from it
+
+    Returns:
+        doc data, raw votes df & raw extra votes df (None if no extra votes)
     """
     
-    # Extract votes data
-    doc_data = extract_doc_data(pdf_file_path, reader)
-    votes_df = extract_votelog(pdf_file_path, reader)
+    with VoteLogDocument(pdf_file_path, ocr_cache=ocr_cache) as document:
+        # Born-digital documents are read from their text layer, without OCR
+        doc_data = get_doc_data_from_text_layer(document)
+        
+        if pool:
+            # Doc data first, the text layer is only used once checked against its votes count
+            if doc_data is None:
+                doc_data = pool.submit_document(extract_doc_data, pdf_file_path, ocr_cache).result()
+            votes_df = extract_votelog(
+                document,
+                pool=pool,
+                validation_data=doc_data['validation_data']
+            )
+            
+            extra_votes_df = pool.submit_document(extract_extra_votes, pdf_file_path, ocr_cache).result()\
+                if doc_data['had_extra_votes'] else None
+            return doc_data, votes_df, extra_votes_df
+        
+        if doc_data is None:
+            doc_data = extract_doc_data(document, reader)
+        votes_df = extract_votelog(
+            document,
+            reader,
+            validation_data=doc_data['validation_data']
+        )
+        
+        extra_votes_df = extract_extra_votes(document, reader)\
+            if doc_data['had_extra_votes'] else None
+    
+    return doc_data, votes_df, extra_votes_df
+
+def clean_vote_log(
+    votes_df: pd.DataFrame,
+    extra_votes_df: pd.DataFrame|None=None
+) -> pd.DataFrame:
     # Clean votes df
     votes_df = clean_votelog_df(votes_df)
     
-    if doc_data['had_extra_votes']: # have extrac votes
-        extra_votes_df = extract_extra_votes(pdf_file_path, reader)
+    if extra_votes_df is not None: # have extrac votes
         extra_votes_df = clean_extra_votes_df(extra_votes_df)
         votes_df = update_extra_votes(votes_df,extra_votes_df)
     
+    return votes_df
+
+def add_ocr_votes(
+    vote_event_id: str,
+    doc_data: Dict[str, Any],
+    votes_df: pd.DataFrame,
+    extra_votes_df: pd.DataFrame|None=None
+) -> None:
+    """
+    Clean OCR result (from `ocr_vote_log`) and add new votes to the voteEvent
+    """
+    
+    votes_df = clean_vote_log(votes_df, extra_votes_df)
+    
     validation_data = doc_data.get('validation_data', {})
     
     publish_status = "PUBLISHED" if validate_votes(
@@ -166,11 +223,41 @@ def ocr_and_add_votes(
         validation_data=validation_data,
         publish_status=publish_status
     )
+
+def ocr_and_add_votes(
+    pdf_file_path: str,
+    vote_event_id: str,
+    reader:easyocr.Reader|None=None,
+    pool:OCRProcessPool|None=None,
+    ocr_cache:OCRCache|None=None
+) -> None:
+    """
+    OCR pdf document and add new votes to the voteEvent
+
+    Args:
+        pdf_file_path: str
+            path to pdf file
+        vote_event_id: str
+            ID of the voteEvent
+        reader: easyocr.Reader, optional
+            easyOCR reader for text recognition
+        pool: OCRProcessPool, optional
+            OCR worker pool, pages are read in parallel (used over `reader`)
+        ocr_cache: OCRCache, optional
+            Cache of the raw OCR output, pages OCR'ed before are read from it
+    """
+    
+    # Extract votes data
+    doc_data, votes_df, extra_votes_df = ocr_vote_log(pdf_file_path, reader=reader, pool=pool, ocr_cache=ocr_cache)
+    
+    add_ocr_votes(vote_event_id, doc_data, votes_df, extra_votes_df)
     
 def batch_ocr_and_add_votes(
     data_dict: List[Dict[str, Any]],
     pdf_file_dir: str="pdf_files",
-    reader:easyocr.Reader|None=None
+    reader:easyocr.Reader|None=None,
+    pool:OCRProcessPool|None=None,
+    ocr_cache:OCRCache|None=None
 ) -> None:
     """
     OCR multiple pdf documents and add new votes to each voteEvent
@@ -180,33 +267,49 @@ def batch_ocr_and_add_votes(
             List of data dict contain OCR information
         pdf_file_dir: str
             Path to directory contains all of the pdf documents
-        reader: easyocr.Reader
+        reader: easyocr.Reader, optional
             easyOCR reader for text recognition
+        pool: OCRProcessPool, optional
+            OCR worker pool, documents are read in parallel (used over `reader`)
+        ocr_cache: OCRCache, optional
+            Cache of the raw OCR output, pages OCR'ed before are read from it
     """
     
-    if not reader:
+    if not reader and not pool:
         return
     
-    for file_info in data_dict:
-        
-        filename = file_info.get("file_name", "")
-        vote_event_id = file_info.get("vote_event_id", "")
-        
-        if not filename.endswith(".pdf"):
-            continue
-        
-        import os
-        pdf_file_pth = os.path.join(pdf_file_dir, filename)
+    import os
+    files_info = [
+        file_info for file_info in data_dict
+            if file_info.get("file_name", "").endswith(".pdf")
+    ]
+    pdf_file_paths = [
+        os.path.join(pdf_file_dir, file_info.get("file_name", ""))
+            for file_info in files_info
+    ]
+    
+    if pool:
+        # One document per worker, votes are added in order as OCR finishes
+        for file_info, ocr_result in zip(
+            files_info,
+            pool.map_documents(partial(ocr_vote_log, ocr_cache=ocr_cache), pdf_file_paths)
+        ):
+            add_ocr_votes(file_info.get("vote_event_id", ""), *ocr_result)
+        return
+    
+    for file_info, pdf_file_pth in zip(files_info, pdf_file_paths):
         ocr_and_add_votes(
             pdf_file_path=pdf_file_pth,
-            vote_event_id=vote_event_id,
-            reader=reader
+            vote_event_id=file_info.get("vote_event_id", ""),
+            reader=reader,
+            ocr_cache=ocr_cache
         )
         
 def ocr_and_update_votes(
     pdf_file_path: str,
     vote_event_id: str,
-    reader:easyocr.Reader
+    reader:easyocr.Reader,
+    ocr_cache:OCRCache|None=None
 ) -> pd.DataFrame:
     """
     OCR pdf document and update new votes to replace old votes in voteEvent
@@ -218,20 +321,15 @@ def ocr_and_update_votes(
             ID of the voteEvent
         reader: easyocr.Reader
             easyOCR reader for text recognition
+        ocr_cache: OCRCache, optional
+            Cache of the raw OCR output, pages OCR'ed before are read from it
     Returns:
         OCR result
     """
     
-    # Extract votes data
-    votes_df = extract_votelog(pdf_file_path, reader)
-    # Clean votes df
-    votes_df = clean_votelog_df(votes_df)
-    
-    doc_data = extract_doc_data(pdf_file_path, reader)
-    if doc_data['had_extra_votes']: # have extrac votes
-        extra_votes_df = extract_extra_votes(pdf_file_path, reader)
-        extra_votes_df = clean_extra_votes_df(extra_votes_df)
-        votes_df = update_extra_votes(votes_df,extra_votes_df)
+    # Extract votes data, only cleaning runs again for a cached document
+    doc_data, votes_df, extra_votes_df = ocr_vote_log(pdf_file_path, reader=reader, ocr_cache=ocr_cache)
+    votes_df = clean_vote_log(votes_df, extra_votes_df)
     
     vote_logs = votes_df.to_dict('records')
     replace_votes_in_vote_event(
@@ -1,4 +1,9 @@
 from .apollo_connector import get_apollo_client
+from .runtime import get_runtime, run_sync
+from .memo import get_cache_stats, invalidate_node_types
+from .entity_snapshot import get_entity_snapshot_store
+from .name_resolver import NameResolver
+from .schema_snapshot import load_schema_snapshot, update_schema_snapshot
 from .vote_events_handler import *
 from .votes_handler import *
 from .images import update_politician_image_url, update_party_logo_image_url
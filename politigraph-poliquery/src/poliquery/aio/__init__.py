@@ -0,0 +1,122 @@
+from .vote_events_handler import (
+    get_latest_parliament_term,
+    get_latest_msbis_id,
+    create_new_vote_event,
+)
+from .votes_handler import (
+    get_validation_data,
+    update_vote_event_validation_data,
+    get_votes_from_vote_event,
+    get_politician_name_index,
+    get_vote_event_name_resolver,
+    add_votes_to_vote_event,
+    replace_votes_in_vote_event,
+    update_vote_data,
+    update_votes_person_connection,
+    get_votes_in_vote_event,
+)
+from .images import (
+    update_politician_image_url,
+    update_party_logo_image_url,
+)
+from .politician_handler import (
+    get_politician_prefixes,
+    get_people_in_party,
+    get_representative_members_name,
+    get_name_resolver,
+    create_politician,
+)
+from .bills_handler import (
+    iter_all_bills_info,
+    get_all_bills_info,
+    create_new_multiple_bills,
+    get_prime_minister_cabinets,
+    get_prime_minister_cabinet_index,
+    update_bill_info,
+    update_bill_co_proposer,
+    update_bill_data,
+    create_bills_in_chunk,
+)
+from .bill_events_handler import (
+    create_events_with_retry,
+    get_bill_merge_events,
+    create_bill_vote_event_in_chunk,
+    create_bill_merge_event_in_chunk,
+    create_bill_royal_assent_event_in_chunk,
+    create_bill_enact_event_in_chunk,
+    create_bill_reject_event_in_chunk,
+    update_bill_vote_events,
+    update_bill_royal_assent_events,
+    update_bill_enact_events,
+    update_bill_reject_events,
+    update_main_bill_in_merge_events,
+)
+from .membership_handler import (
+    get_person_current_memberships,
+    update_membership_info,
+    get_party_posts,
+    create_new_post_in_party,
+    create_new_political_party_membership,
+    create_new_post_in_cabinet,
+    create_new_cabinet_membership,
+)
+from .parliament_handler import (
+    get_all_house_of_representatives,
+)
+from .political_party_handler import (
+    get_political_parties_name,
+)
+
+# Only the coroutines, not what the handlers import (query helpers, client)
+__all__ = [
+    'get_latest_parliament_term',
+    'get_latest_msbis_id',
+    'create_new_vote_event',
+    'get_validation_data',
+    'update_vote_event_validation_data',
+    'get_votes_from_vote_event',
+    'get_politician_name_index',
+    'get_vote_event_name_resolver',
+    'add_votes_to_vote_event',
+    'replace_votes_in_vote_event',
+    'update_vote_data',
+    'update_votes_person_connection',
+    'get_votes_in_vote_event',
+    'update_politician_image_url',
+    'update_party_logo_image_url',
+    'get_politician_prefixes',
+    'get_people_in_party',
+    'get_representative_members_name',
+    'get_name_resolver',
+    'create_politician',
+    'iter_all_bills_info',
+    'get_all_bills_info',
+    'create_new_multiple_bills',
+    'get_prime_minister_cabinets',
+    'get_prime_minister_cabinet_index',
+    'update_bill_info',
+    'update_bill_co_proposer',
+    'update_bill_data',
+    'create_bills_in_chunk',
+    'create_events_with_retry',
+    'get_bill_merge_events',
+    'create_bill_vote_event_in_chunk',
+    'create_bill_merge_event_in_chunk',
+    'create_bill_royal_assent_event_in_chunk',
+    'create_bill_enact_event_in_chunk',
+    'create_bill_reject_event_in_chunk',
+    'update_bill_vote_events',
+    'update_bill_royal_assent_events',
+    'update_bill_enact_events',
+    'update_bill_reject_events',
+    'update_main_bill_in_merge_events',
+    'get_person_current_memberships',
+    'update_membership_info',
+    'get_party_posts',
+    'create_new_post_in_party',
+    'create_new_political_party_membership',
+    'create_new_post_in_cabinet',
+    'create_new_cabinet_membership',
+    'get_all_house_of_representatives',
+    'get_political_parties_name',
+]
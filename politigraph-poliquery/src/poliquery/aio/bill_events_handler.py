@@ -0,0 +1,374 @@
+from typing import List, Dict, Any, Awaitable, Callable, Hashable, Tuple
+from gql import Client
+
+from ..apollo_connector import get_apollo_client
+from ..query_helper.royal_assent_event import get_royal_assent_events, create_royal_assent_event, update_royal_assent_event
+from ..query_helper.enact_event import get_enact_events, create_enact_event, update_enact_event
+from ..query_helper.reject_event import get_reject_events, create_reject_event, update_reject_event
+from ..query_helper.bill_vote_event import get_bill_vote_events, create_bill_vote_event, update_bill_vote_event
+from ..query_helper.bills import update_bill
+from ..query_helper.merge_event import get_merge_events, create_merge_event, update_merge_event
+from ..retry import with_retry
+from ..memo import async_cached
+
+def chunker(seq, size):
+    return (seq[pos:pos + size] for pos in range(0, len(seq), size))
+
+def get_connected_bill_id(param: Dict[str, Any]) -> str|None:
+    connects = param.get('bills', {}).get('connect', [])
+    if not connects:
+        return None
+    return connects[0]['where']['node']['id']['eq']
+
+async def create_events_with_retry(
+    client: Client,
+    params: List[Dict[str, Any]],
+    create_event: Callable[..., Awaitable[Any]],
+    get_events: Callable[..., Awaitable[List[Dict[str, Any]]]],
+    key_fields: List[str]=[]
+) -> None:
+    """
+    Create bill events, retrying on transient errors.
+
+    Before a retry, events already created by the failed attempt are looked
+    up by their (first) connected bill & `key_fields` and left out.
+    """
+    pending_params = params
+    
+    def event_key(bill_id: str|None, event: Dict[str, Any]) -> Tuple:
+        return (bill_id, *(event.get(field) for field in key_fields))
+    
+    async def create() -> None:
+        await create_event(
+            client=client,
+            params={
+                'input': pending_params
+            }
+        )
+    
+    async def check_pending() -> bool:
+        nonlocal pending_params
+        bill_ids = [get_connected_bill_id(param) for param in pending_params]
+        created_events = await get_events(
+            client=client,
+            fields=key_fields + ['bills { id }'],
+            params={
+                "where": {
+                    "bills": {
+                        "some": {
+                            "id": {
+                                "in": [bill_id for bill_id in bill_ids if bill_id]
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        created_keys = {
+            event_key(bill['id'], event)\
+                for event in created_events for bill in event.get('bills', [])
+        }
+        pending_params = [
+            param for param, bill_id in zip(pending_params, bill_ids)\
+                if event_key(bill_id, param) not in created_keys
+        ]
+        return bool(pending_params)
+    
+    await with_retry(create, check_pending=check_pending)
+
+################################ GET #################################
+#VVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV#
+
+@async_cached(maxsize=256, ttl=60, depends_on=('BillMergeEvents', 'Bills'))
+async def get_bill_merge_events(id: str|None, include_updated_events:bool=False):
+    # Initiate client
+    apollo_client = get_apollo_client()
+    main_bill_where_param = {}
+    if not include_updated_events:
+        main_bill_where_param['main_bill_id'] = {
+            "eq": None
+        }
+    if id:
+        main_bill_where_param['id'] = {
+            "eq": id
+        }
+    where_param = {
+        'where': main_bill_where_param
+    }
+    return await get_merge_events(
+        client=apollo_client,
+        fields=[
+            'id',
+            'total_merged_bills',
+            'main_bill_id',
+            'bills { \n\tid\n\ttitle\n\tcreators {\n\t... on Person {\n\t\tid\n\t\tprefix\n\t\tname\n\t}\n\t... on Organization {\n\t\tid\n\t\tname\n\t}}\n\tlinks { \n\t\tnote\n\t\turl\n\t}\n}',
+        ],
+        params=where_param
+    )
+    
+
+############################### CREATE ###############################
+#VVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV#
+
+async def create_bill_vote_event_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int=5
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    for param_chunk in chunker(params, batch_size):
+        await create_events_with_retry(
+            client=apollo_client,
+            params=param_chunk,
+            create_event=create_bill_vote_event,
+            get_events=get_bill_vote_events,
+            key_fields=['classification', 'msbis_id']
+        )
+    
+    return
+
+async def create_bill_merge_event_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int=5
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    for param_chunk in chunker(params, batch_size):
+        await create_events_with_retry(
+            client=apollo_client,
+            params=param_chunk,
+            create_event=create_merge_event,
+            get_events=get_merge_events
+        )
+    
+    return
+
+async def create_bill_royal_assent_event_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int=5
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    for param_chunk in chunker(params, batch_size):
+        await create_events_with_retry(
+            client=apollo_client,
+            params=param_chunk,
+            create_event=create_royal_assent_event,
+            get_events=get_royal_assent_events
+        )
+    
+    return
+
+async def create_bill_enact_event_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int=5
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    for param_chunk in chunker(params, batch_size):
+        await create_events_with_retry(
+            client=apollo_client,
+            params=param_chunk,
+            create_event=create_enact_event,
+            get_events=get_enact_events
+        )
+        
+    # Curate bill ID to update status to Rejected
+    bill_ids = [
+        p['bills']['connect'][0]['where']['node']['id']['eq'] for p in params
+    ]
+    # Update these bills status to REJECT
+    for bill_id in bill_ids:
+        await with_retry(lambda: update_bill(
+            client=apollo_client,
+            params={
+                "where": {
+                    "id": {
+                        "eq": bill_id
+                    }
+                },
+                "update": {
+                    "status": {
+                        "set": "ENACTED"
+                    }
+                }
+            }
+        ))
+    
+    return
+
+async def create_bill_reject_event_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int=5
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    # Create Reject event
+    for param_chunk in chunker(params, batch_size):
+        await create_events_with_retry(
+            client=apollo_client,
+            params=param_chunk,
+            create_event=create_reject_event,
+            get_events=get_reject_events
+        )
+        
+    # Curate bill ID to update status to Rejected
+    bill_ids = [
+        p['bills']['connect'][0]['where']['node']['id']['eq'] for p in params
+    ]
+    # Update these bills status to REJECT
+    for bill_id in bill_ids:
+        await with_retry(lambda: update_bill(
+            client=apollo_client,
+            params={
+                "where": {
+                    "id": {
+                        "eq": bill_id
+                    }
+                },
+                "update": {
+                    "status": {
+                        "set": "REJECTED"
+                    }
+                }
+            }
+        ))
+    
+    return
+
+############################### UPDATE ###############################
+#VVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV#
+
+async def update_bill_vote_events(
+    params: List[Dict[str, Any]]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    for param in params:
+        await with_retry(lambda: update_bill_vote_event(
+            client=apollo_client,
+            params=param
+        ))
+        
+    return
+
+async def update_bill_royal_assent_events(
+    params: List[Dict[str, Any]]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    for param in params:
+        await with_retry(lambda: update_royal_assent_event(
+            client=apollo_client,
+            params=param
+        ))
+        
+    return
+
+async def update_bill_enact_events(
+    params: List[Dict[str, Any]]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    for param in params:
+        await with_retry(lambda: update_enact_event(
+            client=apollo_client,
+            params=param
+        ))
+        
+    return
+
+async def update_bill_reject_events(
+    params: List[Dict[str, Any]]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    for param in params:
+        await with_retry(lambda: update_reject_event(
+            client=apollo_client,
+            params=param
+        ))
+        
+    return
+
+############################### NEW VERSION ###############################
+#VVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV#
+
+async def update_main_bill_in_merge_events(
+    merge_event_id: str|None,
+    main_bill_id: str|None
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get merge event
+    merge_event = next(iter(await get_bill_merge_events(id=merge_event_id, include_updated_events=True)), None)
+    
+    if not merge_event:
+        raise ValueError("BillMergeEvent ID does not exist!!")
+    
+    # Check if main_bill_id in in this merge event bills
+    if not main_bill_id in [b.get('id') for b in merge_event.get('bills', [])]:
+        raise ValueError("Bill's ID not in BillMergeEvent!!")
+    
+    # Update main bill
+    await with_retry(lambda: update_merge_event(
+        client=apollo_client,
+        params={
+            "where": {
+                "id": {
+                    "eq": merge_event_id
+                }
+            },
+            "update": {
+                "main_bill_id": {
+                    "set": main_bill_id
+                }
+            }
+        }
+    ))
+    
+    # Get all bill
+    bill_list = merge_event.get('bills', [])
+    # Update bill status
+    for bill in bill_list:
+        # Check ID
+        if bill.get('id') == main_bill_id: # is min bill
+            continue
+        await with_retry(lambda: update_bill(
+            client=apollo_client,
+            params={
+                "where": {
+                    "id": {
+                        "eq": bill.get('id')
+                    }
+                },
+                "update": {
+                    "status": {
+                        "set": "MERGED"
+                    }
+                }
+            }
+        ))
+    print("UPDATE SUCCESSFULLY!!")
+        
+    return
\ No newline at end of file
@@ -0,0 +1,657 @@
+from datetime import date
+from typing import List, Dict, Any, AsyncIterator, Hashable, TypeVar
+
+from thai_name_normalizer import remove_thai_name_prefix
+
+from ..apollo_connector import get_apollo_client
+from ..memo import async_cached
+from ..entity_snapshot import entity_snapshot
+from ..query_helper.bills import get_bills, iter_bills, create_bill, update_bill
+from ..query_helper.organizations import get_organizations
+from ..name_resolver import NameResolver
+from .politician_handler import get_politician_prefixes, get_name_resolver, get_people_in_party
+from .parliament_handler import get_all_house_of_representatives
+from ..retry import with_retry
+
+async def iter_all_bills_info(
+    parliament_terms: int,
+    page_size: int=100,
+    prefetch: int=1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every bill (with its events) of a parliament term page by page,
+    so whole-term syncs don't need the full term in one response.
+
+    Args:
+        parliament_terms: int
+            Term of the house of representatives.
+        page_size: int, optional
+            Number of bills per request.
+        prefetch: int, optional
+            Number of pages to request ahead.
+
+    Yields:
+        Bill data, one bill at a time.
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+     # Construct house of representative ID index
+    hor_index = {
+        h['term']: h['id'] for h in await get_organizations(
+            client=apollo_client,
+            fields=['id', 'name', 'term'],
+            params={
+                "where": {
+                    "classification": {
+                        "eq": "HOUSE_OF_REPRESENTATIVE"
+                    }
+                }
+            }
+        )
+    }
+    
+    # Get latest parliament term
+    param = {
+        "where": {
+            "organizations": {
+                "some": {
+                    "id": {
+                        "eq": hor_index.get(parliament_terms),
+                    }
+                }
+            }
+        }
+    }
+    
+    bill_events_field = {
+        'BillVoteEvent': [
+            'id', 'classification', 'start_date', 'result', \
+            'msbis_id', 'session_identifier',\
+            'agree_count', 'disagree_count', 'abstain_count', 'novote_count'
+        ],
+        'BillRoyalAssentEvent': ['id', 'result'],
+        'BillMergeEvent': ['id', 'main_bill_id', 'total_merged_bills'],
+        'BillRejectEvent': ['id', 'reject_reason'],
+        'BillEnactEvent': ['id', 'title'],
+    }
+    
+    bill_event_param = "events {"
+    for event, field in bill_events_field.items():
+        bill_event_param += f" ... on {event} " + "{ " + " ".join(field + ['__typename']) + " }"
+    bill_event_param += " }"
+    
+    query_field = [
+        'id',
+        'acceptance_number',
+        'lis_id',
+        'title',
+        'classification',
+        'proposal_date',
+        'status',
+        'links {note\nurl}',
+        bill_event_param,
+    ]
+    
+    async for bill in iter_bills(
+        client=apollo_client,
+        fields=query_field,
+        params=param,
+        page_size=page_size,
+        prefetch=prefetch
+    ):
+        yield bill
+
+async def get_all_bills_info(
+    parliament_terms: int,
+    page_size: int=100
+) -> List[Dict[str, Any]]:
+    return [
+        bill async for bill in iter_all_bills_info(
+            parliament_terms=parliament_terms,
+            page_size=page_size
+        )
+    ]
+
+async def create_new_multiple_bills(
+    bill_data: List[Dict[Hashable, Any]],
+    parliament_term: int =26,
+    batch_max: int=5
+) -> List[str]:
+    """
+    Add new bills
+
+    Args:
+        bill_data: List[Dict[Hashable, Any]]
+            data of bill
+        batch_max: int @optional
+            The max amount of bills create in ONE query
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    def generate_create_param(
+        bill_info: Dict[Hashable, Any],
+    ) -> Dict[str, Any]:
+    
+        # Get all input data
+        acceptance_number = bill_info.get('acceptance_number', None)
+        classification = bill_info.get('classification', None)
+        title = bill_info.get('title', None)
+        lis_id = bill_info.get('lis_doc_id', None)
+        
+        # Get other data
+        url = bill_info.get('url', None)
+        
+        # Construct param
+        create_bill_param = {
+            "acceptance_number": acceptance_number,
+            "classification": classification,
+            "title": title,
+            "lis_id": lis_id,
+            "organizations": {
+                "connect": [{
+                            "where": {
+                                "node": {
+                                    "classification": {
+                                        "eq": "HOUSE_OF_REPRESENTATIVE",
+                                    },
+                                    "id": {
+                                        "eq": f"สภาผู้แทนราษฎร-{parliament_term}"
+                                    }
+                                }
+                            }
+                        }]
+            },
+            "links": {
+                "create": [
+                    {
+                        "node": {
+                            "note": 'ระบบสารสนเทศด้านนิติบัญญัติ',
+                            "url": url
+                        }
+                    }
+                ]
+                }
+            }
+        return create_bill_param
+    
+    async def batch_create_bills(
+        bill_data: List[Dict[Hashable, Any]]
+    ) -> List[str]:
+        
+        result_ids = []
+        
+        # Create new votes & connect it to VoteEvent in a batch
+        batch_count = 0
+        create_bills_params = []
+        for bill in bill_data:
+            if batch_count >= batch_max:
+                param = {
+                    "input": create_bills_params
+                }
+                result = await create_bill(
+                    client=apollo_client, 
+                    params=param
+                )
+                # Get all result ids
+                _ids = [b['id'] for b in result["createBills"]["bills"]]
+                result_ids.extend(_ids)
+                
+                # Reset batch param
+                batch_count = 0
+                create_bills_params = []
+                
+            new_param = generate_create_param(bill)
+            create_bills_params.append(new_param)
+            batch_count += 1
+        
+        # Left over param
+        if create_bills_params:
+            param = {
+                "input": create_bills_params
+            }
+            result = await create_bill(
+                client=apollo_client, 
+                params=param
+            )
+            # Get all result ids
+            _ids = [b['id'] for b in result["createBills"]["bills"]]
+            result_ids.extend(_ids)
+        
+        return result_ids
+
+    bill_ids = await batch_create_bills(bill_data=bill_data)
+    return bill_ids
+
+@async_cached(maxsize=1, depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+@entity_snapshot('prime_minister_cabinets', depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+async def get_prime_minister_cabinets() -> List[Dict[str, Any]]:
+    """
+    Get every cabinet with its term dates & prime minister name(s), in one query.
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    cabinets = await get_organizations(
+        client=apollo_client,
+        fields=[
+            'id',
+            'name',
+            'founding_date',
+            'dissolution_date',
+            'posts { role memberships { members { ... on Person { id name } } } }',
+        ],
+        params={
+            "where": {
+                "classification": {
+                    "eq": "CABINET",
+                },
+                "posts": {
+                    "some": {
+                        "role": {
+                            "eq": "นายกรัฐมนตรี",
+                        }
+                    }
+                }
+            }
+        }
+    )
+    
+    return [
+        {
+            'id': cabinet['id'],
+            'name': cabinet['name'],
+            'founding_date': cabinet.get('founding_date'),
+            'dissolution_date': cabinet.get('dissolution_date'),
+            'prime_ministers': [
+                member['name']\
+                    for post in cabinet.get('posts', []) if post.get('role') == "นายกรัฐมนตรี"\
+                    for membership in post.get('memberships', [])\
+                    for member in membership.get('members', []) if member.get('name')
+            ],
+        } for cabinet in cabinets
+    ]
+
+def parse_date(date_string: str|None) -> date|None:
+    """Date of a YYYY-MM-DD string (time part ignored), None if missing or invalid."""
+    if not date_string:
+        return None
+    try:
+        return date.fromisoformat(str(date_string)[:10])
+    except ValueError:
+        return None
+
+async def get_prime_minister_cabinet_index(bill_proposal_date: str|None=None) -> Dict[str, str]:
+    """
+    Get index of prime minister name -> cabinet ID.
+
+    Args:
+        bill_proposal_date: str, optional
+            Date (YYYY-MM-DD) the bill got proposed, a cabinet in office on
+            that date is picked over the other cabinets of the prime minister
+            (no dissolution date: still in office). Otherwise, or without a
+            date, the latest cabinet of each prime minister is used.
+    """
+    cabinets = await get_prime_minister_cabinets()
+    proposal_date = parse_date(bill_proposal_date)
+    
+    def is_in_office(cabinet: Dict[str, Any]) -> bool:
+        if proposal_date is None:
+            return False
+        founding_date = parse_date(cabinet['founding_date'])
+        dissolution_date = parse_date(cabinet['dissolution_date'])
+        return (founding_date is None or founding_date <= proposal_date)\
+            and (dissolution_date is None or dissolution_date >= proposal_date)
+    
+    # Oldest first & cabinets in office last, so they override the others of the same prime minister
+    cabinets_index = {}
+    for cabinet in sorted(
+        cabinets,
+        key=lambda c: (is_in_office(c), parse_date(c['founding_date']) or date.min)
+    ):
+        for prime_minister_name in cabinet['prime_ministers']:
+            cabinets_index[prime_minister_name] = cabinet['id']
+    
+    return cabinets_index
+    
+async def update_bill_info(
+    bill_info: Dict[str, Any],
+    event_info: Dict[str, Any]
+) -> None:
+    # Check proposal_date
+    proposal_date = bill_info.get('proposal_date', None)
+    if proposal_date: # already updated
+        return
+    
+    # Get bill info
+    bill_id = bill_info.get('id', None)
+    
+    # Get event info
+    proposer = event_info.get('proposer')
+    proposal_date = event_info.get('proposal_date', "")
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Construct update param
+    # Get prefixes
+    politician_prefixes = await get_politician_prefixes()
+    
+    # Check proposer
+    creators_param = {}
+    if proposer == 'คณะรัฐมนตรี': # proposer is cabinet
+        # Get prime minister name
+        prime_minister_name = event_info.get('prime_minister', "")
+        prime_minister_name = remove_thai_name_prefix(
+            name=prime_minister_name,
+            prefixes=politician_prefixes
+        )
+        
+        # Get prime minister index
+        cabinet_index = await get_prime_minister_cabinet_index(
+            bill_proposal_date=proposal_date
+        )
+        # print(cabinet_index)
+        print(f"cabinet prime minister : {prime_minister_name}")
+        cabinet_id = cabinet_index.get(prime_minister_name, None)
+        if cabinet_id:
+            creators_param['Organization'] = [
+                {
+                    "connect": [
+                        {
+                            "where": {
+                                    "node": {
+                                        "id": {
+                                            "eq": cabinet_id
+                                        }
+                                }
+                            }
+                        }
+                    ]
+                }
+            ]
+        else:
+            print(f"No cabinet found for prime minister : {prime_minister_name}")
+    elif proposer: # proposer is a member of representatives
+        parliament_term = event_info.get("parliament_term", 0)
+        # Get politician name resolver
+        name_resolver = await get_name_resolver(parliament_term=parliament_term)
+        
+        proposer_name = remove_thai_name_prefix(
+            name=proposer,
+            prefixes=politician_prefixes
+        )
+        
+        print(f"proposed by : {proposer_name}")
+        creators_param['Person'] = [
+            {
+                "connect": [
+                    {
+                        "where": {
+                                "node": {
+                                    "id": {
+                                        "eq": name_resolver.resolve_id(proposer_name, fuzzy=False)
+                                    }
+                            }
+                        }
+                    }
+                ]
+            }
+        ]
+        
+    update_param = {
+        "proposal_date": {
+            "set": proposal_date
+        }
+    }
+    if creators_param:
+        update_param['creators'] = creators_param
+    
+    params = {
+        'where': {
+            "id": {
+                "eq": bill_id
+            }
+        },
+        'update': update_param
+    }
+    
+    # import json
+    # print(json.dumps(params, indent=2, ensure_ascii=False))
+    print("".join(["=" for _ in range(30)]))
+    
+    # Update bill info
+    await update_bill(
+        client=apollo_client,
+        params=params
+    )
+    
+    return
+
+async def update_bill_co_proposer(
+    bill_info: Dict[str, Any],
+    event_info: Dict[str, Any]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get bill info
+    bill_id = bill_info.get('id', None)
+    print(bill_id)
+    
+    # Get co-proposer
+    co_proposers = event_info['co_proposer']
+    
+    # Get unique party's name
+    parties_name = list(set(
+        [d.get('party_name', '') for d in co_proposers]
+    ))
+    # Get all politician in all parties
+    politicians_name = []
+    for party in parties_name:
+        politicians_name.extend(await get_people_in_party(party_name=party))
+    
+    # Construct politician name resolver
+    name_resolver = NameResolver(
+        persons=politicians_name,
+        prefixes=await get_politician_prefixes()
+    )
+    
+    # Construct update instruction
+    update_inst = [
+        {
+            'name': remove_thai_name_prefix(c['name']),
+            'id': name_resolver.resolve_id(c['name'], fuzzy=False) or ""
+            
+        } for c in co_proposers
+    ]
+    
+    async def update_multiple_co_proposer():
+        connect_params = []
+        for person in update_inst:
+            connect_params.append({
+                "where": {
+                    "node": { 
+                        "id": {
+                            "eq": person['id']
+                        } 
+                    }
+                }
+            })
+            if len(connect_params) >= 10:
+                await update_bill(
+                    client=apollo_client,
+                    params={
+                        "where": {
+                            "id": {
+                                "eq": bill_id
+                            }
+                        },
+                        "update": {
+                            "co_creators": [
+                                {
+                                    "connect": connect_params
+                                }
+                            ]
+                        }
+                    }
+                )
+                connect_params = []
+                
+    await update_multiple_co_proposer()
+        
+    return
+
+async def update_bill_data(
+    lis_id: int, 
+    acceptance_number: str,
+    data: Dict[str, Any]
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    from ..query_helper.schema import get_allowed_fields_for_type
+    
+    # Check validity of the field
+    valid_property = await get_allowed_fields_for_type(client=apollo_client, type_name='Bill')
+    
+    if any(key not in valid_property for key in data.keys()):
+        raise KeyError("Invalid key")
+    
+    # Construct update param
+    update_param = {}
+    for key, value in data.items():
+        update_param[key] = {
+            "set": value
+        }
+    
+    # Update bill info
+    await update_bill(
+        client=apollo_client,
+        params={
+            "where": {
+                "lis_id": {
+                    "eq": lis_id
+                },
+                "acceptance_number": {
+                    "eq": acceptance_number
+                }
+            },
+            "update": update_param
+        }
+    )
+ 
+async def create_bills_in_chunk(
+    params: List[Dict[str, Any]],
+    batch_size: int|None=None
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    T = TypeVar('T')
+    def chunker(seq: List[T], size:int) -> List[List[T]]:
+        return [seq[pos:pos + size] for pos in range(0, len(seq), size)]
+    
+    async def create_bill_with_retry(param: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Bill identity to check before retrying, so a create applied by a
+        # failed attempt doesn't get a duplicate
+        identity_where = {
+            key: {"eq": param[key]} for key in ('lis_id', 'acceptance_number')\
+                if param.get(key) is not None
+        }
+        existing_bills: List[Dict[str, Any]] = []
+        
+        async def create() -> List[Dict[str, Any]]:
+            results = await create_bill(
+                client=apollo_client,
+                params={
+                    'input': [param]
+                }
+            )
+            return results.get('createBills', {}).get('bills', [])
+        
+        async def check_pending() -> bool:
+            existing_bills.extend(await get_bills(
+                client=apollo_client,
+                fields=['id', 'title'],
+                params={
+                    "where": identity_where
+                }
+            ))
+            if existing_bills:
+                print(f"Bill already created : {existing_bills[0].get('id')}")
+            return not existing_bills
+        
+        created_bills = await with_retry(
+            create,
+            check_pending=check_pending if identity_where else None
+        )
+        return created_bills if created_bills is not None else existing_bills
+    
+    # Check & Exclude any param with long connection param
+    long_params:List[Dict] = []
+    if any(
+        len(param.get('co_proposers', {}).get('connect', [])) > 10\
+            for param in params
+    ):
+        long_params.extend([
+            param for param in params\
+                if len(param.get('co_proposers', {}).get('connect', [])) > 20
+        ])
+        params = [param for param in params if param not in long_params]
+    
+    # Create bill with short param
+    for param in params:
+        for bill in await create_bill_with_retry(param):
+            print(f"Created bill : {bill.get('id')}")
+
+        
+    # Create bill with long param
+    print("🚧 Starting create bills with long param...")
+    for param in long_params:
+        # Get all co-proposer param
+        co_proposer_conn = param.get('co_proposers', {}).get('connect', [])
+        
+        # Pull only first 5 connection to create
+        _first_five = co_proposer_conn[:5]
+        co_proposer_conn = co_proposer_conn[5:] # remove first 5 connects
+        
+        # Create bill
+        param['co_proposers']['connect'] = _first_five
+        bills = await create_bill_with_retry(param)
+        
+        # Get bill's ID
+        if not bills:
+            continue
+        bill_id = bills[0].get('id')
+        print(f"Created bill : {bill_id}")
+        
+        # Update connection
+        for connect_chunk in chunker(co_proposer_conn, size=5):
+            
+            # Connecting twice doesn't duplicate the relationship, safe to retry
+            await with_retry(lambda: update_bill(
+                client=apollo_client,
+                params={
+                    "where": {
+                        "id": {
+                            "eq": bill_id
+                        }
+                    },
+                    "update": {
+                        "co_creators": [{
+                            "connect": connect_chunk
+                        }]
+                    }
+                }
+            ))
+            print(f"\tAdded bill's co-proposers total : {len(connect_chunk)} people")
+    
+    return
\ No newline at end of file
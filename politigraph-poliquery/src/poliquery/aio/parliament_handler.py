@@ -0,0 +1,29 @@
+from typing import List, Dict, Any
+
+from ..apollo_connector import get_apollo_client
+from ..memo import async_cached
+from ..entity_snapshot import entity_snapshot
+from ..query_helper.organizations import get_organizations
+
+@async_cached(maxsize=256, ttl=120, depends_on=('Organizations',))
+@entity_snapshot('house_of_representatives', depends_on=('Organizations',))
+async def get_all_house_of_representatives() -> List[Dict[str, Any]]:
+    
+     # Initiate client
+    apollo_client = get_apollo_client()
+    
+    
+    house_of_representatives = await get_organizations(
+        client=apollo_client,
+        fields=['id', 'name', 'term'],
+        params={
+            "where": {
+                "classification": {
+                    "eq": "HOUSE_OF_REPRESENTATIVE"
+                }
+            }
+        }
+    )
+    
+    return house_of_representatives
+    
\ No newline at end of file
@@ -0,0 +1,213 @@
+from typing import List, Dict, Any
+
+from ..apollo_connector import get_apollo_client
+from ..memo import async_cached
+from ..entity_snapshot import entity_snapshot
+from ..name_resolver import NameResolver
+from ..query_helper.persons import get_persons, create_person
+
+@async_cached(maxsize=256, ttl=120, depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+@entity_snapshot('politician_prefixes', depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+async def get_politician_prefixes() -> List[str]:
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get latest parliament term
+    # param = {
+    #     "where": {
+    #         "memberships_SOME": {
+    #             "posts_SOME": {
+    #                 "organizations_SOME": {
+    #                 "parents_SOME": {
+    #                     "classification_EQ": "PARLIAMENT"
+    #                 }
+    #                 }
+    #             }
+    #         }
+    #     }
+    # }
+    param = {
+        "where": {
+            "memberships": {
+                "some": {
+                    "posts": {
+                        "some": {
+                            "organizations": {
+                                "some": {
+                                    "parents": {
+                                        "some": {
+                                            "classification": {
+                                                "eq": "PARLIAMENT"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    
+    people_result = await get_persons(
+        client=apollo_client,
+        fields=['prefix'],
+        params=param
+    )
+    
+    return list(set([p['prefix'] for p in people_result]))
+
+@async_cached(maxsize=1024, ttl=300, depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+@entity_snapshot('people_in_party', depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+async def get_people_in_party(party_name:str) -> List[Dict[str, Any]]:
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # param = {
+    #     "where": {
+    #         "memberships_SOME": {
+    #         "posts_SOME": {
+    #             "organizations_SOME": {
+    #             "classification_EQ": "POLITICAL_PARTY",
+    #             "name_EQ": party_name
+    #             }
+    #         }
+    #         }
+    #     }
+    # }
+    param = {
+        "where": {
+            "memberships": {
+                "some": {
+                    "posts": {
+                        "some": {
+                            "organizations": {
+                                "some": {
+                                    "classification": {
+                                        "eq": "POLITICAL_PARTY"
+                                    },
+                                    "name": {
+                                        "eq": party_name
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    
+    field = [
+        'id', 'name', 'prefix', 'firstname', 'middlename', 'lastname',
+        'memberships {\nlabel\nstart_date\nend_date}',
+        'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
+    ]
+    
+    people_result = await get_persons(
+        client=apollo_client,
+        fields=field,
+        params=param
+    )
+    
+    return people_result
+
+@async_cached(maxsize=1024, ttl=300, depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+async def get_representative_members_name(parliament_term:int=26) -> List[Dict[str, Any]]:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    field = [
+        'id', 'prefix', 'name',
+        'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
+    ]
+    
+    # param = {
+    #     "where": {
+    #         "memberships_SOME": {
+    #             "posts_SOME": {
+    #                 "role_EQ": "สมาชิกสภาผู้แทนราษฎร",
+    #                 "organizations_SOME": {
+    #                     "id_EQ": f"สภาผู้แทนราษฎร-{parliament_term}"
+    #                 }
+    #             }
+    #         }
+    #     }
+    # }
+    param = {
+        "where": {
+            "memberships": {
+                "some": {
+                    "posts": {
+                        "some": {
+                            "role": {
+                                "eq": "สมาชิกสภาผู้แทนราษฎร"
+                            },
+                            "organizations": {
+                                "some": {
+                                    "id": {
+                                        "eq": f"สภาผู้แทนราษฎร-{parliament_term}"
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    
+    # Get every person with membership in a specific parlaiment term
+    people_result = await get_persons(
+        client=apollo_client,
+        fields=field,
+        params=param
+    )
+    
+    return people_result
+
+@async_cached(maxsize=16, ttl=300, depends_on=('People', 'Memberships', 'Posts', 'Organizations'))
+async def get_name_resolver(parliament_term:int=26) -> NameResolver:
+    """
+    Name resolver of every member of the house of representatives in a parliament term
+
+    Args:
+        parliament_term: int
+            Term of the house of representatives.
+    """
+    return NameResolver(
+        persons=await get_representative_members_name(parliament_term=parliament_term),
+        prefixes=await get_politician_prefixes()
+    )
+
+async def create_politician(
+    prefix: str,
+    firstname: str,
+    lastname: str,
+    middlename: str|None=None
+) -> Dict[str, Any]:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Construct input param
+    input_param = {
+        "prefix": prefix,
+        "firstname": firstname,
+        "lastname": lastname,
+        "publish_status": "PUBLISHED"
+    }
+    
+    # Check middlename & add to input param
+    if middlename:
+        input_param['middlename'] = middlename
+    
+    result = await create_person(
+        client=apollo_client,
+        params={
+            "input": [input_param]
+        }
+    )
+    return result
@@ -0,0 +1,519 @@
+from typing import List, Dict, Any, Sequence
+
+from ..apollo_connector import get_apollo_client
+from ..memo import async_cached
+from ..name_resolver import NameResolver
+from ..query_helper.vote_events import get_vote_events, update_vote_event
+from ..query_helper.persons import get_persons
+from ..query_helper.votes import get_votes, create_votes, delete_votes, update_votes
+from ..batching import AdaptiveBatchSize, run_in_adaptive_batches
+from ..retry import with_retry
+
+################################ VALIDATION DATA ################################
+
+async def get_validation_data(vote_event_id: str) -> Dict[str, Any]:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    agg_param = {
+        "where": {
+            "id": {
+                "eq": vote_event_id
+            }
+        }
+    }
+    matched_vote_events = await get_vote_events(
+        apollo_client,
+        fields=[
+            'agree_count',
+            'disagree_count',
+            'abstain_count',
+            'novote_count'
+        ],
+        params=agg_param
+    )
+    if len(matched_vote_events) == 0:
+        print(f"No VoteEvent id: {vote_event_id}")
+        return {}
+    return matched_vote_events[0]
+
+async def update_vote_event_validation_data(
+    vote_event_id: str, 
+    validation_data: Dict[str, int], 
+    publish_status: str|None=None,
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get data
+    agree_count = validation_data.get("เห็นด้วย", -1) 
+    disagree_count = validation_data.get("ไม่เห็นด้วย", -1) 
+    abstained_count = validation_data.get("งดออกเสียง", -1) 
+    novoted_count = validation_data.get("ไม่ลงคะแนนเสียง", -1) 
+    
+    if publish_status not in ["ERROR", "PUBLISHED"]:
+        publish_status = "ERROR"
+        
+    update_vote_event_param = {
+        "where": {
+            "id": {
+                "eq": vote_event_id
+            }
+        },
+        "update": {
+            "agree_count": {
+                "set": agree_count
+            },
+            "disagree_count": {
+                "set": disagree_count
+            },
+            "abstain_count": {
+                "set": abstained_count
+            },
+            "novote_count": {
+                "set": novoted_count
+            },
+            "publish_status": {
+                "set": publish_status
+            }
+        }
+    }
+    
+    await update_vote_event(
+        client=apollo_client,
+        params=update_vote_event_param
+    )
+
+################################ VOTES DATA ################################
+
+async def get_votes_from_vote_event(
+    vote_event_id: str,
+) -> List[Dict[str, Any]]:
+    """
+    Get votes data from voteEvent
+
+    Args:
+        vote_event_id: str
+            voteEvent's ID
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    votes = await get_votes(
+        client=apollo_client,
+        fields=['id', 'vote_order', 'badge_number', 'voter_name', 'voter_party', 'option'],
+        params={
+            "where": {
+                "vote_events": {
+                    "some": {
+                        "id": {
+                            "eq": vote_event_id
+                        }
+                    }
+                }
+            }
+        }
+    )
+    
+    return votes
+
+@async_cached(maxsize=124, ttl=120, depends_on=('People', 'Memberships', 'Posts', 'Organizations', 'VoteEvents'))
+async def get_vote_event_name_resolver(
+    vote_event_id:str
+) -> NameResolver:
+    """
+    Name resolver of the politicians taking part in a voteEvent
+
+    Args:
+        vote_event_id: str
+            voteEvent's ID
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get politician names
+    # Construct param
+    get_politician_param = {
+        "where": {
+            "memberships": {
+                "some": {
+                    "posts": {
+                        "some": {
+                            "organizations": {
+                                "some": {
+                                    "events": {
+                                        "some": {
+                                            "id": {
+                                                "eq": vote_event_id
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    
+    politicians = await get_persons(
+        client=apollo_client,
+        fields=[
+            'id',
+            'name',
+            'firstname',
+            'middlename',
+            'lastname',
+            'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
+        ],
+        params=get_politician_param
+    )
+    
+    return NameResolver(politicians)
+
+async def get_politician_name_index(
+    vote_event_id:str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Index of name (& other names) -> politician of the politicians taking
+    part in a voteEvent, exact names only (see `get_vote_event_name_resolver`)
+
+    Args:
+        vote_event_id: str
+            voteEvent's ID
+    """
+    name_resolver = await get_vote_event_name_resolver(vote_event_id=vote_event_id)
+    
+    # Construct name index
+    name_index = {}
+    for person in name_resolver.persons:
+        name_index[person['name']] = person
+        other_names = person.get('other_names')
+        if not other_names:
+            continue
+        for alternate_name in other_names:
+            name_index[alternate_name['name']] = person
+    return name_index
+
+async def add_votes_to_vote_event(
+    vote_event_id: str,
+    vote_logs: List[Dict[str, Any]],
+    batch_max: int=100,
+    max_concurrency: int=4
+) -> None:
+    """
+    Add new votes to voteEvent
+
+    Votes are created with bulk `createVotes` mutations, each vote connected
+    to the voteEvent & its voter in the same input. The batch size adapts to
+    server errors and latency.
+
+    Args:
+        vote_event_id: str
+            voteEvent's ID
+        vote_logs: List[Dict[str, Any]]
+            List of votes info
+        batch_max: int @optional
+            The starting max amount of votes create in ONE query
+        max_concurrency: int @optional
+            The max amount of create queries in flight
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get politician names index
+    name_index = await get_vote_event_name_resolver(vote_event_id=vote_event_id)
+    
+    def generate_create_param(
+        vote_info: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        
+        name = vote_info.get("ชื่อ - สกุล", "") 
+        param = {
+              "vote_order": str(vote_info.get("ลําดับที่", "0")),
+              "badge_number": str(vote_info.get("เลขที่บัตร", "x")),
+              "voter_name_raw": name,
+              "voter_party": vote_info.get("ชื่อสังกัด", ""),
+              "option": vote_info.get("ผลการลงคะแนน", "x"),
+              "vote_events": {
+                  "connect": [{
+                      "where": {
+                          "node": {
+                              "id": {
+                                  "eq": vote_event_id
+                              }
+                          }
+                      }
+                  }]
+              }
+            }
+
+        # Check if name matched with politician in politigraph
+        matched_politician = name_index.resolve(name, fuzzy=False)
+        if matched_politician:
+            param["voters"] = {
+                "connect": [{
+                    "where": {
+                        "node": {
+                            "id": {
+                                "eq": matched_politician['id']
+                            }
+                        }
+                    }
+                  }]
+            }
+        
+        return param
+    
+    async def create_batch(create_params: List[Dict[str, Any]]) -> None:
+        pending_params = create_params
+
+        async def create() -> None:
+            await create_votes(
+                client=apollo_client,
+                params={"input": pending_params}
+            )
+
+        async def check_pending() -> bool:
+            # Drop votes that got created by the failed attempt (same vote_order in this voteEvent)
+            nonlocal pending_params
+            created_votes = await get_votes(
+                client=apollo_client,
+                fields=['vote_order'],
+                params={
+                    "where": {
+                        "vote_events": {
+                            "some": {
+                                "id": {
+                                    "eq": vote_event_id
+                                }
+                            }
+                        },
+                        "vote_order": {
+                            "in": [param['vote_order'] for param in pending_params]
+                        }
+                    }
+                }
+            )
+            created_orders = {vote['vote_order'] for vote in created_votes}
+            pending_params = [
+                param for param in pending_params if param['vote_order'] not in created_orders
+            ]
+            return bool(pending_params)
+
+        await with_retry(create, check_pending=check_pending)
+    
+    # Create new votes already connected to VoteEvent in concurrent batches
+    await run_in_adaptive_batches(
+        items=[generate_create_param(vote) for vote in vote_logs],
+        send=create_batch,
+        batch_size=AdaptiveBatchSize(initial=batch_max),
+        max_concurrency=max_concurrency
+    )
+    
+async def replace_votes_in_vote_event(
+    vote_event_id: str,
+    vote_logs: List[Dict[str, Any]],
+    batch_max: int=100,
+    max_concurrency: int=4
+) -> None:
+    """
+    Replace votes in voteEvent with a new set of data
+
+    Args:
+        vote_event_id: str
+            voteEvent's ID
+        vote_logs: List[Dict[str, Any]]
+            List of votes info
+        batch_max: int @optional
+            The starting max amount of votes create in ONE query
+        max_concurrency: int @optional
+            The max amount of create queries in flight
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Remove all votes from voteEvent
+    await update_vote_event(
+        client=apollo_client,
+        params={
+            "where": {
+                "id": {
+                    "eq": vote_event_id
+                }
+            },
+            "update": {
+                "votes": [{
+                    "delete": [{
+                        "where": {
+                                "node": None
+                            }
+                        }]
+                }]
+            }
+        }
+    )
+    
+    # Add new votes
+    await add_votes_to_vote_event(
+        vote_event_id=vote_event_id,
+        vote_logs=vote_logs,
+        batch_max=batch_max,
+        max_concurrency=max_concurrency
+    )
+
+async def update_vote_data(
+    vote_id: str,
+    voter_name: str|None=None,
+    voter_party: str|None=None,
+    option: str|None=None
+) -> None:
+    """
+    Update information in a specific vote
+
+    Args:
+        vote_id (str): ID of vote's node
+        voter_name_raw (str | None): voter's name
+        voter_party (str | None): voter's party
+        option (str | None): vote option
+    """
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Construct update param
+    update_param = {}
+    if voter_name:
+        update_param['voter_name_raw'] = {
+            "set": voter_name
+        }
+    if voter_party:
+        update_param['voter_party'] = {
+            "set": voter_party
+        }
+    if option:
+        update_param['option'] = {
+            "set": option
+        }
+    
+    # Update vote
+    await update_votes(
+        client=apollo_client,
+        params={
+            "where": {
+                "id": {
+                    "eq": vote_id
+                }
+            },
+            "update": update_param
+        }
+    )
+        
+async def update_votes_person_connection(
+    vote_event_id: str,
+) -> None:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    # Get politician names index
+    name_index = await get_vote_event_name_resolver(vote_event_id=vote_event_id)
+        
+    # Get votes
+    votes = await get_votes(
+        client=apollo_client,
+        fields=['id', 'voter_name_raw', 'voters { id }'],
+        params={
+            "where": {
+                "vote_events": {
+                    "some": {
+                        "id": {
+                            "eq": vote_event_id
+                        }
+                    }
+                }
+            }
+        }
+    )
+    
+    # Update connection
+    for vote in votes:
+        
+        # Check if voter already exist
+        if vote.get('voters', []):
+            continue
+        
+        vote_id = vote.get('id', '')
+        person_id = name_index.resolve_id(vote.get('voter_name_raw', ''), fuzzy=False)
+        if person_id is None: # unknown or ambiguous name
+            print(f"no politician found for {vote.get('voter_name_raw', '')}, skipped")
+            continue
+        print(f"update connection for {vote.get('voter_name_raw', '')}...")
+
+        update_param = {
+            "where": {
+                "id": {
+                    "eq": vote_id
+                }
+            },
+            "update": {
+                "voters": [
+                {
+                    "connect": [
+                    {
+                        "where": {
+                            "node": {
+                                "id": {
+                                    "eq": person_id
+                                }
+                            }
+                        }
+                    }
+                    ]
+                }
+                ]
+            }
+        }
+        await update_votes(
+            client=apollo_client,
+            params=update_param
+        )
+        
+async def get_votes_in_vote_event(
+    vote_event_id:str
+) -> List[Dict[str, Any]]:
+    
+    # Initiate client
+    apollo_client = get_apollo_client()
+    
+    get_param = {
+        "where": {
+            "vote_events": {
+                "some": {
+                    "id": {
+                        "eq": vote_event_id
+                    }
+                }
+            }
+        }
+    }
+    
+    return await get_votes(
+        client=apollo_client,
+        fields=[
+            'id',
+            'vote_order',
+            'badge_number',
+            'voter_name_raw',
+            'voter_party',
+            'option'
+        ],
+        params=get_param
+    )
\ No newline at end of file
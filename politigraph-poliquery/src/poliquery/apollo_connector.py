@@ -4,9 +4,12 @@ from dotenv import load_dotenv
 from gql.transport.aiohttp import AIOHTTPTransport
 from gql import Client
 
-from cachetools import cached, TTLCache
+from cachetools import cached
 
-@cached(cache=TTLCache(maxsize=1024, ttl=300))
+from .schema_snapshot import load_schema_snapshot
+
+# Keep one client for the whole process, its session is held open by the runtime
+@cached(cache={})
 def get_apollo_client(
     subscribtion_endpoint='',
     token=''
@@ -27,9 +30,14 @@ def get_apollo_client(
         headers={'x-api-key': f"{POLITIGRAPH_TOKEN}"}, 
     )
     
+    # Load the schema from the snapshot on disk when available,
+    # otherwise introspect it from the server on connect
+    schema_snapshot = load_schema_snapshot()
+    
     client = Client(
         transport=transport, 
-        fetch_schema_from_transport=True, 
+        schema=schema_snapshot,
+        fetch_schema_from_transport=schema_snapshot is None, 
         execute_timeout=30,
         batch_interval=3,
         batch_max=10
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Sequence, Tuple, TypeVar
+
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+
+T = TypeVar('T')
+
+# Status code & GraphQL error messages of a batch rejected for its size
+PAYLOAD_TOO_LARGE_STATUS = 413
+BATCH_SIZE_ERROR_MESSAGES: Tuple[str, ...] = ("too large", "too big")
+
+def is_batch_size_error(error: BaseException) -> bool:
+    """
+    The whole batch was rejected for its size, so none of it was applied and
+    it can be sent again in smaller batches. Any other failure (timeout,
+    server error, invalid input) may have been applied or won't get better
+    by splitting.
+    """
+    if isinstance(error, TransportServerError):
+        return error.code == PAYLOAD_TOO_LARGE_STATUS
+    if isinstance(error, TransportQueryError):
+        message = str(error).lower()
+        return any(size_message in message for size_message in BATCH_SIZE_ERROR_MESSAGES)
+    return False
+
+class AdaptiveBatchSize:
+    """
+    Batch size that grows while the server answers quickly and shrinks on
+    slow responses or errors (additive increase, multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int=1,
+        maximum: int=500,
+        target_latency: float=5.0
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_latency = target_latency
+        self._value = float(min(max(initial, self.minimum), self.maximum))
+
+    @property
+    def value(self) -> int:
+        return int(self._value)
+
+    def record_success(self, batch_size: int, latency: float) -> None:
+        if latency > self.target_latency:
+            self._shrink(batch_size)
+        elif batch_size >= self.value:
+            # Only grow when the full size was actually tried
+            self._value = min(self.maximum, self._value + max(1, self._value / 4))
+
+    def record_failure(self, batch_size: int) -> None:
+        self._shrink(batch_size)
+
+    def _shrink(self, batch_size: int) -> None:
+        # Halve relative to the batch that was sent, so concurrent batches
+        # failing together don't shrink the size several times over
+        self._value = max(self.minimum, min(self._value, batch_size / 2))
+
+async def run_in_adaptive_batches(
+    items: Sequence[T],
+    send: Callable[[List[T]], Awaitable[Any]],
+    batch_size: AdaptiveBatchSize,
+    max_concurrency: int=4
+) -> None:
+    """
+    Send items in batches with at most `max_concurrency` batches in flight.
+
+    A batch rejected for its size (see `is_batch_size_error`) is put back and
+    sent again in smaller batches; it is raised once the batch is already at
+    minimum size. Any other error is raised as is.
+
+    Args:
+        items: Sequence
+            Items to send.
+        send: Callable
+            Coroutine function sending one batch (list of items).
+        batch_size: AdaptiveBatchSize
+            Batch size controller.
+        max_concurrency: int, optional
+            Max number of batches in flight.
+    """
+    queue: Deque[T] = deque(items)
+
+    async def worker() -> None:
+        while queue:
+            size = min(batch_size.value, len(queue))
+            batch = [queue.popleft() for _ in range(size)]
+
+            start_time = time.monotonic()
+            try:
+                await send(batch)
+            except Exception as e:
+                if not is_batch_size_error(e) or len(batch) <= batch_size.minimum:
+                    raise
+                batch_size.record_failure(len(batch))
+                queue.extendleft(reversed(batch))
+                continue
+            batch_size.record_success(len(batch), time.monotonic() - start_time)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, max_concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
@@ -0,0 +1,176 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple, TypeVar
+
+from .memo import register_invalidation
+
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+ENTITY_SNAPSHOT_ENV = 'POLITIGRAPH_ENTITY_SNAPSHOT'
+DEFAULT_ENTITY_SNAPSHOT_PATH = 'politigraph_entities.sqlite'
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+def get_entity_snapshot_path(path: str|None=None) -> str:
+    """
+    Resolve the entity snapshot path, from argument, env or the default file name.
+    """
+    return path or os.getenv(ENTITY_SNAPSHOT_ENV) or DEFAULT_ENTITY_SNAPSHOT_PATH
+
+class EntitySnapshotStore:
+    """
+    SQLite store of reference data (e.g. party names, House of Representatives)
+    keyed by entity name & call arguments.
+
+    Every entry keeps the time it was fetched and a version (hash of its
+    content). The whole store is loaded into memory on open, writes go
+    through to disk.
+    """
+
+    def __init__(self, path: str|None=None) -> None:
+        self.path = get_entity_snapshot_path(path)
+        snapshot_dir = os.path.dirname(self.path)
+        if snapshot_dir:
+            os.makedirs(snapshot_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entities (
+                name TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                version TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (name, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+        # (name, key) -> (value JSON, version, fetched_at)
+        self._entries: Dict[Tuple[str, str], Tuple[str, str, float]] = {
+            (name, key): (value, version, fetched_at)
+                for name, key, value, version, fetched_at in self._connection.execute(
+                    "SELECT name, key, value, version, fetched_at FROM entities"
+                )
+        }
+
+    def get(self, name: str, key: str) -> Tuple[Any, str, float]|None:
+        """
+        Returns:
+            (value, version, fetched_at) of the entry, or None if not stored.
+        """
+        with self._lock:
+            entry = self._entries.get((name, key))
+        if entry is None:
+            return None
+        value, version, fetched_at = entry
+        return json.loads(value), version, fetched_at
+
+    def put(self, name: str, key: str, value: Any) -> bool:
+        """
+        Store a freshly fetched value.
+
+        Returns:
+            True if the value changed from the stored version.
+        """
+        value_json = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        version = hashlib.sha256(value_json.encode('utf-8')).hexdigest()[:12]
+        fetched_at = time.time()
+        with self._lock:
+            previous = self._entries.get((name, key))
+            self._entries[(name, key)] = (value_json, version, fetched_at)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entities (name, key, value, version, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (name, key, value_json, version, fetched_at)
+            )
+            self._connection.commit()
+        return previous is None or previous[1] != version
+
+    def mark_stale(self, name: str) -> None:
+        """Make every entry of an entity due for refresh, keeping it as fallback."""
+        with self._lock:
+            for entry_key, (value, version, _) in list(self._entries.items()):
+                if entry_key[0] == name:
+                    self._entries[entry_key] = (value, version, 0)
+            self._connection.execute("UPDATE entities SET fetched_at = 0 WHERE name = ?", (name,))
+            self._connection.commit()
+
+    def clear(self, name: str|None=None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._connection.execute("DELETE FROM entities")
+            else:
+                self._entries = {k: v for k, v in self._entries.items() if k[0] != name}
+                self._connection.execute("DELETE FROM entities WHERE name = ?", (name,))
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+_store: EntitySnapshotStore|None = None
+_store_lock = threading.Lock()
+
+def get_entity_snapshot_store() -> EntitySnapshotStore:
+    """Entity snapshot store of the process, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EntitySnapshotStore()
+        return _store
+
+def entity_snapshot(
+    name: str,
+    max_age: float=DEFAULT_MAX_AGE,
+    depends_on: Iterable[str]=()
+) -> Callable[[F], F]:
+    """
+    Keep the results of a reference data reader in the entity snapshot store.
+
+    A stored result younger than `max_age` is returned without a request.
+    Older ones get refreshed one call (entity & arguments) at a time, falling
+    back to the stored result if the refresh fails. Entries are marked for
+    refresh after a mutation on one of the `depends_on` node types.
+
+    Args:
+        name: str
+            Name of the entity in the store e.g. 'political_parties_name'
+        max_age: float, optional
+            Seconds a stored result is used without refreshing.
+        depends_on: Iterable[str], optional
+            Node types (plural, as in mutation names e.g. 'People') read by the function.
+    """
+    def decorator(func: F) -> F:
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            store = get_entity_snapshot_store()
+            key = json.dumps([args, kwargs], ensure_ascii=False, sort_keys=True, default=str)
+
+            stored = store.get(name, key)
+            if stored is not None and time.time() - stored[2] < max_age:
+                return stored[0]
+
+            try:
+                value = await func(*args, **kwargs)
+            except Exception as e:
+                if stored is None:
+                    raise
+                print(f"⚠️ Refresh {name} failed ({type(e).__name__}: {e}), using snapshot from {time.ctime(stored[2])}")
+                return stored[0]
+
+            store.put(name, key, value)
+            return value
+
+        register_invalidation(depends_on, lambda: get_entity_snapshot_store().mark_stale(name))
+        return wrapper # type: ignore
+
+    return decorator
@@ -1,138 +1,26 @@
-from typing import List, Dict, Any, Hashable
-import asyncio
-import re
+from typing import List, Dict, Any
 
-from .apollo_connector import get_apollo_client
-from .query_helper.memberships import get_memberships, update_membership, create_membership
-from .query_helper.posts import get_posts, create_post
-from .query_helper.organizations import get_organizations
-
-from cachetools import cached, TTLCache
+from .runtime import run_sync
+from .aio import membership_handler as _aio
+from .aio.membership_handler import create_new_post_in_party, create_new_post_in_cabinet
 
 
 def get_person_current_memberships(
     person_id: str
 ) -> List[Dict[str, Any]]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    param = {
-        "where": {
-            "end_date": {
-                "eq": None
-            },
-            "members": {
-                "some": {
-                    "Person": {
-                        "id": {
-                            "eq": person_id
-                        }
-                    }
-                },
-            }
-        }
-    }
-    
-    memberships = asyncio.run(get_memberships(
-        client=apollo_client,
-        fields=[
-            'id',
-            'label',
-            'start_date',
-            'end_date',
-            'posts { \nid \nrole \nlabel }'
-        ],
-        params=param
-    ))
-    
-    return memberships
+    return run_sync(_aio.get_person_current_memberships(person_id=person_id))
 
 def update_membership_info(
     membership_id: str,
     update_param: Dict[str, Any]
 ) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    params = {
-        "where": {
-            "id": {
-                "eq": membership_id
-            }
-        },
-        "update": update_param
-    }
-    
-    asyncio.run(update_membership(
-        client=apollo_client,
-        params=params
+    run_sync(_aio.update_membership_info(
+        membership_id=membership_id,
+        update_param=update_param
     ))
 
-@cached(cache=TTLCache(maxsize=256, ttl=30))    
 def get_party_posts(party_name: str) -> List[Dict[str, Any]]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Find post in org
-    return asyncio.run(get_posts(
-        client=apollo_client,
-        fields=[
-            'id', 'role', 'start_date'
-        ],
-        params={
-            "where": {
-                "organizations": {
-                    "single": {
-                        "classification": {
-                            "eq": "POLITICAL_PARTY",
-                        },
-                        "name": {
-                            "eq": party_name,
-                        }
-                    }
-                }
-            }
-        }
-    ))
-
-async def create_new_post_in_party(
-    client, 
-    party_name: str,
-    post_role: str 
-) -> None:
-    # Create param
-    create_post_param = {
-        "input": [
-            {
-                "start_date": None,
-                "role": post_role,
-                "organizations": {
-                    "connect": [
-                        {
-                            "where": {
-                                "node": {
-                                    "classification": {
-                                        "eq": "POLITICAL_PARTY",
-                                    },
-                                    "name": {
-                                        "eq": party_name
-                                    }
-                                }
-                            }
-                        }
-                    ]
-                }
-            }
-        ]
-    }
-    
-    await create_post(
-        client=client,
-        params=create_post_param
-    )
+    return run_sync(_aio.get_party_posts(party_name=party_name))
 
 def create_new_political_party_membership(
     person_id: str,
@@ -140,115 +28,12 @@ def create_new_political_party_membership(
     post_role: str,
     membership_start_date: str
 ) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get post in party
-    party_posts = get_party_posts(party_name=party_name)
-    # print(party_posts)
-    post_role_list = [p['role'] for p in party_posts]
-    
-    if post_role not in post_role_list: # this post don't exist in this org
-        # Create new post in org
-        asyncio.run(create_new_post_in_party(
-            client=apollo_client,
-            party_name=party_name,
-            post_role=post_role
-        ))
-        
-    # Connect person to new post
-    # Create new membership
-    create_membership_param = {
-        "input": [
-            {
-                "start_date": membership_start_date,
-                "label": None,
-                "members": {
-                    "Person": {
-                        "connect": [
-                            {
-                                "where": {
-                                    "node": {
-                                        "id": {
-                                            "eq": person_id
-                                        }
-                                    }
-                                }
-                            }
-                        ]
-                    }
-                },
-                "posts": {
-                    "connect": [
-                    {
-                        "where": {
-                            "node": {
-                                "role": {
-                                    "eq": post_role
-                                },
-                                "organizations": {
-                                    "single": {
-                                        "classification": {
-                                            "eq": "POLITICAL_PARTY",
-                                        },
-                                        "name": {
-                                            "eq": party_name
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                    ]
-                }
-            }
-        ]
-    }
-    asyncio.run(create_membership(
-        client=apollo_client,
-        params=create_membership_param
+    run_sync(_aio.create_new_political_party_membership(
+        person_id=person_id,
+        party_name=party_name,
+        post_role=post_role,
+        membership_start_date=membership_start_date
     ))
-        
-async def create_new_post_in_cabinet(
-    cabinet_term: int,
-    role: str,
-    start_date: str
-) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Create param
-    create_post_param = {
-        "input": [
-            {
-                "role": role,
-                "start_date": start_date,
-                "organizations": {
-                    "connect": [
-                        {
-                            "where": {
-                                "node": {
-                                    "classification": {
-                                        "eq": "CABINET",
-                                    },
-                                    "id": {
-                                        "eq": f"คณะรัฐมนตรี-{cabinet_term}"
-                                    }
-                                }
-                            }
-                        }
-                    ]
-                }
-            }
-        ]
-    }
-    
-    await create_post(
-        client=apollo_client,
-        params=create_post_param
-    )
 
 def create_new_cabinet_membership(
     person_id: str,
@@ -256,56 +41,9 @@ def create_new_cabinet_membership(
     post_role: str,
     membership_start_date: str
 ) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    create_membership_param = {
-        "input": [
-            {
-                "start_date": membership_start_date,
-                "label": None,
-                "members": {
-                    "Person": {
-                        "connect": [
-                            {
-                                "where": {
-                                    "node": {
-                                        "id": {
-                                            "eq": person_id
-                                        }
-                                    }
-                                }
-                            }
-                        ]
-                    }
-                },
-                "posts": {
-                    "connect": [
-                    {
-                        "where": {
-                            "node": {
-                                "role": {
-                                    "eq": post_role,
-                                },
-                                "organizations": {
-                                    "single": {
-                                        "id": {
-                                            "eq": f"คณะรัฐมนตรี-{cabinet_term}"
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                    ]
-                }
-            }
-        ]
-    }
-    
-    asyncio.run(create_membership(
-        client=apollo_client,
-        params=create_membership_param
+    run_sync(_aio.create_new_cabinet_membership(
+        person_id=person_id,
+        cabinet_term=cabinet_term,
+        post_role=post_role,
+        membership_start_date=membership_start_date
     ))
-    
\ No newline at end of file
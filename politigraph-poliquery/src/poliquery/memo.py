@@ -0,0 +1,137 @@
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Set, TypeVar
+
+from cachetools.keys import hashkey
+from graphql import DocumentNode, FieldNode, OperationDefinitionNode, OperationType
+
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# Mutation root field e.g. 'createVotes' -> 'Votes'
+_MUTATION_NODE_TYPE_PATTERN = re.compile(r"^(create|update|delete)(?=[A-Z])")
+
+# Node type (as named in mutations e.g. 'People') -> cache clearing callbacks of its readers
+_dependents: Dict[str, List[Callable[[], None]]] = {}
+_memoized_functions: List[Any] = []
+
+def async_cached(
+    maxsize: int=128,
+    ttl: float|None=None,
+    depends_on: Iterable[str]=()
+) -> Callable[[F], F]:
+    """
+    Memoize the result of a coroutine function.
+
+    Unlike `cachetools.cached`, which would cache the coroutine object, this
+    awaits the call and caches its result. The cache is thread-safe, so one
+    entry serves the sync handlers (running on the runtime loop) and direct
+    async callers alike. Every caller gets its own deep copy of the result,
+    so a caller changing it doesn't change the cached one.
+
+    The wrapped function gets `cache_info()`, `cache_clear()` and
+    `invalidate(*args, **kwargs)`. Its cache is also cleared after any
+    mutation on one of the `depends_on` node types, see `invalidate_node_types`.
+
+    Args:
+        maxsize: int, optional
+            Max number of cached results, the least recently used is dropped.
+        ttl: float, optional
+            Seconds a result stays valid, forever if None.
+        depends_on: Iterable[str], optional
+            Node types (plural, as in mutation names e.g. 'People') read by the function.
+    """
+    def decorator(func: F) -> F:
+        cache: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0}
+        # Bumped on invalidation so calls in flight don't store stale results
+        generation = [0]
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = hashkey(*args, **kwargs)
+            with lock:
+                entry = cache.get(key)
+                if entry is not None:
+                    expires_at, value = entry
+                    if expires_at is None or expires_at > time.monotonic():
+                        cache.move_to_end(key)
+                        stats['hits'] += 1
+                        return copy.deepcopy(value)
+                    del cache[key]
+                stats['misses'] += 1
+                call_generation = generation[0]
+
+            value = await func(*args, **kwargs)
+
+            with lock:
+                if call_generation == generation[0]:
+                    cache[key] = (None if ttl is None else time.monotonic() + ttl, value)
+                    cache.move_to_end(key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            # The cached value stays out of the caller's hands
+            return copy.deepcopy(value)
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(stats['hits'], stats['misses'], maxsize, len(cache))
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                generation[0] += 1
+
+        def invalidate(*args, **kwargs) -> None:
+            with lock:
+                cache.pop(hashkey(*args, **kwargs), None)
+                generation[0] += 1
+
+        wrapper.cache_info = cache_info # type: ignore
+        wrapper.cache_clear = cache_clear # type: ignore
+        wrapper.invalidate = invalidate # type: ignore
+
+        _memoized_functions.append(wrapper)
+        register_invalidation(depends_on, cache_clear)
+        return wrapper # type: ignore
+
+    return decorator
+
+def register_invalidation(node_types: Iterable[str], callback: Callable[[], None]) -> None:
+    """Call `callback` whenever one of the node types gets invalidated."""
+    for node_type in node_types:
+        _dependents.setdefault(node_type, []).append(callback)
+
+def invalidate_node_types(*node_types: str) -> None:
+    """Clear the cache of every memoized function reading the given node types."""
+    for node_type in node_types:
+        for callback in _dependents.get(node_type, []):
+            callback()
+
+def get_mutated_node_types(document: DocumentNode) -> Set[str]:
+    """Node types changed by a mutation document, from its root field names."""
+    node_types = set()
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode)\
+            or definition.operation != OperationType.MUTATION:
+            continue
+        for selection in definition.selection_set.selections:
+            if isinstance(selection, FieldNode):
+                node_types.add(_MUTATION_NODE_TYPE_PATTERN.sub("", selection.name.value))
+    return node_types
+
+def invalidate_after_mutation(document: DocumentNode) -> None:
+    invalidate_node_types(*get_mutated_node_types(document))
+
+def get_cache_stats() -> Dict[str, CacheInfo]:
+    """Cache stats of every memoized function, by qualified name."""
+    return {
+        f"{func.__module__}.{func.__qualname__}": func.cache_info()
+            for func in _memoized_functions
+    }
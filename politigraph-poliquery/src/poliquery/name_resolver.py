@@ -0,0 +1,251 @@
+import pickle
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+from rapidfuzz import distance, process
+from thai_name_normalizer import normalize_thai_name, remove_thai_name_prefix
+
+@lru_cache(maxsize=8192)
+def _get_name_keys(name: str, prefixes: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Prefix stripping tries every known prefix, worth doing once per name
+    normalized_name = normalize_thai_name(name.replace("ํา", "ำ")).strip()
+    if not normalized_name:
+        return ()
+    stripped_name = remove_thai_name_prefix(normalized_name, prefixes=list(prefixes))
+    return tuple(dict.fromkeys(k for k in (normalized_name, stripped_name) if k))
+
+class NameResolver:
+    """
+    Resolve politician names (as written in documents) to Politigraph persons.
+
+    Every name & other name of a person is indexed under its normalized key
+    (Thai vowel order, spacing, decomposed sara am) and its prefix-stripped
+    key. Exact lookups are dict lookups, names not found fall back to the
+    closest key by Levenshtein distance.
+    """
+
+    def __init__(self, persons: Iterable[Dict[str, Any]]=(), prefixes: Iterable[str]=()) -> None:
+        """
+        Args:
+            persons: Iterable[Dict[str, Any]], optional
+                Person data with 'id', 'name' & optional 'other_names' ([{'name': ...}]).
+            prefixes: Iterable[str], optional
+                Name prefixes to strip on top of the built-in ones.
+        """
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        self._persons: Dict[str, Dict[str, Any]] = {} # person ID -> person
+        self._index: Dict[str, str] = {} # name key -> person ID
+        self._names: Dict[str, str] = {} # name key -> name as stored in Politigraph
+        self._ambiguous_keys: Set[str] = set()
+        self._keys: List[str]|None = None
+
+        for person in persons:
+            self.add_person(person)
+
+    def __len__(self) -> int:
+        return len(self._persons)
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    @property
+    def persons(self) -> List[Dict[str, Any]]:
+        return list(self._persons.values())
+
+    @property
+    def names(self) -> List[str]:
+        """Every known name (and other name)."""
+        return list(dict.fromkeys(self._names.values()))
+
+    def normalize(self, name: str|None) -> str:
+        if not name:
+            return ""
+        return normalize_thai_name(name.replace("ํา", "ำ")).strip()
+
+    def get_keys(self, name: str|None) -> Tuple[str, ...]:
+        """Normalized key & prefix-stripped key of a name."""
+        if not name:
+            return ()
+        return _get_name_keys(name, self.prefixes)
+
+    def add_person(self, person: Dict[str, Any]) -> None:
+        person_id = person['id']
+        self._persons[person_id] = person
+        self._keys = None
+
+        names = [person.get('name')] + [
+            other_name.get('name') for other_name in (person.get('other_names') or [])
+        ]
+        for name in names:
+            for key in self.get_keys(name):
+                indexed_id = self._index.setdefault(key, person_id)
+                self._names.setdefault(key, name) # type: ignore
+                if indexed_id != person_id:
+                    # Same name for different persons, can't tell them apart
+                    self._ambiguous_keys.add(key)
+
+    def is_ambiguous(self, name: str|None) -> bool:
+        """The name (normalized or prefix-stripped) is shared by different persons."""
+        return any(key in self._ambiguous_keys for key in self.get_keys(name))
+
+    def lookup(self, name: str|None) -> Dict[str, Any]|None:
+        """Exact lookup by normalized/prefix-stripped name."""
+        for key in self.get_keys(name):
+            if key in self._ambiguous_keys:
+                return None
+            person_id = self._index.get(key)
+            if person_id is not None:
+                return self._persons[person_id]
+        return None
+
+    def _get_choices(self) -> List[str]:
+        # Ambiguous keys too, so a name closest to one isn't given to another person
+        if self._keys is None:
+            self._keys = list(self._index)
+        return self._keys
+
+    def _get_max_distance(self, key: str, similarity_threshold: int) -> int:
+        # Same rule as the OCR typo correction
+        return max(
+            round(len(key.replace(" ", "")) * (100 - similarity_threshold) / 100),
+            2
+        )
+
+    def _fuzzy_key(self, name: str|None, similarity_threshold: int) -> str|None:
+        # Normalized & prefix-stripped keys both scored, a wrongly stripped
+        # prefix doesn't hide the match of the full name
+        best_match = None
+        for key in self.get_keys(name):
+            match = process.extractOne(
+                key,
+                self._get_choices(),
+                scorer=distance.Levenshtein.distance,
+                score_cutoff=self._get_max_distance(key, similarity_threshold)
+            )
+            if match and (best_match is None or match[1] < best_match[1]):
+                best_match = match
+        return best_match[0] if best_match else None
+
+    def _fuzzy_person_id(self, name: str|None, similarity_threshold: int) -> str|None:
+        """
+        Person of the closest keys, None if the closest keys are ambiguous or
+        of different persons (no clear match).
+        """
+        closest_distance = None
+        closest_keys: Set[str] = set()
+        for key in self.get_keys(name):
+            for choice, choice_distance, _ in process.extract(
+                key,
+                self._get_choices(),
+                scorer=distance.Levenshtein.distance,
+                score_cutoff=self._get_max_distance(key, similarity_threshold),
+                limit=None
+            ):
+                if closest_distance is None or choice_distance < closest_distance:
+                    closest_distance = choice_distance
+                    closest_keys = set()
+                if choice_distance == closest_distance:
+                    closest_keys.add(choice)
+
+        if closest_keys & self._ambiguous_keys:
+            return None
+        person_ids = {self._index[key] for key in closest_keys}
+        return person_ids.pop() if len(person_ids) == 1 else None
+
+    def resolve(
+        self,
+        name: str|None,
+        fuzzy: bool=True,
+        similarity_threshold: int=90
+    ) -> Dict[str, Any]|None:
+        """
+        Find the person of a name, exact match first then closest name.
+        A name shared by different persons (or as close to names of
+        different persons) resolves to None.
+
+        Args:
+            name: str
+                Name to resolve, with or without prefix.
+            fuzzy: bool, optional
+                Fall back to the closest name if there is no exact match.
+            similarity_threshold: int, optional
+                Min similarity (0-100) of the closest name.
+
+        Returns:
+            The person data, or None if not found.
+        """
+        person = self.lookup(name)
+        if person is not None or not fuzzy or self.is_ambiguous(name):
+            return person
+        person_id = self._fuzzy_person_id(name, similarity_threshold)
+        return self._persons[person_id] if person_id is not None else None
+
+    def resolve_id(self, name: str|None, fuzzy: bool=True, similarity_threshold: int=90) -> str|None:
+        person = self.resolve(name, fuzzy=fuzzy, similarity_threshold=similarity_threshold)
+        return person['id'] if person else None
+
+    def match_name(self, name: str|None, similarity_threshold: int=90) -> str|None:
+        """
+        Known name (or other name) closest to the given name, e.g. to correct OCR typos.
+        """
+        for key in self.get_keys(name):
+            if key in self._names:
+                return self._names[key]
+        key = self._fuzzy_key(name, similarity_threshold)
+        return self._names[key] if key else None
+
+    def match_names(self, names: Sequence[str|None], similarity_threshold: int=90) -> List[str|None]:
+        """
+        `match_name` of a whole column of names at once.
+
+        Distinct names without an exact match are scored against every known
+        name in one `rapidfuzz.process.cdist` call.
+        """
+        matched_names: Dict[str|None, str|None] = {}
+        fuzzy_keys: Dict[str, List[str|None]] = {} # normalized/prefix-stripped key -> names
+        for name in dict.fromkeys(names):
+            keys = self.get_keys(name)
+            matched_names[name] = next((self._names[k] for k in keys if k in self._names), None)
+            if matched_names[name] is None:
+                for key in keys:
+                    fuzzy_keys.setdefault(key, []).append(name)
+
+        choices = self._get_choices()
+        if fuzzy_keys and choices:
+            queries = list(fuzzy_keys)
+            max_distances = [self._get_max_distance(key, similarity_threshold) for key in queries]
+            distances = process.cdist(
+                queries,
+                choices,
+                scorer=distance.Levenshtein.distance,
+                score_cutoff=max(max_distances),
+                workers=-1
+            )
+            best_match_indexes = distances.argmin(axis=1)
+            # Closest of the keys of each name
+            best_distances: Dict[str|None, int] = {}
+            for query, max_distance, best_match_index, query_distances in zip(
+                queries, max_distances, best_match_indexes, distances
+            ):
+                best_distance = query_distances[best_match_index]
+                if best_distance > max_distance:
+                    continue
+                for name in fuzzy_keys[query]:
+                    if name not in best_distances or best_distance < best_distances[name]:
+                        best_distances[name] = best_distance
+                        matched_names[name] = self._names[choices[best_match_index]]
+
+        return [matched_names[name] for name in names]
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            pickle.dump(self, file)
+
+    @classmethod
+    def load(cls, path: str) -> 'NameResolver':
+        with open(path, 'rb') as file:
+            resolver = pickle.load(file)
+        if not isinstance(resolver, cls):
+            raise TypeError(f"{path} is not a saved NameResolver.")
+        resolver._keys = None # Fuzzy choices are rebuilt, not read from older saves
+        return resolver
@@ -1,29 +1,7 @@
 from typing import List, Dict, Any
-import asyncio
 
-from .apollo_connector import get_apollo_client
-from .query_helper.organizations import get_organizations
+from .runtime import run_sync
+from .aio import parliament_handler as _aio
 
-from cachetools import cached, TTLCache
-
-@cached(cache=TTLCache(maxsize=256, ttl=120))
 def get_all_house_of_representatives() -> List[Dict[str, Any]]:
-    
-     # Initiate client
-    apollo_client = get_apollo_client()
-    
-    
-    house_of_representatives = asyncio.run(get_organizations(
-        client=apollo_client,
-        fields=['id', 'name', 'term'],
-        params={
-            "where": {
-                "classification": {
-                    "eq": "HOUSE_OF_REPRESENTATIVE"
-                }
-            }
-        }
-    ))
-    
-    return house_of_representatives
-    
\ No newline at end of file
+    return run_sync(_aio.get_all_house_of_representatives())
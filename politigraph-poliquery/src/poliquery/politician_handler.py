@@ -1,170 +1,20 @@
 from typing import List, Dict, Any
-import asyncio
 
-from .apollo_connector import get_apollo_client
-from .query_helper.persons import get_persons, create_person
+from .runtime import run_sync
+from .aio import politician_handler as _aio
+from .name_resolver import NameResolver
 
-from cachetools import cached, TTLCache
-
-@cached(cache=TTLCache(maxsize=256, ttl=120))
 def get_politician_prefixes() -> List[str]:
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get latest parliament term
-    # param = {
-    #     "where": {
-    #         "memberships_SOME": {
-    #             "posts_SOME": {
-    #                 "organizations_SOME": {
-    #                 "parents_SOME": {
-    #                     "classification_EQ": "PARLIAMENT"
-    #                 }
-    #                 }
-    #             }
-    #         }
-    #     }
-    # }
-    param = {
-        "where": {
-            "memberships": {
-                "some": {
-                    "posts": {
-                        "some": {
-                            "organizations": {
-                                "some": {
-                                    "parents": {
-                                        "some": {
-                                            "classification": {
-                                                "eq": "PARLIAMENT"
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-    
-    people_result = asyncio.run(get_persons(
-        client=apollo_client,
-        fields=['prefix'],
-        params=param
-    ))
-    
-    return list(set([p['prefix'] for p in people_result]))
+    return run_sync(_aio.get_politician_prefixes())
 
-@cached(cache=TTLCache(maxsize=1024, ttl=300))
 def get_people_in_party(party_name:str) -> List[Dict[str, Any]]:
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # param = {
-    #     "where": {
-    #         "memberships_SOME": {
-    #         "posts_SOME": {
-    #             "organizations_SOME": {
-    #             "classification_EQ": "POLITICAL_PARTY",
-    #             "name_EQ": party_name
-    #             }
-    #         }
-    #         }
-    #     }
-    # }
-    param = {
-        "where": {
-            "memberships": {
-                "some": {
-                    "posts": {
-                        "some": {
-                            "organizations": {
-                                "some": {
-                                    "classification": {
-                                        "eq": "POLITICAL_PARTY"
-                                    },
-                                    "name": {
-                                        "eq": party_name
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-    
-    field = [
-        'id', 'name', 'prefix', 'firstname', 'middlename', 'lastname',
-        'memberships {\nlabel\nstart_date\nend_date}',
-        'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
-    ]
-    
-    people_result = asyncio.run(get_persons(
-        client=apollo_client,
-        fields=field,
-        params=param
-    ))
-    
-    return people_result
+    return run_sync(_aio.get_people_in_party(party_name=party_name))
 
-@cached(cache=TTLCache(maxsize=1024, ttl=300))
 def get_representative_members_name(parliament_term:int=26) -> List[Dict[str, Any]]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    field = [
-        'id', 'prefix', 'name',
-        'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
-    ]
-    
-    # param = {
-    #     "where": {
-    #         "memberships_SOME": {
-    #             "posts_SOME": {
-    #                 "role_EQ": "สมาชิกสภาผู้แทนราษฎร",
-    #                 "organizations_SOME": {
-    #                     "id_EQ": f"สภาผู้แทนราษฎร-{parliament_term}"
-    #                 }
-    #             }
-    #         }
-    #     }
-    # }
-    param = {
-        "where": {
-            "memberships": {
-                "some": {
-                    "posts": {
-                        "some": {
-                            "role": {
-                                "eq": "สมาชิกสภาผู้แทนราษฎร"
-                            },
-                            "organizations": {
-                                "some": {
-                                    "id": {
-                                        "eq": f"สภาผู้แทนราษฎร-{parliament_term}"
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-    
-    # Get every person with membership in a specific parlaiment term
-    people_result = asyncio.run(get_persons(
-        client=apollo_client,
-        fields=field,
-        params=param
-    ))
-    
-    return people_result
+    return run_sync(_aio.get_representative_members_name(parliament_term=parliament_term))
+
+def get_name_resolver(parliament_term:int=26) -> NameResolver:
+    return run_sync(_aio.get_name_resolver(parliament_term=parliament_term))
 
 def create_politician(
     prefix: str,
@@ -172,26 +22,9 @@ def create_politician(
     lastname: str,
     middlename: str|None=None
 ) -> Dict[str, Any]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Construct input param
-    input_param = {
-        "prefix": prefix,
-        "firstname": firstname,
-        "lastname": lastname,
-        "publish_status": "PUBLISHED"
-    }
-    
-    # Check middlename & add to input param
-    if middlename:
-        input_param['middlename'] = middlename
-    
-    result = asyncio.run(create_person(
-        client=apollo_client,
-        params={
-            "input": [input_param]
-        }
+    return run_sync(_aio.create_politician(
+        prefix=prefix,
+        firstname=firstname,
+        lastname=lastname,
+        middlename=middlename
     ))
-    return result
@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
 
 async def get_bill_vote_events(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +20,18 @@ async def get_bill_vote_events(client:Client, fields:List[str], params:Dict={})
         A list of billVoteEvents data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='BillVoteEvent')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query BillVoteEvents($where: BillVoteEventWhere, $sort: [BillVoteEventSort!]) {{
-        billVoteEvents(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billVoteEvents']
+    query = await get_query_document(
+        client=client,
+        type_name='BillVoteEvent',
+        fields=fields,
+        operation='BillVoteEvents',
+        root_field='billVoteEvents'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['billVoteEvents']
     
 async def create_bill_vote_event(client: Client, params: dict) -> Dict[str, Any]:
-    query = gql(
+    query = parse_document(
     """
     mutation CreateBillVoteEvents($input: [BillVoteEventCreateInput!]!) {
         createBillVoteEvents(input: $input) {
@@ -57,12 +46,11 @@ async def create_bill_vote_event(client: Client, params: dict) -> Dict[str, Any]
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
     
 async def update_bill_vote_event(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation UpdateBillVoteEvents($where: BillVoteEventWhere, $update: BillVoteEventUpdateInput) {
         updateBillVoteEvents(where: $where, update: $update) {
@@ -76,6 +64,5 @@ async def update_bill_vote_event(client: Client, params: dict):
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result 
+    result = await execute(client, query, variable_values=params)
+    return result 
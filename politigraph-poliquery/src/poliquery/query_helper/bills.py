@@ -1,8 +1,9 @@
-from typing import List, Dict, Any
-from gql import gql
+from typing import List, Dict, Any, AsyncIterator
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from .pagination import paginate, DEFAULT_PAGE_SIZE
+from ..runtime import execute
 
 async def get_bills(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +21,55 @@ async def get_bills(client:Client, fields:List[str], params:Dict={}) -> List[Dic
         A list of bill data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='Bill')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
+    query = await get_query_document(
+        client=client,
+        type_name='Bill',
+        fields=fields,
+        operation='Bills',
+        root_field='bills'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['bills']
+
+async def iter_bills(
+    client: Client,
+    fields: List[str],
+    params: Dict={},
+    page_size: int=DEFAULT_PAGE_SIZE,
+    prefetch: int=1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream Bill node data page by page, see `paginate`.
+
+    Args:
+        client: gql.Client
+            The GQL client with a fetched schema.
+        fields: list
+            Field of data to query.
+        params: dict, optional
+            Dictionary object of query parameter.
+        page_size: int, optional
+            Number of records per request.
+        prefetch: int, optional
+            Number of pages to request ahead.
 
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query Bills($where: BillWhere, $sort: [BillSort!]) {{
-        bills(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
+    Yields:
+        bills data, one record at a time.
     """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['bills']
+    async for record in paginate(
+        client=client,
+        type_name='Bill',
+        fields=fields,
+        operation='Bills',
+        root_field='bills',
+        params=params,
+        page_size=page_size,
+        prefetch=prefetch
+    ):
+        yield record
     
 async def create_bill(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($input: [BillCreateInput!]!) {
         createBills(input: $input) {
@@ -59,12 +86,11 @@ async def create_bill(client: Client, params: dict):
     """
     )
 
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
     
 async def update_bill(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($where: BillWhere, $update: BillUpdateInput) {
         updateBills(where: $where, update: $update) {
@@ -77,6 +103,5 @@ async def update_bill(client: Client, params: dict):
     """
     )
     
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
\ No newline at end of file
+    result = await execute(client, query, variable_values=params)
+    return result
\ No newline at end of file
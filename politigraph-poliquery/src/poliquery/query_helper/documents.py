@@ -0,0 +1,87 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+from gql import gql, Client
+from graphql import DocumentNode
+
+from .schema import get_allowed_fields_for_type
+
+# Strip sub-selection from a field e.g. 'links { note url }' -> 'links'
+_FIELD_SELECTION_PATTERN = re.compile(r"\s.*")
+
+# (type name, fields, operation name, paginated) -> (parsed document, validated field names)
+_query_document_cache: Dict[Tuple[str, Tuple[str, ...], str, bool], Tuple[DocumentNode, FrozenSet[str]]] = {}
+
+@lru_cache(maxsize=512)
+def parse_document(query_string: str) -> DocumentNode:
+    """
+    Parse a static GraphQL document once and reuse it on every call.
+    """
+    return gql(query_string)
+
+async def get_query_document(
+    client: Client,
+    type_name: str,
+    fields: List[str],
+    operation: str,
+    root_field: str,
+    paginated: bool=False
+) -> DocumentNode:
+    """
+    Get the parsed read query of a node type, build & validate it only on first use.
+
+    Args:
+        client: gql.Client
+            The GQL client with a fetched schema.
+        type_name: str
+            The name of the node type e.g. 'Vote'
+        fields: list
+            Field of data to query.
+        operation: str
+            Name of the query operation e.g. 'Votes'
+        root_field: str
+            Name of the root query field e.g. 'votes'
+        paginated: bool, optional
+            Add `$limit` & `$offset` variables to the query.
+
+    Returns:
+        Parsed query document.
+    """
+    key = (type_name, tuple(fields), operation, paginated)
+    cached_document = _query_document_cache.get(key)
+    if cached_document:
+        return cached_document[0]
+
+    # Load schema to get valid fields
+    valid_property = await get_allowed_fields_for_type(client=client, type_name=type_name)
+
+    # Check if any fields in the list is invalid
+    field_names = frozenset(_FIELD_SELECTION_PATTERN.sub("", prop) for prop in fields)
+    if not field_names <= valid_property:
+        raise ValueError("Invalid field name.")
+
+    fields_string = "\n            ".join(fields)
+    variables_string = f"$where: {type_name}Where, $sort: [{type_name}Sort!]"
+    arguments_string = "where: $where, sort: $sort"
+    if paginated:
+        variables_string += ", $limit: Int, $offset: Int"
+        arguments_string += ", limit: $limit, offset: $offset"
+    query_string = f"""
+    query {operation}({variables_string}) {{
+        {root_field}({arguments_string}) {{
+            {fields_string}
+        }}
+    }}
+    """
+    document = gql(query_string)
+
+    # Concurrent first calls may have built it meanwhile, keep the first one
+    # so every caller shares the same document object
+    return _query_document_cache.setdefault(key, (document, field_names))[0]
+
+def clear_query_document_cache() -> None:
+    """Drop every compiled document, e.g. after the schema got updated."""
+    _query_document_cache.clear()
+    parse_document.cache_clear()
+    get_allowed_fields_for_type.cache_clear() # type: ignore
@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
 
 async def get_merge_events(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +20,18 @@ async def get_merge_events(client:Client, fields:List[str], params:Dict={}) -> L
         A list of BillMergeEvent data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='BillMergeEvent')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query BillMergeEvents($where: BillMergeEventWhere, $sort: [BillMergeEventSort!]) {{
-        billMergeEvents(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billMergeEvents']
+    query = await get_query_document(
+        client=client,
+        type_name='BillMergeEvent',
+        fields=fields,
+        operation='BillMergeEvents',
+        root_field='billMergeEvents'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['billMergeEvents']
     
 async def create_merge_event(client: Client, params: dict) -> Dict[str, Any]:
-    query = gql(
+    query = parse_document(
     """
     mutation CreateBillMergeEvents($input: [BillMergeEventCreateInput!]!) {
         createBillMergeEvents(input: $input) {
@@ -57,12 +46,11 @@ async def create_merge_event(client: Client, params: dict) -> Dict[str, Any]:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
     
 async def update_merge_event(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation UpdateBillMergeEvents($where: BillMergeEventWhere, $update: BillMergeEventUpdateInput) {
         updateBillMergeEvents(where: $where, update: $update) {
@@ -76,12 +64,11 @@ async def update_merge_event(client: Client, params: dict):
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result 
+    result = await execute(client, query, variable_values=params)
+    return result 
 
 async def agg_count_merge_event(client: Client, params: dict) -> int:
-    query = gql(
+    query = parse_document(
     """
     query BillMergeEventsConnection($where: BillMergeEventWhere) {
         billMergeEventsConnection(where: $where) {
@@ -94,6 +81,5 @@ async def agg_count_merge_event(client: Client, params: dict) -> int:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billMergeEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
+    result = await execute(client, query, variable_values=params)
+    return result['billMergeEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from typing import List, Dict, Any, AsyncIterator, Deque
+from gql import Client
+
+from .documents import get_query_document
+from ..runtime import execute
+
+DEFAULT_PAGE_SIZE = 200
+
+async def paginate(
+    client: Client,
+    type_name: str,
+    fields: List[str],
+    operation: str,
+    root_field: str,
+    params: Dict={},
+    page_size: int=DEFAULT_PAGE_SIZE,
+    prefetch: int=1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Query node data page by page with limit/offset and yield each record.
+
+    The next `prefetch` page(s) are requested while the current page is being
+    consumed, so the caller rarely waits on the network while only a bounded
+    number of pages are held in memory.
+
+    Args:
+        client: gql.Client
+            The GQL client with a fetched schema.
+        type_name: str
+            The name of the node type e.g. 'Vote'
+        fields: list
+            Field of data to query.
+        operation: str
+            Name of the query operation e.g. 'Votes'
+        root_field: str
+            Name of the root query field e.g. 'votes'
+        params: dict, optional
+            Dictionary object of query parameter (`where`, `sort`).
+        page_size: int, optional
+            Number of records per request.
+        prefetch: int, optional
+            Number of pages to request ahead of the current one.
+
+    Yields:
+        Node data, one record at a time.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1.")
+
+    query = await get_query_document(
+        client=client,
+        type_name=type_name,
+        fields=fields,
+        operation=operation,
+        root_field=root_field,
+        paginated=True
+    )
+
+    # Offset paging needs a stable order
+    base_params = {**params}
+    if not base_params.get('sort'):
+        base_params['sort'] = [{"id": "ASC"}]
+
+    async def fetch_page(offset: int) -> List[Dict[str, Any]]:
+        result = await execute(
+            client,
+            query,
+            variable_values={**base_params, "limit": page_size, "offset": offset}
+        )
+        return result[root_field]
+
+    next_offset = 0
+    pending: Deque[asyncio.Task] = deque()
+
+    def schedule_page() -> None:
+        nonlocal next_offset
+        pending.append(asyncio.ensure_future(fetch_page(next_offset)))
+        next_offset += page_size
+
+    try:
+        for _ in range(1 + max(prefetch, 0)):
+            schedule_page()
+
+        while pending:
+            page = await pending.popleft()
+            # A short page is the last one, anything prefetched after it is empty
+            is_last_page = len(page) < page_size
+            if not is_last_page:
+                schedule_page()
+
+            for record in page:
+                yield record
+
+            if is_last_page:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
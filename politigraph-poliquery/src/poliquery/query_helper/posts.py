@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
 
 async def get_posts(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +20,18 @@ async def get_posts(client:Client, fields:List[str], params:Dict={}) -> List[Dic
         A list of membership data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='Post')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query Posts($where: PostWhere, $sort: [PostSort!]) {{
-        posts(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['posts']
+    query = await get_query_document(
+        client=client,
+        type_name='Post',
+        fields=fields,
+        operation='Posts',
+        root_field='posts'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['posts']
     
 async def create_post(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($input: [PostCreateInput!]!) {
         createPosts(input: $input) {
@@ -55,6 +44,5 @@ async def create_post(client: Client, params: dict):
     """
     )
 
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result  
\ No newline at end of file
+    result = await execute(client, query, variable_values=params)
+    return result  
\ No newline at end of file
@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
 
 async def get_reject_events(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +20,18 @@ async def get_reject_events(client:Client, fields:List[str], params:Dict={}) ->
         A list of BillRejectEvents data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='BillRejectEvent')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query BillRejectEvents($where: BillRejectEventWhere, $sort: [BillRejectEventSort!]) {{
-        billRejectEvents(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billRejectEvents']
+    query = await get_query_document(
+        client=client,
+        type_name='BillRejectEvent',
+        fields=fields,
+        operation='BillRejectEvents',
+        root_field='billRejectEvents'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['billRejectEvents']
     
 async def create_reject_event(client: Client, params: dict) -> Dict[str, Any]:
-    query = gql(
+    query = parse_document(
     """
     mutation CreateBillRejectEvents($input: [BillRejectEventCreateInput!]!) {
         createBillRejectEvents(input: $input) {
@@ -57,12 +46,11 @@ async def create_reject_event(client: Client, params: dict) -> Dict[str, Any]:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
     
 async def update_reject_event(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation UpdateBillRejectEvents($where: BillRejectEventWhere, $update: BillRejectEventUpdateInput) {
         updateBillRejectEvents(where: $where, update: $update) {
@@ -76,12 +64,11 @@ async def update_reject_event(client: Client, params: dict):
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result 
+    result = await execute(client, query, variable_values=params)
+    return result 
 
 async def agg_count_reject_event(client: Client, params: dict) -> int:
-    query = gql(
+    query = parse_document(
     """
     query Query($where: BillRejectEventWhere) {
         billRejectEventsConnection(where: $where) {
@@ -94,12 +81,11 @@ async def agg_count_reject_event(client: Client, params: dict) -> int:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billRejectEventsConnection']['aggregate']['count']['nodes']
+    result = await execute(client, query, variable_values=params)
+    return result['billRejectEventsConnection']['aggregate']['count']['nodes']
     
 async def delete_reject_event(client: Client, params: dict) -> None:
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($where: BillRejectEventWhere) {
         deleteBillRejectEvents(where: $where) {
@@ -109,5 +95,4 @@ async def delete_reject_event(client: Client, params: dict) -> None:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
\ No newline at end of file
+    await execute(client, query, variable_values=params)
\ No newline at end of file
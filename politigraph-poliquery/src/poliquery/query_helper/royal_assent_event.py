@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
 
 async def get_royal_assent_events(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -20,29 +20,18 @@ async def get_royal_assent_events(client:Client, fields:List[str], params:Dict={
         A list of BillRoyalAssentEvents data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='BillRoyalAssentEvent')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query BillRoyalAssentEvents($where: BillRoyalAssentEventWhere, $sort: [BillRoyalAssentEventSort!]) {{
-        billRoyalAssentEvents(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billRoyalAssentEvents']
+    query = await get_query_document(
+        client=client,
+        type_name='BillRoyalAssentEvent',
+        fields=fields,
+        operation='BillRoyalAssentEvents',
+        root_field='billRoyalAssentEvents'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['billRoyalAssentEvents']
     
 async def create_royal_assent_event(client: Client, params: dict) -> Dict[str, Any]:
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($input: [BillRoyalAssentEventCreateInput!]!) {
         createBillRoyalAssentEvents(input: $input) {
@@ -57,12 +46,11 @@ async def create_royal_assent_event(client: Client, params: dict) -> Dict[str, A
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
     
 async def update_royal_assent_event(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation UpdateBillRoyalAssentEvents($where: BillRoyalAssentEventWhere, $update: BillRoyalAssentEventUpdateInput) {
         updateBillRoyalAssentEvents(where: $where, update: $update) {
@@ -76,12 +64,11 @@ async def update_royal_assent_event(client: Client, params: dict):
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result 
+    result = await execute(client, query, variable_values=params)
+    return result 
     
 async def agg_count_royal_assent_events(client: Client, params: dict) -> int:
-    query = gql(
+    query = parse_document(
     """
     query BillRoyalAssentEventsConnection {
         billRoyalAssentEventsConnection {
@@ -94,6 +81,5 @@ async def agg_count_royal_assent_events(client: Client, params: dict) -> int:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['billRoyalAssentEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
+    result = await execute(client, query, variable_values=params)
+    return result['billRoyalAssentEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
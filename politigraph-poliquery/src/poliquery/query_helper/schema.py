@@ -1,8 +1,10 @@
 from typing import Set
 from gql import gql, Client
-from aiocache import cached, Cache
 
-@cached(cache=Cache.MEMORY)
+from ..runtime import get_runtime
+from ..memo import async_cached
+
+@async_cached(maxsize=256)
 async def get_allowed_fields_for_type(client: Client, type_name: str):
     """
     Introspects the client's schema to get all available fields for a given type.
@@ -15,8 +17,10 @@ async def get_allowed_fields_for_type(client: Client, type_name: str):
     Returns:
         A set of field names for that type.
     """
-    async with client as session:
-        schema = client.schema
+    # Connect through the shared runtime, the schema get fetched on connect
+    if not client.schema:
+        await get_runtime().connect(client)
+    schema = client.schema
         
     if not schema:
         raise RuntimeError("Schema has not been fetched. Please initialize the client properly.")
@@ -24,6 +28,6 @@ async def get_allowed_fields_for_type(client: Client, type_name: str):
     schema_type = schema.get_type(type_name)
 
     if not schema_type:
-        raise ValueError(f"Type '{type_name}' not found in the schema.")
+        raise ValueError(f"Type '{type_name}' not found in the schema, the schema snapshot may be outdated.")
 
     return set(schema_type.fields.keys()) # type: ignore
\ No newline at end of file
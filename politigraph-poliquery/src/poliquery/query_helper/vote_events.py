@@ -1,9 +1,9 @@
 from typing import List, Dict, Any
-from gql import gql
 from gql import Client
-import asyncio
 
-from .schema import get_allowed_fields_for_type
+from .documents import get_query_document, parse_document
+from ..runtime import execute
+from ..retry import with_retry
 
 async def get_vote_events(client:Client, fields:List[str], params:Dict={}) -> List[Dict[str, Any]]:
     """
@@ -21,29 +21,18 @@ async def get_vote_events(client:Client, fields:List[str], params:Dict={}) -> Li
         A list of voteEvents data.
     """
     
-    # Load schema to get valid fields
-    valid_property = await get_allowed_fields_for_type(client=client, type_name='VoteEvent')
-    
-    # Check if any fields in the list is invalid
-    import re
-    if any(re.sub(r"\s.*", "", prop) not in valid_property for prop in fields):
-        raise ValueError("Invalid field name.")
-
-    fields_string = "\n            ".join(fields)
-    query_string = f"""
-    query VoteEvents($where: VoteEventWhere, $sort: [VoteEventSort!]) {{
-        voteEvents(where: $where, sort: $sort) {{
-            {fields_string}
-        }}
-    }}
-    """
-    query = gql(query_string)
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['voteEvents']
+    query = await get_query_document(
+        client=client,
+        type_name='VoteEvent',
+        fields=fields,
+        operation='VoteEvents',
+        root_field='voteEvents'
+    )
+    result = await execute(client, query, variable_values=params)
+    return result['voteEvents']
     
 async def create_vote_event(client: Client, params: dict) -> Dict[str, Any]:
-    query = gql(
+    query = parse_document(
     """
     mutation Mutation($input: [VoteEventCreateInput!]!) {
         createVoteEvents(input: $input) {
@@ -58,12 +47,11 @@ async def create_vote_event(client: Client, params: dict) -> Dict[str, Any]:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result
+    result = await execute(client, query, variable_values=params)
+    return result
 
 async def update_vote_event(client: Client, params: dict):
-    query = gql(
+    query = parse_document(
     """
     mutation UpdateVoteEvents($where: VoteEventWhere, $update: VoteEventUpdateInput) {
         updateVoteEvents(where: $where, update: $update) {
@@ -77,19 +65,14 @@ async def update_vote_event(client: Client, params: dict):
     }
     """
     )
-    async with client as session:
-        i_retry = 0
-        while i_retry < 5:
-            try:
-                result = await session.execute(query, variable_values=params)  
-                break
-            except:
-                await asyncio.sleep(10)
-                i_retry += 1
-        return result 
+    # Only `set` updates & deletes go through here, safe to run twice
+    result = await with_retry(
+        lambda: execute(client, query, variable_values=params)
+    )
+    return result 
     
 async def agg_count_vote_events(client: Client, params: dict) -> int:
-    query = gql(
+    query = parse_document(
     """
     query VoteEventsConnection($where: VoteEventWhere) {
         voteEventsConnection(where: $where) {
@@ -102,6 +85,5 @@ async def agg_count_vote_events(client: Client, params: dict) -> int:
     }
     """
     )
-    async with client as session:
-        result = await session.execute(query, variable_values=params)  
-        return result['voteEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
+    result = await execute(client, query, variable_values=params)
+    return result['voteEventsConnection']['aggregate']['count']['nodes']
\ No newline at end of file
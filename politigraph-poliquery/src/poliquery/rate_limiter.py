@@ -0,0 +1,116 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from gql.transport.exceptions import TransportServerError
+
+# Status codes meaning the endpoint is overloaded
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate is tuned by AIMD: the rate grows by a fixed
+    step after every healthy response and is cut by a factor on 429/5xx or
+    when the response latency rises.
+    """
+
+    def __init__(
+        self,
+        rate: float=1.0,
+        min_rate: float=0.2,
+        max_rate: float=10.0,
+        burst: float=2.0,
+        increase_step: float=0.2,
+        decrease_factor: float=0.5,
+        target_latency: float=5.0,
+        latency_factor: float=2.0
+    ) -> None:
+        """
+        Args:
+            rate: float, optional
+                Starting rate, requests per second.
+            min_rate: float, optional
+                Lowest rate to back off to.
+            max_rate: float, optional
+                Highest rate to increase to.
+            burst: float, optional
+                Max requests that can start at once after idling.
+            increase_step: float, optional
+                Rate added after a healthy response.
+            decrease_factor: float, optional
+                Rate multiplier after a throttled or slow response.
+            target_latency: float, optional
+                Response time (seconds) considered slow in any case.
+            latency_factor: float, optional
+                A response slower than this times the average latency is slow.
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.latency_factor = latency_factor
+
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._average_latency: float|None = None
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request is allowed to start."""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def record_success(self, latency: float) -> None:
+        self._refill()
+        average_latency = self._average_latency
+        self._average_latency = latency if average_latency is None else 0.8 * average_latency + 0.2 * latency
+
+        is_slow = latency > self.target_latency or (
+            average_latency is not None and latency > self.latency_factor * average_latency
+        )
+        if is_slow:
+            self._decrease()
+        else:
+            self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def record_throttled(self) -> None:
+        self._refill()
+        self._decrease()
+
+    def _decrease(self) -> None:
+        self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+
+    @asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """
+        Wait for a token, then feed the outcome of the wrapped request back
+        into the rate.
+        """
+        await self.acquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        except TransportServerError as e:
+            if e.code in THROTTLE_STATUS_CODES:
+                self.record_throttled()
+            raise
+        except asyncio.TimeoutError:
+            self.record_throttled()
+            raise
+        self.record_success(time.monotonic() - start_time)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+from gql.transport.exceptions import TransportClosed, TransportServerError
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth another try, anything else won't get better by retrying
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Transport failures & timeouts are transient, GraphQL errors are not."""
+    if isinstance(error, TransportServerError):
+        return error.code is None or error.code in RETRY_STATUS_CODES
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError, TransportClosed))
+
+def get_backoff_delay(attempt: int, base_delay: float=1.0, max_delay: float=30.0) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+async def with_retry(
+    operation: Callable[[], Awaitable[T]],
+    max_attempts: int=5,
+    base_delay: float=1.0,
+    max_delay: float=30.0,
+    check_pending: Callable[[], Awaitable[bool]]|None=None
+) -> T|None:
+    """
+    Run an operation, retrying on transient errors with jittered exponential backoff.
+
+    A failed mutation may still have been applied by the server (e.g. on a
+    timeout), so non-idempotent operations should pass `check_pending`. It
+    runs before every retry, can trim what is left to do, and returns False
+    when nothing is left, in which case the retry is skipped. If the check
+    itself fails, it is run again after the next delay (it counts as a try),
+    the operation is never sent again unchecked; once out of tries, the
+    error of the operation is raised with the check error as its cause.
+
+    Args:
+        operation: Callable
+            Coroutine function to run.
+        max_attempts: int, optional
+            Max number of tries, including the first one.
+        base_delay: float, optional
+            Delay (seconds) of the first retry before jitter.
+        max_delay: float, optional
+            Upper bound of the delay.
+        check_pending: Callable, optional
+            Coroutine function telling if the operation still has to be done.
+
+    Returns:
+        The result of the operation, or None if `check_pending` found it done.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await operation()
+        except Exception as e:
+            error = e
+
+        check_error = None
+        while True:
+            attempt += 1
+            last_error = check_error or error
+            if attempt >= max_attempts or not is_retryable_error(last_error):
+                if check_error is not None:
+                    raise error from check_error
+                raise error
+            delay = get_backoff_delay(attempt - 1, base_delay, max_delay)
+            logger.warning(
+                "%s: %s, retrying in %.1fs (%d/%d)",
+                type(last_error).__name__, last_error, delay, attempt, max_attempts - 1
+            )
+            await asyncio.sleep(delay)
+
+            if check_pending is None:
+                break
+            # Unknown whether the failed call got applied until the check succeeds
+            try:
+                if not await check_pending():
+                    return None
+                break
+            except Exception as e:
+                check_error = e
@@ -0,0 +1,204 @@
+import asyncio
+import atexit
+import json
+import threading
+from typing import Any, Coroutine, Dict, TypeVar
+
+from gql import Client
+from gql.client import AsyncClientSession
+from graphql import DocumentNode, OperationDefinitionNode, OperationType
+
+from .rate_limiter import AdaptiveRateLimiter
+from .retry import with_retry
+from .single_flight import SingleFlight
+from .memo import invalidate_after_mutation
+
+T = TypeVar('T')
+
+def is_mutation(document: DocumentNode) -> bool:
+    return any(
+        isinstance(definition, OperationDefinitionNode) and definition.operation == OperationType.MUTATION
+        for definition in document.definitions
+    )
+
+class PoliqueryRuntime:
+    """
+    Long-lived event loop running in a background thread.
+
+    The runtime keeps one connected gql session per Client open for the whole
+    process, so every query reuses the same aiohttp connector (and keep-alive
+    connection) instead of reconnecting on each call.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop|None = None
+        self._thread: threading.Thread|None = None
+        self._thread_lock = threading.Lock()
+        self._sessions: Dict[Client, AsyncClientSession] = {}
+        self._connect_lock: asyncio.Lock|None = None
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.single_flight = SingleFlight()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop of the runtime, started on first use."""
+        with self._thread_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run_loop() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(
+                    target=run_loop,
+                    name='poliquery-runtime',
+                    daemon=True
+                )
+                thread.start()
+                started.wait()
+
+                self._loop = loop
+                self._thread = thread
+                self._sessions = {}
+                self._connect_lock = None
+                self.single_flight = SingleFlight()
+        return self._loop
+
+    def in_runtime_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the runtime loop and block until it is done.
+        This is what every synchronous handler goes through.
+        """
+        if self.in_runtime_thread():
+            coro.close()
+            raise RuntimeError(
+                "Synchronous poliquery handler called from inside the runtime loop, await the async version instead."
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def submit(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Await a coroutine on the runtime loop from any event loop.
+        """
+        loop = self.loop
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, loop)
+        )
+
+    async def _get_session(self, client: Client) -> AsyncClientSession:
+        # Must be called on the runtime loop
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            session = self._sessions.get(client)
+            # (Re)connect if never connected or the transport got closed
+            if session is None or getattr(client.transport, 'session', None) is None:
+                session = await client.connect_async(reconnecting=False)
+                self._sessions[client] = session
+            return session
+
+    async def connect(self, client: Client) -> None:
+        """Make sure the client is connected (and its schema is loaded)."""
+        await self.submit(self._get_session(client))
+
+    async def execute(
+        self,
+        client: Client,
+        document: DocumentNode,
+        variable_values: Dict[str, Any]|None=None
+    ) -> Dict[str, Any]:
+
+        if not is_mutation(document):
+            async def _query() -> Dict[str, Any]:
+                session = await self._get_session(client)
+                return await session.execute(document, variable_values=variable_values)
+
+            # Documents are compiled once & reused, so the object identity
+            # stands for the query text
+            key = (
+                id(client),
+                id(document),
+                json.dumps(variable_values, sort_keys=True, ensure_ascii=False, default=str)
+            )
+
+            # Reads are idempotent, mutations are retried by the caller
+            # that knows how to check if one got applied
+            return await self.submit(
+                self.single_flight.do(key, lambda: with_retry(_query)) # type: ignore
+            )
+
+        async def _mutate() -> Dict[str, Any]:
+            session = await self._get_session(client)
+            try:
+                async with self.rate_limiter.throttle():
+                    return await session.execute(document, variable_values=variable_values)
+            finally:
+                # Even a failed mutation may have been applied
+                invalidate_after_mutation(document)
+
+        return await self.submit(_mutate())
+
+    def close(self, timeout: float=10) -> None:
+        """Close every open session and stop the runtime loop."""
+        loop, thread = self._loop, self._thread
+        if loop is None or loop.is_closed() or self.in_runtime_thread():
+            return
+
+        async def close_sessions() -> None:
+            for client in list(self._sessions):
+                try:
+                    await client.close_async()
+                except Exception:
+                    pass
+            self._sessions.clear()
+
+        if loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(close_sessions(), loop).result(timeout=timeout)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                if thread:
+                    thread.join(timeout=timeout)
+        loop.close()
+
+_runtime = PoliqueryRuntime()
+atexit.register(_runtime.close)
+
+def get_runtime() -> PoliqueryRuntime:
+    return _runtime
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a poliquery coroutine from synchronous code through the shared runtime.
+    """
+    return _runtime.run(coro)
+
+async def execute(
+    client: Client,
+    document: DocumentNode,
+    variable_values: Dict[str, Any]|None=None
+) -> Dict[str, Any]:
+    """
+    Execute a GraphQL document with the persistent session of the client.
+
+    Args:
+        client: gql.Client
+            The GQL client.
+        document: graphql.DocumentNode
+            Parsed GraphQL document.
+        variable_values: dict, optional
+            Dictionary object of query parameter.
+
+    Returns:
+        The result data of the operation.
+    """
+    return await _runtime.execute(client, document, variable_values)
@@ -0,0 +1,103 @@
+import os
+import hashlib
+from datetime import datetime, timezone
+
+from gql import gql
+from graphql import build_client_schema, get_introspection_query, print_schema
+
+SCHEMA_SNAPSHOT_ENV = 'POLITIGRAPH_SCHEMA_SNAPSHOT'
+DEFAULT_SCHEMA_SNAPSHOT_PATH = 'politigraph_schema.graphql'
+
+def get_schema_snapshot_path(path: str|None=None) -> str:
+    """
+    Resolve the schema snapshot path, from argument, env or the default file name.
+    """
+    return path or os.getenv(SCHEMA_SNAPSHOT_ENV) or DEFAULT_SCHEMA_SNAPSHOT_PATH
+
+def get_schema_version(schema_sdl: str) -> str:
+    return hashlib.sha256(schema_sdl.encode('utf-8')).hexdigest()[:12]
+
+def load_schema_snapshot(path: str|None=None) -> str|None:
+    """
+    Load Politigraph schema (SDL) snapshot from disk.
+
+    Args:
+        path: str, optional
+            Path to the snapshot file.
+
+    Returns:
+        The schema SDL string, or None if there is no snapshot.
+    """
+    snapshot_path = get_schema_snapshot_path(path)
+    if not os.path.isfile(snapshot_path):
+        return None
+
+    with open(snapshot_path, 'r', encoding='utf-8') as file:
+        schema_sdl = file.read()
+
+    if not schema_sdl.strip():
+        return None
+    return schema_sdl
+
+def read_schema_snapshot_version(path: str|None=None) -> str|None:
+    """
+    Read the version header of the schema snapshot.
+    """
+    schema_sdl = load_schema_snapshot(path)
+    if not schema_sdl:
+        return None
+    for line in schema_sdl.splitlines():
+        if line.startswith('# version:'):
+            return line.split(':', 1)[1].strip()
+    return None
+
+async def fetch_schema_snapshot(path: str|None=None) -> str:
+    """
+    Introspect the Politigraph schema and save it as a snapshot on disk.
+
+    Args:
+        path: str, optional
+            Path to the snapshot file.
+
+    Returns:
+        Version of the saved snapshot.
+    """
+    from .apollo_connector import get_apollo_client
+    from .runtime import execute
+    from .query_helper.documents import clear_query_document_cache
+
+    # Initiate client
+    apollo_client = get_apollo_client()
+
+    introspection = await execute(
+        apollo_client,
+        gql(get_introspection_query(descriptions=False))
+    )
+    schema = build_client_schema(introspection) # type: ignore
+    schema_sdl = print_schema(schema)
+    version = get_schema_version(schema_sdl)
+
+    snapshot_path = get_schema_snapshot_path(path)
+    snapshot_dir = os.path.dirname(snapshot_path)
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    with open(snapshot_path, 'w', encoding='utf-8') as file:
+        file.write(f"# Politigraph schema snapshot\n")
+        file.write(f"# version: {version}\n")
+        file.write(f"# generated_at: {datetime.now(timezone.utc).isoformat(timespec='seconds')}\n\n")
+        file.write(schema_sdl)
+        file.write("\n")
+
+    # Use the fresh schema for the running client too
+    apollo_client.schema = schema
+    apollo_client.introspection = introspection # type: ignore
+    clear_query_document_cache()
+
+    return version
+
+def update_schema_snapshot(path: str|None=None) -> str:
+    """
+    Regenerate the schema snapshot, see `fetch_schema_snapshot`.
+    """
+    from .runtime import run_sync
+    return run_sync(fetch_schema_snapshot(path))
@@ -0,0 +1,30 @@
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers of the same key.
+
+    The first caller runs the call, callers arriving before it is done await
+    the same result (as a deep copy, so nobody sees another caller's edits).
+    Must be used from one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.shared_count = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.shared_count += 1
+            # Shield so a cancelled follower doesn't cancel the call of others
+            return copy.deepcopy(await asyncio.shield(future))
+
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
@@ -1,89 +1,24 @@
-import asyncio
-from typing import List, Dict, Any, Sequence
+from typing import List, Dict, Any
 
-from gql import Client
-from cachetools import cached, TTLCache
-
-from .apollo_connector import get_apollo_client
-from .query_helper.vote_events import get_vote_events, update_vote_event
-from .query_helper.persons import get_persons
-from .query_helper.votes import get_votes, delete_votes, update_votes
+from .runtime import run_sync
+from .aio import votes_handler as _aio
+from .aio.votes_handler import update_vote_data
+from .name_resolver import NameResolver
 
 ################################ VALIDATION DATA ################################
 
 def get_validation_data(vote_event_id: str) -> Dict[str, Any]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    agg_param = {
-        "where": {
-            "id": {
-                "eq": vote_event_id
-            }
-        }
-    }
-    matched_vote_events = asyncio.run(get_vote_events(
-        apollo_client,
-        fields=[
-            'agree_count',
-            'disagree_count',
-            'abstain_count',
-            'novote_count'
-        ],
-        params=agg_param
-    ))
-    if len(matched_vote_events) == 0:
-        print(f"No VoteEvent id: {vote_event_id}")
-        return {}
-    return matched_vote_events[0]
+    return run_sync(_aio.get_validation_data(vote_event_id=vote_event_id))
 
 def update_vote_event_validation_data(
     vote_event_id: str, 
     validation_data: Dict[str, int], 
     publish_status: str|None=None,
 ) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get data
-    agree_count = validation_data.get("เห็นด้วย", -1) 
-    disagree_count = validation_data.get("ไม่เห็นด้วย", -1) 
-    abstained_count = validation_data.get("งดออกเสียง", -1) 
-    novoted_count = validation_data.get("ไม่ลงคะแนนเสียง", -1) 
-    
-    if publish_status not in ["ERROR", "PUBLISHED"]:
-        publish_status = "ERROR"
-        
-    update_vote_event_param = {
-        "where": {
-            "id": {
-                "eq": vote_event_id
-            }
-        },
-        "update": {
-            "agree_count": {
-                "set": agree_count
-            },
-            "disagree_count": {
-                "set": disagree_count
-            },
-            "abstain_count": {
-                "set": abstained_count
-            },
-            "novote_count": {
-                "set": novoted_count
-            },
-            "publish_status": {
-                "set": publish_status
-            }
-        }
-    }
-    
-    asyncio.run(update_vote_event(
-        client=apollo_client,
-        params=update_vote_event_param
+    run_sync(_aio.update_vote_event_validation_data(
+        vote_event_id=vote_event_id,
+        validation_data=validation_data,
+        publish_status=publish_status
     ))
 
 ################################ VOTES DATA ################################
@@ -98,90 +33,23 @@ def get_votes_from_vote_event(
         vote_event_id: str
             voteEvent's ID
     """
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    votes = asyncio.run(get_votes(
-        client=apollo_client,
-        fields=['id', 'vote_order', 'badge_number', 'voter_name', 'voter_party', 'option'],
-        params={
-            "where": {
-                "vote_events": {
-                    "some": {
-                        "id": {
-                            "eq": vote_event_id
-                        }
-                    }
-                }
-            }
-        }
-    ))
-    
-    return votes
+    return run_sync(_aio.get_votes_from_vote_event(vote_event_id=vote_event_id))
 
-@cached(cache=TTLCache(maxsize=124, ttl=120))
 def get_politician_name_index(
     vote_event_id:str
 ) -> Dict[str, Dict[str, Any]]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get politician names
-    # Construct param
-    get_politician_param = {
-        "where": {
-            "memberships": {
-                "some": {
-                    "posts": {
-                        "some": {
-                            "organizations": {
-                                "some": {
-                                    "events": {
-                                        "some": {
-                                            "id": {
-                                                "eq": vote_event_id
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-    
-    politicians = asyncio.run(get_persons(
-        client=apollo_client,
-        fields=[
-            'id',
-            'name',
-            'firstname',
-            'middlename',
-            'lastname',
-            'other_names { ... on AlternatePersonName { name } ... on AlternateName { name } }',
-        ],
-        params=get_politician_param
-    ))
-    
-    # Construct name index
-    name_index = {}
-    for person in politicians:
-        name_index[person['name']] = person
-        other_names = person['other_names']
-        if not other_names:
-            continue
-        for alternate_name in other_names:
-            name_index[alternate_name['name']] = person
-    return name_index
+    return run_sync(_aio.get_politician_name_index(vote_event_id=vote_event_id))
+
+def get_vote_event_name_resolver(
+    vote_event_id:str
+) -> NameResolver:
+    return run_sync(_aio.get_vote_event_name_resolver(vote_event_id=vote_event_id))
 
 def add_votes_to_vote_event(
     vote_event_id: str,
     vote_logs: List[Dict[str, Any]],
-    batch_max: int=5
+    batch_max: int=100,
+    max_concurrency: int=4
 ) -> None:
     """
     Add new votes to voteEvent
@@ -192,101 +60,22 @@ def add_votes_to_vote_event(
         vote_logs: List[Dict[str, Any]]
             List of votes info
         batch_max: int @optional
-            The max amount of votes create in ONE query
+            The starting max amount of votes create in ONE query
+        max_concurrency: int @optional
+            The max amount of create queries in flight
     """
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get politician names index
-    name_index = get_politician_name_index(vote_event_id=vote_event_id)
-    
-    def generate_create_param(
-        vote_info: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        
-        name = vote_info.get("ชื่อ - สกุล", "") 
-        param = {
-              "vote_order": str(vote_info.get("ลําดับที่", "0")),
-              "badge_number": str(vote_info.get("เลขที่บัตร", "x")),
-              "voter_name_raw": name,
-              "voter_party": vote_info.get("ชื่อสังกัด", ""),
-              "option": vote_info.get("ผลการลงคะแนน", "x")
-            }
-
-        # Check if name matched with politician in politigraph
-        matched_politician = name_index.get(name, None)
-        if matched_politician:
-            param["voters"] = {
-                "connect": [{
-                    "where": {
-                        "node": {
-                            "id": {
-                                "eq": matched_politician['id']
-                            }
-                        }
-                    }
-                  }]
-            }
-        
-        return param
-    
-    async def update_votes_in_vote_event() -> None:
-        
-        # Create new votes & connect it to VoteEvent in a batch
-        batch_count = 0
-        create_params = []
-        for vote in vote_logs:
-            if batch_count >= batch_max:
-                update_vote_event_param = {
-                    "where": {
-                        "id": {
-                            "eq": vote_event_id
-                        }
-                    },
-                    "update": {
-                        "votes": [{
-                                "create": [{"node": create_param} for create_param in create_params]
-                            }]
-                    }
-                }
-                await update_vote_event(
-                    client=apollo_client,
-                    params=update_vote_event_param
-                )
-                
-                batch_count = 0
-                create_params = []
-            
-            new_param = generate_create_param(vote)
-            create_params.append(new_param)
-            batch_count += 1
-        
-        # Check & Update left over votes
-        if create_params:
-            update_vote_event_param = {
-                "where": {
-                    "id": {
-                        "eq": vote_event_id
-                    }
-                },
-                "update": {
-                    "votes": [{
-                            "create": [{"node": create_param} for create_param in create_params]
-                        }]
-                }
-            }
-            await update_vote_event(
-                client=apollo_client,
-                params=update_vote_event_param
-            )
-        
-    asyncio.run(update_votes_in_vote_event())
+    run_sync(_aio.add_votes_to_vote_event(
+        vote_event_id=vote_event_id,
+        vote_logs=vote_logs,
+        batch_max=batch_max,
+        max_concurrency=max_concurrency
+    ))
     
 def replace_votes_in_vote_event(
     vote_event_id: str,
     vote_logs: List[Dict[str, Any]],
-    batch_max: int=5
+    batch_max: int=100,
+    max_concurrency: int=4
 ) -> None:
     """
     Replace votes in voteEvent with a new set of data
@@ -297,187 +86,23 @@ def replace_votes_in_vote_event(
         vote_logs: List[Dict[str, Any]]
             List of votes info
         batch_max: int @optional
-            The max amount of votes create in ONE query
+            The starting max amount of votes create in ONE query
+        max_concurrency: int @optional
+            The max amount of create queries in flight
     """
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Remove all votes from voteEvent
-    asyncio.run(update_vote_event(
-        client=apollo_client,
-        params={
-            "where": {
-                "id": {
-                    "eq": vote_event_id
-                }
-            },
-            "update": {
-                "votes": [{
-                    "delete": [{
-                        "where": {
-                                "node": None
-                            }
-                        }]
-                }]
-            }
-        }
-    ))
-    
-    # Add new votes
-    add_votes_to_vote_event(
+    run_sync(_aio.replace_votes_in_vote_event(
         vote_event_id=vote_event_id,
         vote_logs=vote_logs,
-        batch_max=batch_max
-    )
-
-async def update_vote_data(
-    vote_id: str,
-    voter_name: str|None=None,
-    voter_party: str|None=None,
-    option: str|None=None
-) -> None:
-    """
-    Update information in a specific vote
-
-    Args:
-        vote_id (str): ID of vote's node
-        voter_name_raw (str | None): voter's name
-        voter_party (str | None): voter's party
-        option (str | None): vote option
-    """
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Construct update param
-    update_param = {}
-    if voter_name:
-        update_param['voter_name_raw'] = {
-            "set": voter_name
-        }
-    if voter_party:
-        update_param['voter_party'] = {
-            "set": voter_party
-        }
-    if option:
-        update_param['option'] = {
-            "set": option
-        }
-    
-    # Update vote
-    await update_votes(
-        client=apollo_client,
-        params={
-            "where": {
-                "id": {
-                    "eq": vote_id
-                }
-            },
-            "update": update_param
-        }
-    )
+        batch_max=batch_max,
+        max_concurrency=max_concurrency
+    ))
         
 def update_votes_person_connection(
     vote_event_id: str,
 ) -> None:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    # Get politician names index
-    name_index = get_politician_name_index(vote_event_id=vote_event_id)
-    import json
-    print(json.dumps(name_index, indent=2, ensure_ascii=False))
-        
-    # Get votes
-    votes = asyncio.run(get_votes(
-        client=apollo_client,
-        fields=['id', 'voter_name_raw', 'voters { id }'],
-        params={
-            "where": {
-                "vote_events": {
-                    "some": {
-                        "id": {
-                            "eq": vote_event_id
-                        }
-                    }
-                }
-            }
-        }
-    ))
-    
-    # Update connection
-    async def update_votes_person(votes: List[Dict[str, Any]]):
-        for vote in votes:
-            
-            # Check if voter already exist
-            if vote.get('voters', []):
-                continue
-            
-            vote_id = vote.get('id', '')
-            person_id = name_index.get(vote.get('voter_name_raw', ''), {}).get('id', None)
-            print(f"update connection for {vote.get('voter_name_raw', '')}...")
-
-            update_param = {
-                "where": {
-                    "id": {
-                        "eq": vote_id
-                    }
-                },
-                "update": {
-                    "voters": [
-                    {
-                        "connect": [
-                        {
-                            "where": {
-                                "node": {
-                                    "id": {
-                                        "eq": person_id
-                                    }
-                                }
-                            }
-                        }
-                        ]
-                    }
-                    ]
-                }
-            }
-            await update_votes(
-                client=apollo_client,
-                params=update_param
-            )
-            await asyncio.sleep(0.5)
-    asyncio.run(update_votes_person(votes=votes))
+    run_sync(_aio.update_votes_person_connection(vote_event_id=vote_event_id))
         
 def get_votes_in_vote_event(
     vote_event_id:str
 ) -> List[Dict[str, Any]]:
-    
-    # Initiate client
-    apollo_client = get_apollo_client()
-    
-    get_param = {
-        "where": {
-            "vote_events": {
-                "some": {
-                    "id": {
-                        "eq": vote_event_id
-                    }
-                }
-            }
-        }
-    }
-    
-    return asyncio.run(get_votes(
-        client=apollo_client,
-        fields=[
-            'id',
-            'vote_order',
-            'badge_number',
-            'voter_name_raw',
-            'voter_party',
-            'option'
-        ],
-        params=get_param
-    ))
\ No newline at end of file
+    return run_sync(_aio.get_votes_in_vote_event(vote_event_id=vote_event_id))
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+
+from poliquery.batching import AdaptiveBatchSize, is_batch_size_error, run_in_adaptive_batches
+
+def run_batches(items, send, initial=40, max_concurrency=1):
+    batch_size = AdaptiveBatchSize(initial=initial)
+    asyncio.run(run_in_adaptive_batches(items, send, batch_size, max_concurrency=max_concurrency))
+    return batch_size
+
+def test_batch_size_errors():
+    assert is_batch_size_error(TransportServerError("Payload Too Large", 413))
+    assert is_batch_size_error(TransportQueryError("Request entity too large"))
+    assert not is_batch_size_error(TransportServerError("Internal Server Error", 500))
+    assert not is_batch_size_error(TransportQueryError("Variable \"$input\" got invalid value"))
+    assert not is_batch_size_error(asyncio.TimeoutError())
+
+def test_oversized_batches_are_split_and_every_item_sent_once():
+    sent = []
+
+    async def send(batch):
+        if len(batch) > 10:
+            raise TransportServerError("Payload Too Large", 413)
+        sent.extend(batch)
+
+    run_batches(list(range(50)), send, max_concurrency=2)
+    assert sorted(sent) == list(range(50))
+
+@pytest.mark.parametrize("error", [
+    TransportQueryError("Variable \"$input\" got invalid value"),
+    TransportServerError("Internal Server Error", 500),
+    asyncio.TimeoutError(),
+])
+def test_other_errors_are_raised_without_splitting(error):
+    batch_sizes = []
+
+    async def send(batch):
+        batch_sizes.append(len(batch))
+        raise error
+
+    with pytest.raises(type(error)):
+        run_batches(list(range(50)), send)
+    # A batch that may have been applied is never re-sent in smaller batches
+    assert batch_sizes == [40]
+
+def test_size_error_at_minimum_size_is_raised():
+    async def send(batch):
+        raise TransportServerError("Payload Too Large", 413)
+
+    with pytest.raises(TransportServerError):
+        run_batches(list(range(4)), send, initial=4)
+
+def test_batch_size_grows_on_fast_full_batches():
+    batch_size = AdaptiveBatchSize(initial=8, maximum=20)
+    batch_size.record_success(8, latency=0.1)
+    assert batch_size.value == 10
+    # A partial batch doesn't tell the size can grow
+    batch_size.record_success(3, latency=0.1)
+    assert batch_size.value == 10
+    for _ in range(10):
+        batch_size.record_success(batch_size.value, latency=0.1)
+    assert batch_size.value == 20
+
+def test_batch_size_shrinks_relative_to_the_sent_batch():
+    batch_size = AdaptiveBatchSize(initial=40, target_latency=5.0)
+    batch_size.record_success(40, latency=10.0)
+    assert batch_size.value == 20
+    # Concurrent batches of the old size failing don't halve it again
+    batch_size.record_failure(40)
+    assert batch_size.value == 20
+    batch_size.record_failure(20)
+    assert batch_size.value == 10
+    for _ in range(10):
+        batch_size.record_failure(batch_size.value)
+    assert batch_size.value == 1
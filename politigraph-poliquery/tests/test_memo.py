@@ -0,0 +1,117 @@
+import asyncio
+
+from graphql import parse
+
+from poliquery import memo
+from poliquery.memo import async_cached, get_mutated_node_types, invalidate_after_mutation
+
+def counting(depends_on=(), ttl=None, maxsize=128):
+    calls = []
+
+    @async_cached(maxsize=maxsize, ttl=ttl, depends_on=depends_on)
+    async def get_items(key):
+        calls.append(key)
+        return {'key': key, 'items': [len(calls)]}
+
+    return get_items, calls
+
+def test_cache_hit_and_miss():
+    get_items, calls = counting()
+
+    async def main():
+        return [await get_items("a"), await get_items("a"), await get_items("b")]
+
+    a1, a2, b = asyncio.run(main())
+    assert a1 == a2 and b['key'] == "b"
+    assert calls == ["a", "b"]
+    assert get_items.cache_info() == memo.CacheInfo(1, 2, 128, 2)
+
+def test_callers_get_copies():
+    get_items, _ = counting()
+
+    async def main():
+        first = await get_items("a")
+        first['items'].append("edited")
+        return await get_items("a")
+
+    assert asyncio.run(main())['items'] == [1]
+
+def test_least_recently_used_is_dropped():
+    get_items, calls = counting(maxsize=2)
+
+    async def main():
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            await get_items(key)
+
+    asyncio.run(main())
+    assert calls == ["a", "b", "c", "b"]
+
+def test_expired_result_is_refetched(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memo.time, "monotonic", lambda: now[0])
+    get_items, calls = counting(ttl=10)
+
+    async def main():
+        await get_items("a")
+        now[0] += 5
+        await get_items("a")
+        now[0] += 10
+        await get_items("a")
+
+    asyncio.run(main())
+    assert calls == ["a", "a"]
+
+def test_mutation_invalidates_readers_of_its_node_type():
+    get_people, people_calls = counting(depends_on=("People",))
+    get_votes, votes_calls = counting(depends_on=("Votes",))
+    mutation = parse("mutation { createVotes(input: []) { info { nodesCreated } } }")
+    assert get_mutated_node_types(mutation) == {"Votes"}
+
+    async def main():
+        await get_people("a")
+        await get_votes("a")
+        invalidate_after_mutation(mutation)
+        await get_people("a")
+        await get_votes("a")
+
+    asyncio.run(main())
+    assert people_calls == ["a"]
+    assert votes_calls == ["a", "a"]
+
+def test_queries_invalidate_nothing():
+    assert get_mutated_node_types(parse("query { people { id } }")) == set()
+
+def test_invalidate_one_key():
+    get_items, calls = counting()
+
+    async def main():
+        await get_items("a")
+        await get_items("b")
+        get_items.invalidate("a")
+        await get_items("a")
+        await get_items("b")
+
+    asyncio.run(main())
+    assert calls == ["a", "b", "a"]
+
+def test_result_in_flight_during_invalidation_is_not_stored():
+    started = None
+    release = None
+
+    @async_cached(depends_on=("Votes",))
+    async def get_votes():
+        started.set()
+        await release.wait()
+        return ["stale"]
+
+    async def main():
+        nonlocal started, release
+        started, release = asyncio.Event(), asyncio.Event()
+        task = asyncio.ensure_future(get_votes())
+        await started.wait()
+        memo.invalidate_node_types("Votes")
+        release.set()
+        await task
+
+    asyncio.run(main())
+    assert get_votes.cache_info().currsize == 0
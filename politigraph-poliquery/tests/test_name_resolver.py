@@ -0,0 +1,72 @@
+import pytest
+
+from poliquery.name_resolver import NameResolver
+
+PERSONS = [
+    {'id': "a", 'name': "สมชาย ใจดีมาก"},
+    {'id': "b", 'name': "สมชาย ใจดีมาก"},
+    {'id': "c", 'name': "สมชาย ใจดีมา"},
+    {'id': "d", 'name': "สมศรี มีสุขสันต์", 'other_names': [{'name': "สมศรี สุขใจยิ่ง"}]},
+    {'id': "e", 'name': "นพดล ปัทมะ"},
+]
+
+@pytest.fixture
+def resolver():
+    return NameResolver(PERSONS)
+
+def test_exact_name_and_other_name(resolver):
+    assert resolver.resolve_id("สมศรี มีสุขสันต์") == "d"
+    assert resolver.resolve_id("สมศรี สุขใจยิ่ง") == "d"
+    assert resolver.resolve_id("สมชาย ใจดีมา") == "c"
+
+def test_name_prefix_is_stripped(resolver):
+    assert resolver.resolve_id("นางสมศรี มีสุขสันต์") == "d"
+
+def test_name_starting_like_a_prefix_is_kept(resolver):
+    # 'นพ' is a prefix, the name isn't found through 'ดล ปัทมะ'
+    assert resolver.resolve_id("นพดล ปัทมะ") == "e"
+
+def test_shared_name_is_ambiguous(resolver):
+    assert resolver.is_ambiguous("สมชาย ใจดีมาก")
+    assert resolver.lookup("สมชาย ใจดีมาก") is None
+    # Not given to the person with the closest other name either
+    assert resolver.resolve("สมชาย ใจดีมาก") is None
+
+def test_typo_resolves_to_closest_name(resolver):
+    assert resolver.resolve_id("สมศรี มีสุขสันด์") == "d"
+    assert resolver.resolve_id("สมศรี มีสุขสันด์", fuzzy=False) is None
+
+def test_name_as_close_to_different_persons_is_not_resolved():
+    resolver = NameResolver([
+        {'id': "a", 'name': "สมชาย ใจดีมากๆ"},
+        {'id': "b", 'name': "สมชาย ใจดีมากก"},
+    ])
+    assert resolver.resolve("สมชาย ใจดีมากx") is None
+
+def test_unknown_name(resolver):
+    assert resolver.resolve("ประยุทธ์ ทองดี") is None
+    assert resolver.resolve(None) is None
+    assert resolver.resolve("") is None
+
+def test_match_names(resolver):
+    names = ["สมศรี มีสุขสันด์", "นางสมศรี สุขใจยิ่ง", "ประยุทธ์ ทองดี", None, "สมศรี มีสุขสันด์"]
+    assert resolver.match_names(names) == [
+        "สมศรี มีสุขสันต์", "สมศรี สุขใจยิ่ง", None, None, "สมศรี มีสุขสันต์"
+    ]
+    assert [resolver.match_name(name) for name in names] == resolver.match_names(names)
+
+def test_save_and_load(resolver, tmp_path):
+    path = tmp_path / "name_index.pkl"
+    resolver.save(str(path))
+
+    loaded = NameResolver.load(str(path))
+    assert len(loaded) == len(resolver)
+    assert loaded.resolve_id("สมศรี มีสุขสันด์") == "d"
+    assert loaded.resolve("สมชาย ใจดีมาก") is None
+
+def test_load_rejects_other_objects(tmp_path):
+    import pickle
+    path = tmp_path / "other.pkl"
+    path.write_bytes(pickle.dumps({}))
+    with pytest.raises(TypeError):
+        NameResolver.load(str(path))
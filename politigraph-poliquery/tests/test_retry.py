@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+
+from poliquery import retry
+from poliquery.retry import is_retryable_error, with_retry
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, "get_backoff_delay", lambda *args, **kwargs: 0)
+
+def failing(errors, result="done"):
+    """Coroutine function raising `errors` one per call, then returning `result`."""
+    errors = list(errors)
+    calls = []
+
+    async def operation():
+        calls.append(len(calls))
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return operation, calls
+
+def test_retryable_errors():
+    assert is_retryable_error(asyncio.TimeoutError())
+    assert is_retryable_error(TransportServerError("Bad Gateway", 502))
+    assert not is_retryable_error(TransportServerError("Payload Too Large", 413))
+    assert not is_retryable_error(TransportQueryError("Cannot query field"))
+
+def test_retries_transient_errors():
+    operation, calls = failing([asyncio.TimeoutError(), TransportServerError("Service Unavailable", 503)])
+    assert asyncio.run(with_retry(operation)) == "done"
+    assert len(calls) == 3
+
+def test_graphql_errors_are_not_retried():
+    operation, calls = failing([TransportQueryError("Cannot query field")])
+    with pytest.raises(TransportQueryError):
+        asyncio.run(with_retry(operation))
+    assert len(calls) == 1
+
+def test_gives_up_after_max_attempts():
+    operation, calls = failing([asyncio.TimeoutError()] * 5)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(with_retry(operation, max_attempts=3))
+    assert len(calls) == 3
+
+def test_check_pending_skips_retry_when_applied():
+    operation, calls = failing([asyncio.TimeoutError()])
+    checks = []
+
+    async def check_pending():
+        checks.append(True)
+        return False # the timed out call got applied
+
+    assert asyncio.run(with_retry(operation, check_pending=check_pending)) is None
+    assert len(calls) == 1 and len(checks) == 1
+
+def test_failing_check_is_run_again_before_retrying():
+    operation, calls = failing([asyncio.TimeoutError()])
+    check_results = [asyncio.TimeoutError(), True]
+    checks = []
+
+    async def check_pending():
+        checks.append(len(calls))
+        result = check_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert asyncio.run(with_retry(operation, check_pending=check_pending)) == "done"
+    # Never re-sent before a check went through
+    assert checks == [1, 1] and len(calls) == 2
+
+def test_failing_check_keeps_the_operation_error():
+    operation, calls = failing([asyncio.TimeoutError("create timed out")])
+
+    async def check_pending():
+        raise ValueError("check failed")
+
+    with pytest.raises(asyncio.TimeoutError) as error_info:
+        asyncio.run(with_retry(operation, check_pending=check_pending))
+    assert isinstance(error_info.value.__cause__, ValueError)
+    assert len(calls) == 1
@@ -0,0 +1,57 @@
+import asyncio
+
+from poliquery.single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_call():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'items': [1]}
+
+    async def main():
+        return await asyncio.gather(*[single_flight.do("key", fetch) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert single_flight.shared_count == 4
+    assert all(result == {'items': [1]} for result in results)
+    # Followers get copies
+    assert len({id(result) for result in results}) == 5
+
+def test_later_calls_run_again():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        return [await single_flight.do("key", fetch), await single_flight.do("key", fetch)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+def test_error_is_shared_then_cleared():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        results = await asyncio.gather(
+            single_flight.do("key", fetch),
+            single_flight.do("key", fetch),
+            return_exceptions=True
+        )
+        assert not single_flight._in_flight
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
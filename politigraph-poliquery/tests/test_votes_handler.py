@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from poliquery import retry
+from poliquery.aio import votes_handler
+
+VOTE_EVENT_ID = "vote-event-1"
+
+POLITICIANS = [
+    {'id': "p1", 'name': "สมชาย ใจดี", 'other_names': []},
+    {'id': "p2", 'name': "สมศรี มีสุข", 'other_names': [{'name': "สมศรี สุขใจ"}]},
+    # Same name for different persons
+    {'id': "p3", 'name': "ประยุทธ์ ทองดี", 'other_names': []},
+    {'id': "p4", 'name': "ประยุทธ์ ทองดี", 'other_names': []},
+]
+
+class FakeVotesServer:
+    """Votes of the fake Politigraph, the first `createVotes` gets applied but times out."""
+
+    def __init__(self, timeouts: int=1) -> None:
+        self.votes = []
+        self.timeouts = timeouts
+        self.create_calls = 0
+        self.updates = []
+
+    async def get_persons(self, client, fields, params):
+        return POLITICIANS
+
+    async def create_votes(self, client, params):
+        self.create_calls += 1
+        self.votes.extend(params['input'])
+        if self.timeouts:
+            self.timeouts -= 1
+            raise asyncio.TimeoutError()
+
+    async def get_votes(self, client, fields, params):
+        vote_orders = params['where'].get('vote_order', {}).get('in')
+        return [
+            {'id': f"v{vote['vote_order']}", 'voter_name_raw': vote['voter_name_raw'], 'voters': [], **vote}
+                for vote in self.votes if vote_orders is None or vote['vote_order'] in vote_orders
+        ]
+
+    async def update_votes(self, client, params):
+        self.updates.append(params)
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeVotesServer()
+    monkeypatch.setattr(retry, "get_backoff_delay", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(votes_handler, "get_apollo_client", lambda: None)
+    for name in ('get_persons', 'create_votes', 'get_votes', 'update_votes'):
+        monkeypatch.setattr(votes_handler, name, getattr(server, name))
+    votes_handler.get_vote_event_name_resolver.cache_clear()
+    yield server
+    votes_handler.get_vote_event_name_resolver.cache_clear()
+
+def vote_log(order, name):
+    return {"ลําดับที่": order, "เลขที่บัตร": 100 + order, "ชื่อ - สกุล": name, "ชื่อสังกัด": "พรรค", "ผลการลงคะแนน": "เห็นด้วย"}
+
+def test_retried_create_votes_does_not_insert_twice(server):
+    vote_logs = [vote_log(order, "สมชาย ใจดี") for order in range(1, 31)]
+    asyncio.run(votes_handler.add_votes_to_vote_event(VOTE_EVENT_ID, vote_logs, batch_max=10))
+
+    assert sorted(int(vote['vote_order']) for vote in server.votes) == list(range(1, 31))
+    # The timed out batch was found applied, not sent again
+    assert server.create_calls == 3
+
+def test_votes_connect_only_to_exactly_matched_politicians(server):
+    server.timeouts = 0
+    vote_logs = [
+        vote_log(1, "สมชาย ใจดี"),
+        vote_log(2, "สมศรี สุขใจ"),
+        vote_log(3, "ประยุทธ์ ทองดี"), # ambiguous
+        vote_log(4, "สมชาย ใจดีมาก"), # no exact match
+    ]
+    asyncio.run(votes_handler.add_votes_to_vote_event(VOTE_EVENT_ID, vote_logs))
+
+    voters = {
+        vote['vote_order']: vote.get('voters', {}).get('connect', [{}])[0].get('where', {}).get('node', {}).get('id', {}).get('eq')
+            for vote in server.votes
+    }
+    assert voters == {"1": "p1", "2": "p2", "3": None, "4": None}
+
+def test_update_connection_skips_unresolved_voters(server):
+    server.votes = [
+        {'vote_order': "1", 'voter_name_raw': "สมชาย ใจดี"},
+        {'vote_order': "2", 'voter_name_raw': "ประยุทธ์ ทองดี"},
+    ]
+    asyncio.run(votes_handler.update_votes_person_connection(VOTE_EVENT_ID))
+
+    assert len(server.updates) == 1
+    connect = server.updates[0]['update']['voters'][0]['connect'][0]
+    assert connect['where']['node']['id']['eq'] == "p1"
+
+def test_politician_name_index_is_a_dict_of_names(server):
+    name_index = asyncio.run(votes_handler.get_politician_name_index(VOTE_EVENT_ID))
+    assert name_index["สมศรี สุขใจ"]['id'] == "p2"
+    assert set(name_index) == {"สมชาย ใจดี", "สมศรี มีสุข", "สมศรี สุขใจ", "ประยุทธ์ ทองดี"}
@@ -0,0 +1,103 @@
+# /// script
+# requires-python = "==3.10.11"
+# dependencies = [
+#     "pandas",
+#     "thai-name-normalizer", "poliquery",
+#     "politigraph_votes_extractor",
+# ]
+#
+# [tool.uv.sources]
+# poliquery = { path = "../politigraph-poliquery", editable = true }
+# politigraph_votes_extractor = { path = "../politigraph-ocr-votes-log/politigraph-votes-log-extractor", editable = true }
+# thai-name-normalizer = { path = "../politigraph-name-normalizer", editable = true }
+# ///
+import sys
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from politigraph_votes_extractor.df_cleaner import clean_votelog_df, VOTE_OPTIONS
+
+THAI_CHARACTERS = [chr(c) for c in range(0x0E01, 0x0E2F)]
+PREFIXES = ["นาย", "นาง", "นางสาว", "พล.อ.", "ดร."]
+
+def random_word(length: int) -> str:
+    return "".join(random.choices(THAI_CHARACTERS, k=length))
+
+def add_typo(text: str) -> str:
+    idx = random.choice([i for i, c in enumerate(text) if c != " "])
+    return text[:idx] + random.choice(THAI_CHARACTERS) + text[idx+1:]
+
+def generate_reference_data(parties_count: int=10, party_size: int=60):
+    parties_name = [f"{random_word(6)}ไทย" for _ in range(parties_count)]
+    people_in_party = {
+        party_name: [
+            {
+                'id': f"{party_name}-{i}",
+                'name': f"{random_word(6)} {random_word(9)}",
+                'other_names': None,
+            } for i in range(party_size)
+        ] for party_name in parties_name
+    }
+    return parties_name, people_in_party
+
+def generate_votelog(
+    rows: int,
+    people_in_party,
+    double_rows_ratio: float=0.05
+) -> pd.DataFrame:
+    """
+    Votes log as it comes out of OCR: noisy numbers, typos in names, parties
+    & vote options, and long names split over two rows.
+    """
+    records = []
+    for order in range(1, rows+1):
+        party_name = random.choice(list(people_in_party))
+        person = random.choice(people_in_party[party_name])
+        name = random.choice(PREFIXES) + add_typo(person['name'])
+        record = [
+            f"{order}.",
+            f"{random.randint(1, 999)} |",
+            name,
+            f"พรรค{add_typo(party_name)}",
+            add_typo(random.choice(VOTE_OPTIONS)) if random.random() > 0.1 else "",
+        ]
+        if random.random() < double_rows_ratio:
+            first_name, last_name = name.split(" ", 1)
+            record[2] = first_name
+            records.append(record)
+            records.append(["", "", last_name, "", ""])
+        else:
+            records.append(record)
+    return pd.DataFrame.from_records(
+        records,
+        columns=["ลําดับที่", "เลขที่บัตร", "ชื่อ - สกุล", "ชื่อสังกัด", "ผลการลงคะแนน"]
+    )
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    random.seed(0)
+    parties_name, people_in_party = generate_reference_data()
+
+    for rows in [500, 1000]:
+        votes_df = generate_votelog(rows, people_in_party)
+        timings = []
+        for _ in range(repeat):
+            _start_time = time.perf_counter()
+            clean_votelog_df(
+                votes_df,
+                prefixes=PREFIXES,
+                parties_name=parties_name,
+                people_in_party=people_in_party
+            )
+            timings.append(time.perf_counter() - _start_time)
+        print(
+            f"⏳ clean_votelog_df {rows} rows : "
+            f"median {statistics.median(timings)*1000:.1f} ms, "
+            f"min {min(timings)*1000:.1f} ms ({repeat} runs)"
+        )
+
+if __name__ == "__main__":
+    main()
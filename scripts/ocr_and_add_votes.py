@@ -14,49 +14,51 @@
 # thai-name-normalizer = { path = "../politigraph-name-normalizer", editable = true }
 # ///
 import os
-import easyocr
+from functools import partial
 
 import pandas as pd
 
-from ocr_votes_doc import ocr_and_add_votes, ocr_votes_doc
+from politigraph_votes_extractor import OCRCache, OCRProcessPool, get_reader_kwargs
+from ocr_votes_doc import add_ocr_votes, ocr_vote_log
 
 def main() -> None:
     print("Hello from ocr_and_and_votes.py!")
     
-    # Initialize the OCR reader
-    print("Initializing OCR reader...")
+    # Initialize the OCR workers, one OCR reader per CPU core
+    print("Initializing OCR workers...")
     ocr_model_dir = "/tmp/models"
     assert os.path.exists(ocr_model_dir), "Please add the OCR model directory."
-    reader = easyocr.Reader(['th'],
-                recog_network='thai-vl',
-                user_network_directory=ocr_model_dir,
-                model_storage_directory=ocr_model_dir,
-                detector=False,
-                gpu=False,
-                verbose=False)
-    assert reader is not None, "Failed to initialize OCR reader."
-    print("OCR reader initialized.")
+    
+    # Raw OCR output of every page, a re-run on the same documents (e.g. a
+    # retried upload) only cleans & uploads again
+    ocr_cache = OCRCache("ocr_cache")
     
     # Read OCR data
     import json
     with open("vote_events.json", "r", encoding="utf-8") as f:
         ocr_data = json.load(f)
         
+    vote_events = []
     for vote_event in ocr_data:
-        
-        vote_event_id = vote_event.get("vote_event_id", None)
-        if not vote_event_id:
+        if not vote_event.get("vote_event_id", None):
             print("No vote_event_id found, skipping...")
             continue
+        vote_events.append(vote_event)
+    
+    with OCRProcessPool(reader_kwargs=get_reader_kwargs(ocr_model_dir)) as pool:
+        print(f"OCR workers initialized ({pool.max_workers} workers).")
         
-        print("OCR votes for vote event ID:")
-
-        ocr_and_add_votes(
-            pdf_file_path=vote_event["file_path"],
-            vote_event_id=vote_event_id,
-            reader=reader,
-        )
-        print()
+        # Documents are OCR'ed in parallel, votes are added in order
+        for vote_event, ocr_result in zip(
+            vote_events,
+            pool.map_documents(
+                partial(ocr_vote_log, ocr_cache=ocr_cache),
+                [vote_event["file_path"] for vote_event in vote_events]
+            )
+        ):
+            print(f"Add OCR votes for vote event ID: {vote_event['vote_event_id']}")
+            add_ocr_votes(vote_event["vote_event_id"], *ocr_result)
+            print()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,25 @@
+# /// script
+# requires-python = "==3.10.11"
+# dependencies = [
+#     "thai_name_normalizer", "poliquery"
+# ]
+# [tool.uv.sources]
+# poliquery = { path = "../politigraph-poliquery", editable = true }
+# thai_name_normalizer = { path = "../politigraph-name-normalizer", editable = true }
+# ///
+
+import sys
+from dotenv import load_dotenv
+from poliquery import update_schema_snapshot
+from poliquery.schema_snapshot import get_schema_snapshot_path
+
+def main() -> None:
+    load_dotenv()
+    
+    # Snapshot path from argument, POLITIGRAPH_SCHEMA_SNAPSHOT or default file name
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    version = update_schema_snapshot(path)
+    print(f"Saved schema snapshot {version} to {get_schema_snapshot_path(path)}")
+
+if __name__ == "__main__":
+    main()